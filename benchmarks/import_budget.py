@@ -0,0 +1,85 @@
+"""
+Startup import budget.
+
+Imports what main.py needs before the StartupScreen can paint (AppController
+and the three pre-login screens) in a fresh interpreter under -X importtime,
+lists the most expensive imports and fails when
+
+  - the whole import takes longer than BUDGET_MS, or
+  - one of the heavy dependencies that must wait until after login is imported.
+
+Usage (from the project root):
+    python benchmarks/import_budget.py [--top N] [--budget MS]
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENTRY_MODULE = "controllers.app_controller"
+BUDGET_MS = 300  # cumulative import time of ENTRY_MODULE
+TOP_N = 15
+
+# Imported on first use only (player, API screens, tag reading...)
+DEFERRED_MODULES = ("vlc", "yt_dlp", "ytmusicapi", "eyed3", "requests", "dotenv")
+
+
+def measure(module=ENTRY_MODULE):
+    """
+    Import module in a new interpreter and parse its -X importtime report.
+
+    Returns:
+        List of (self_us, cumulative_us, depth, name), in import order
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr}")
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((int(self_us), int(cumulative_us), depth, name.strip()))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--top", type=int, default=TOP_N, help="number of imports to list")
+    parser.add_argument("--budget", type=int, default=BUDGET_MS, help="allowed import time in ms")
+    args = parser.parse_args()
+
+    rows = measure()
+    total_us = next((cumulative for _, cumulative, _, name in rows if name == ENTRY_MODULE), 0)
+    loaded = {name for *_, name in rows}
+
+    print(f"Top {args.top} imports by cumulative time (ms):")
+    for self_us, cumulative_us, depth, name in sorted(rows, key=lambda r: r[1], reverse=True)[:args.top]:
+        print(f"  {cumulative_us / 1000:8.1f}  {name}")
+
+    print(f"\nTop {args.top} imports by self time (ms):")
+    for self_us, cumulative_us, depth, name in sorted(rows, key=lambda r: r[0], reverse=True)[:args.top]:
+        print(f"  {self_us / 1000:8.1f}  {name}")
+
+    failures = []
+    early = [m for m in DEFERRED_MODULES if m in loaded]
+    if early:
+        failures.append(f"imported before the splash screen: {', '.join(early)}")
+    if total_us > args.budget * 1000:
+        failures.append(f"{ENTRY_MODULE} took {total_us / 1000:.1f} ms, budget is {args.budget} ms")
+
+    print(f"\n{ENTRY_MODULE}: {total_us / 1000:.1f} ms (budget {args.budget} ms)")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
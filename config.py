@@ -3,7 +3,7 @@ import os
 # Base project directory (this file is in the project root)
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
-DB_PATH = '' # For SQLite Database
+DB_PATH = os.path.join(BASE_DIR, 'user_database.db') # Users SQLite database (absolute, so it doesn't depend on the CWD)
 WINDOW_SIZE = (1200, 800) # Default window size (shows all controls properly)
 MIN_WINDOW_SIZE = (1024, 768) # Minimum window size for proper UI display
 
@@ -12,8 +12,23 @@ IMAGE_PATH = os.path.join(BASE_DIR, 'assets', 'images') + os.sep
 ICON_PATH = os.path.join(BASE_DIR, 'assets', 'icons') + os.sep
 LOCAL_MUSIC_PATH = os.path.join(BASE_DIR, 'local_music') + os.sep
 LYRICS_PATH = os.path.join(BASE_DIR, 'lyrics') + os.sep
+AUDIO_CACHE_PATH = os.path.join(BASE_DIR, 'cache', 'audio') + os.sep
+LIBRARY_DB_PATH = os.path.join(BASE_DIR, 'cache', 'library.db') # Local music index (rebuilt from local_music if deleted)
+THUMBNAIL_CACHE_PATH = os.path.join(BASE_DIR, 'cache', 'thumbnails') + os.sep # Pre-scaled local album art, one file per cover and size
+
+AUDIO_CACHE_MAX_BYTES = 1024 * 1024 * 1024 # 1 GB quota for downloaded API songs (least recently played evicted first)
 
 DEFAULT_VOLUME = 50 # Temporary fixed volume
+PREFETCH_AHEAD = 2 # Number of upcoming queued API songs to resolve and cache in the background
+EXTRACTOR_PROCESSES = 2 # yt-dlp worker processes (extraction never runs in the UI process)
+EXTRACTOR_TIMEOUT = 60 # seconds to wait for one extraction job
+EXTRACTOR_CACHE_ENTRIES = 256 # Extraction results kept until their stream URLs expire (least recently used dropped first)
+LIBRARY_SCAN_PROCESSES = None # Tag parsing processes for library scans (None = one per CPU core)
+AUDIO_THREADS = 1 + PREFETCH_AHEAD + 1 # Stream resolve/download threads (the playing song, its prefetches and one resolve)
+SEARCH_THREADS = 4 # Network search threads (one per search facet: songs, artists, albums, playlists)
+TRAILER_THREADS = 2 # Trailer extraction threads (the open detail view's, plus one it may have replaced)
+HTTP_POOL_HOSTS = 8 # Hosts the shared HTTP session keeps connection pools for (API hosts and image CDNs)
+HTTP_POOL_SIZE = 8 # Kept-alive connections per host (about one per image loader thread)
 
 API_KEYS = {} # Used to interact systems using API
 
@@ -1,12 +1,42 @@
-from ytmusicapi import YTMusic
-import yt_dlp as ytdl
+import threading
+from controllers.request_manager import TTLCache, normalize_query
 
-# Initialize ytmusicapi
-ytmusic = YTMusic()
+_ytmusic = None
+_ytmusic_lock = threading.Lock()
+
+
+def get_ytmusic():
+    """Get the shared ytmusicapi client (ytmusicapi is imported and the client made on first use)."""
+    global _ytmusic
+    with _ytmusic_lock:
+        if _ytmusic is None:
+            from ytmusicapi import YTMusic
+            from controllers.http_session import get_session
+            _ytmusic = YTMusic(requests_session=get_session())
+        return _ytmusic
+
+# Search results keyed by (facet, normalized query, limit), shared by every screen
+_search_cache = TTLCache(maxsize=256, ttl_seconds=10 * 60)
+_suggestion_cache = TTLCache(maxsize=256, ttl_seconds=30 * 60)
+# Charts and home feed sections, fetched ahead during login (prefetch_home_sections) and shown by HomeScreen
+_home_cache = TTLCache(maxsize=32, ttl_seconds=10 * 60)
+
+
+def _cached_home(key, fetch):
+    value = _home_cache.get(key)
+    if value is None:
+        value = fetch()
+        if value is not None:  # failures are retried next time
+            _home_cache.set(key, value)
+    return value
+
+
+def _get_charts(country):
+    return _cached_home(("charts", country), lambda: get_ytmusic().get_charts(country=country))
 
 # Search Artists by name.
 def search_artists(artist_name):
-    results = ytmusic.search(artist_name, filter="artists")
+    results = get_ytmusic().search(artist_name, filter="artists")
     if not results:
         return None
 
@@ -26,7 +56,7 @@ def get_artist_metadata(artist_name, limit=10):
         print("No browseId found for artist.")
         return None
 
-    artist_data = ytmusic.get_artist(artist_browse_id)
+    artist_data = get_ytmusic().get_artist(artist_browse_id)
 
     top_songs_section = (
         artist_data.get("songs", {}).get("results")
@@ -36,7 +66,7 @@ def get_artist_metadata(artist_name, limit=10):
     if not top_songs_section:
         playlist_id = artist_data.get("songs", {}).get("playlistId")
         if playlist_id:
-            playlist = ytmusic.get_playlist(playlist_id, limit=limit)
+            playlist = get_ytmusic().get_playlist(playlist_id, limit=limit)
             top_songs_section = playlist.get("tracks", [])
         else:
             print("No top songs available for this artist.")
@@ -83,28 +113,109 @@ def get_artist_metadata(artist_name, limit=10):
     }
 
 
+SEARCH_FACETS = ("songs", "artists", "albums", "playlists")
+SEARCH_TEXT_FIELDS = ("title", "artist", "album", "author")
+
+
+def _search_item(facet, item):
+    thumbnail = (item.get("thumbnails") or [{}])[-1].get("url")
+    if facet == "songs":
+        return {
+            "title": item.get("title"),
+            "artist": (item.get("artists") or [{}])[0].get("name", "Unknown Artist"),
+            "album": (item.get("album") or {}).get("name", "Unknown"),
+            "videoId": item.get("videoId"),
+            "thumbnails": thumbnail
+        }
+    if facet == "artists":
+        return {
+            "artist": item.get("artist"),
+            "browseId": item.get("browseId"),
+            "thumbnails": thumbnail
+        }
+    if facet == "albums":
+        return {
+            "title": item.get("title"),
+            "artist": (item.get("artists") or [{}])[0].get("name", "Unknown Artist"),
+            "year": item.get("year"),
+            "type": item.get("type", "Album"),
+            "browseId": item.get("browseId"),
+            "thumbnails": thumbnail
+        }
+    return {
+        "title": item.get("title"),
+        "author": item.get("author"),
+        "itemCount": item.get("itemCount"),
+        "browseId": item.get("browseId"),
+        "thumbnails": thumbnail
+    }
+
+
+# Function that searches one facet (songs, artists, albums or playlists) of YouTube Music
+def search_music(query, facet="songs", limit=10):
+    key = (facet, normalize_query(query), limit)
+    items = _search_cache.get(key)
+    if items is not None:
+        return items
+
+    results = get_ytmusic().search(query, filter=facet, limit=limit) or []
+    items = [_search_item(facet, item) for item in results[:limit]]
+    _search_cache.set(key, items)
+    return items
+
+
 # Function that search for songs by title
 def get_song_titles(song_title, limit=10):
-    results = ytmusic.search(song_title, filter="songs")
-    if not results:
+    return search_music(song_title, "songs", limit)
+
+
+# Cached results for a query without any network call: the exact query, or the results of a
+# shorter query it extends (typing "blinding li" after "blinding") filtered locally.
+# Returns None when nothing useful is cached.
+def peek_search(query, facet="songs", limit=10):
+    query = normalize_query(query)
+    items = _search_cache.get((facet, query, limit))
+    if items is not None:
+        return items
+
+    best_query, best_items = None, None
+    for (cached_facet, cached_query, cached_limit), cached_items in _search_cache.items():
+        if cached_facet == facet and cached_limit == limit and query.startswith(cached_query):
+            if best_query is None or len(cached_query) > len(best_query):
+                best_query, best_items = cached_query, cached_items
+    if best_query is None:
         return None
 
+    tokens = query.split()
     return [
-        {
-            "title": song["title"],
-            "artist": song["artists"][0]["name"],
-            "album": song.get("album", {}).get("name", "Unknown"),
-            "videoId": song.get("videoId"),
-            "thumbnails": song.get("thumbnails", [{}])[-1].get("url")
-        }
-        for song in results[:limit] # Returns a list of song metadata.
+        item for item in best_items
+        if all(token in normalize_query(" ".join(str(item.get(field) or "") for field in SEARCH_TEXT_FIELDS))
+               for token in tokens)
     ]
 
 
+def peek_song_titles(song_title, limit=10):
+    return peek_search(song_title, "songs", limit)
+
+
+# Function that fetches search-box completions for a partial query
+def get_search_suggestions(query):
+    key = normalize_query(query)
+    suggestions = _suggestion_cache.get(key)
+    if suggestions is None:
+        suggestions = get_ytmusic().get_search_suggestions(query) or []
+        _suggestion_cache.set(key, suggestions)
+    return suggestions
+
+
 # Function that fetch weekly top songs from YouTube Music charts. (Currently doesn't work)
 def get_weekly_top_10(country="US"):
+    return _cached_home(("top_10", country), lambda: _fetch_weekly_top_10(country))
+
+
+def _fetch_weekly_top_10(country):
     try:
-        charts = ytmusic.get_charts(country=country)
+        charts = _get_charts(country)
 
         # Find the "Top 100 Music Videos" playlist (most consistent source of top songs)
         top_playlist = None
@@ -120,7 +231,7 @@ def get_weekly_top_10(country="US"):
         playlist_id = top_playlist["playlistId"]
 
         # Fetch actual songs from the playlist
-        playlist = ytmusic.get_playlist(playlist_id, limit=10)
+        playlist = get_ytmusic().get_playlist(playlist_id, limit=10)
         if not playlist or "tracks" not in playlist:
             print("No tracks found in playlist.")
             return None
@@ -156,7 +267,7 @@ def get_weekly_top_10(country="US"):
 # Function that fetches top artists from YouTube Music charts
 def get_top_artists(country="US", limit=5):
     try:
-        charts = ytmusic.get_charts(country=country)
+        charts = _get_charts(country)
         top_artists = charts.get("artists")
         if not top_artists:
             print(f"No top artists found for country '{country}'.")
@@ -179,7 +290,7 @@ def get_top_artists(country="US", limit=5):
 # Function that fetches new albums and singles from YouTube Music Explore page
 def get_new_albums_and_singles(limit=5):
     try:
-        explore_data = ytmusic.get_explore()  # returns a dict
+        explore_data = get_ytmusic().get_explore()  # returns a dict
         sections = explore_data.get("sections", [])
 
         # Look for a section with 'New releases' or similar variants
@@ -233,33 +344,108 @@ def get_new_albums_and_singles(limit=5):
         print(f"Error fetching new albums and singles: {e}")
         return []
 
+def _playlist_track(track):
+    artists = track.get("artists") or [{}]
+    thumbnails = track.get("thumbnails") or [{}]
+    return {
+        "title": track.get("title"),
+        "artist": artists[0].get("name", "Unknown Artist"),
+        "videoId": track.get("videoId"),
+        "thumbnails": thumbnails[-1].get("url", "")
+    }
+
 # Get Playlist Info
-def get_playlist(playlist_id):
+# limit=0 returns only the first page YouTube Music sends (about 100 tracks), None returns every track.
+def get_playlist(playlist_id, limit=None):
     # Get playlist metadata and its tracks using playlistId.
-    playlist = ytmusic.get_playlist(playlist_id, limit=20)
+    playlist = get_ytmusic().get_playlist(playlist_id, limit=limit)
     if not playlist:
         return None
 
-    tracks = [
-        {
-            "title": track["title"],
-            "artist": track["artists"][0]["name"],
-            "videoId": track.get("videoId"),
-            "thumbnails": track.get("thumbnails", [{}])[-1].get("url", "")
-        }
-        for track in playlist["tracks"]
-    ]
-
     return {
         "title": playlist.get("title"),
         "description": playlist.get("description"),
-        "tracks": tracks
+        "trackCount": playlist.get("trackCount"),
+        "tracks": [_playlist_track(track) for track in playlist.get("tracks", [])]
+    }
+
+# Yields a playlist one page (about 100 tracks) at a time, as YouTube Music sends them: the first page with
+# the playlist's details, then one page per continuation token. ytmusicapi's get_playlist only returns once it
+# has followed every continuation, so the continuations are followed here, with ytmusicapi's own parsers.
+# If the response isn't laid out the way they expect (or a ytmusicapi release moved them), the playlist is
+# loaded whole with get_playlist instead, as a single page.
+def iter_playlist_pages(playlist_id):
+    pages = _playlist_continuation_pages(playlist_id)
+    try:
+        first_page = next(pages, None)
+    except Exception as e:
+        print(f"Playlist paging unavailable ({e}), loading {playlist_id} in one request")
+        first_page, pages = get_playlist(playlist_id), iter(())
+    if not first_page:
+        return
+    yield first_page
+    yield from pages
+
+
+def _playlist_continuation_pages(playlist_id):
+    from ytmusicapi.continuations import get_continuation_token, CONTINUATION_ITEMS
+    from ytmusicapi.navigation import (nav, TWO_COLUMN_RENDERER, TAB_CONTENT, SECTION_LIST_ITEM, SECTION,
+                                       CONTENT, HEADER, RESPONSIVE_HEADER, EDITABLE_PLAYLIST_DETAIL_HEADER,
+                                       DESCRIPTION_SHELF)
+    from ytmusicapi.parsers.playlists import parse_playlist_items, parse_playlist_header_meta
+
+    ytmusic = get_ytmusic()
+    browse_id = playlist_id if playlist_id.startswith("VL") else "VL" + playlist_id
+    response = ytmusic._send_request("browse", {"browseId": browse_id})
+
+    header_data = nav(response, [*TWO_COLUMN_RENDERER, *TAB_CONTENT, *SECTION_LIST_ITEM])
+    if EDITABLE_PLAYLIST_DETAIL_HEADER[0] in header_data:  # the user's own playlist
+        header = nav(header_data, [*EDITABLE_PLAYLIST_DETAIL_HEADER, *HEADER, *RESPONSIVE_HEADER])
+    else:
+        header = nav(header_data, RESPONSIVE_HEADER)
+    meta = parse_playlist_header_meta(header)
+    description_shelf = nav(header, ["description", *DESCRIPTION_SHELF], True)
+    details = {
+        "title": meta.get("title"),
+        "description": "".join(run["text"] for run in description_shelf["description"]["runs"])
+                       if description_shelf else None,
+        "trackCount": meta.get("trackCount"),
     }
 
+    shelf = nav(response, [*TWO_COLUMN_RENDERER, "secondaryContents", *SECTION, *CONTENT,
+                           "musicPlaylistShelfRenderer"])
+    items = shelf.get("contents") or []
+    yield dict(details, tracks=[_playlist_track(track) for track in parse_playlist_items(items)])
+
+    token = get_continuation_token(items) if items else None
+    while token:
+        response = ytmusic._send_request("browse", {"continuation": token})
+        items = nav(response, CONTINUATION_ITEMS, True)
+        tracks = parse_playlist_items(items) if items else []
+        if not tracks:
+            return
+        yield dict(details, tracks=[_playlist_track(track) for track in tracks])
+        token = get_continuation_token(items)
+
+# Same pages for any browse id: albums come back whole in one page, playlists in chunks.
+def iter_tracklist_pages(browse_id):
+    if not browse_id:
+        return
+    if browse_id.startswith("MPRE"):
+        album = get_album_tracks(browse_id)
+        if album:
+            yield album
+    else:
+        yield from iter_playlist_pages(browse_id)
+
 # Function that fetches 5 recommended songs from YouTube Music
 def get_recommended_songs(limit=5):
+    return _cached_home(("recommended", limit), lambda: _fetch_recommended_songs(limit))
+
+
+def _fetch_recommended_songs(limit):
     try:
-        home = ytmusic.get_home()
+        home = get_ytmusic().get_home()
         for section in home:
             contents = section.get("contents", [])
             # Filter for song-type items with videoId and title
@@ -286,10 +472,17 @@ def get_recommended_songs(limit=5):
         print(f"Error fetching recommended songs: {e}")
         return None
 
+# Function that fetches the sections HomeScreen shows first, so building it doesn't wait on the network
+def prefetch_home_sections():
+    get_weekly_top_10()
+    get_top_artists()
+    get_recommended_songs()
+
+
 # Function for fetching all genres
 def get_genres():
     try:
-        genres = ytmusic.get_mood_categories()
+        genres = get_ytmusic().get_mood_categories()
         genres = genres.get("Genres", [])
         if not genres:
             print("No genres found in 'Genres' section.")
@@ -311,7 +504,7 @@ def get_genres():
 # Function for fetching songs based on a genre (Didn't work on most genres)
 def get_genre_songs(params=None):
     try:
-        genre_songs = ytmusic.get_mood_playlists(params)
+        genre_songs = get_ytmusic().get_mood_playlists(params)
 
         print(genre_songs)
     except Exception as e:
@@ -320,7 +513,7 @@ def get_genre_songs(params=None):
 
 # Function that fetch full album metadata/songs using browseId.
 def get_album_tracks(album_browse_id):
-    album_data = ytmusic.get_album(album_browse_id)
+    album_data = get_ytmusic().get_album(album_browse_id)
     if not album_data:
         return None
 
@@ -400,7 +593,7 @@ if __name__ == "__main__":
             print(f"{idx}. {s['title']} - {s['artist']} ({s['album']}) {s['thumbnails']}")
     '''
     '''
-    print("US Charts:", ytmusic.get_charts(country="US"))
+    print("US Charts:", get_ytmusic().get_charts(country="US"))
     '''
     '''
     genres = get_genres()
@@ -1,18 +1,19 @@
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QThreadPool
 from PyQt6.QtGui import QGuiApplication, QIcon
 from PyQt6.QtWidgets import QStackedWidget
 
-from screens.artist_screen import ArtistScreen
-from screens.game_info_screen import GameInfoScreen
+# Only the screens shown before login are imported up front. The rest (and
+# through them vlc, ytmusicapi, requests, eyed3...) are imported when first
+# needed, so the splash screen isn't held up by them.
 from screens.startup_screen import StartupScreen
 from screens.welcome_screen import WelcomeScreen
 from screens.login_screen import LoginScreen
-from screens.main_screen import MainScreen
-from screens.playlist_screen import PlaylistScreen
-from screens.music_player import MusicPlayer
-from screens.apionly_music_player import ApiMusicPlayer
+from controllers.warmup import start_warmup
 import config, os
 
+# Warm-up tasks MainScreen needs, so building it ahead of login doesn't do their work on the GUI thread
+MAIN_SCREEN_TASKS = ("main_screen", "playback_service", "library_model")
+
 class AppController:
     def __init__(self):
         self.widget = QStackedWidget()
@@ -35,7 +36,13 @@ class AppController:
         self.startup = StartupScreen(self)
         self.welcome = WelcomeScreen(self)
         self.login = LoginScreen(self)
-        self.main = None # will be initialized after login
+        self.main = None # built while the user logs in (prepare_main), or after login
+        self.main_wanted = False
+        self.home_prefetch = None
+
+        # Player windows are made once and shown/hidden; playback itself lives in the playback service
+        self.music_player = None
+        self.api_music_player = None
 
         # Track where the user came from when viewing game detail
         self.game_detail_source = 0  # 0=home, 1=genre, 2=search
@@ -50,6 +57,10 @@ class AppController:
 
         self.widget.show()
 
+        # Set up the database, player and API clients while the splash and login are shown
+        self.warmup = start_warmup(self.widget)
+        self.warmup.task_finished.connect(self.build_main_when_ready)
+
     def add_widget_stack(self):
         self.widget.addWidget(self.startup)
         self.widget.addWidget(self.welcome)
@@ -71,11 +82,53 @@ class AppController:
     def goto_welcome(self):
         self.widget.setCurrentWidget(self.welcome)
 
+    # Build MainScreen speculatively while the user is typing their credentials
+    def prepare_main(self):
+        self.main_wanted = True
+        self.build_main_when_ready()
+
+    def build_main_when_ready(self, *_):
+        if self.main_wanted and self.main is None and self.warmup.is_done(*MAIN_SCREEN_TASKS):
+            self.build_main()
+
+    def build_main(self):
+        self.warmup.require("main_screen")  # waits if the warm-up is still importing it
+        from screens.main_screen import MainScreen
+        from controllers.async_loader import TaskWorker
+        import controllers.api_client as ytapi
+
+        self.main = MainScreen(self)
+        self.widget.addWidget(self.main)
+
+        # Fetch the first page's sections off the GUI thread, then build the page from the cache
+        worker = TaskWorker(ytapi.prefetch_home_sections)
+        worker.signals.finished.connect(lambda _: self.on_home_prefetched(worker))
+        worker.signals.error.connect(lambda _: self.on_home_prefetched(worker))
+        self.home_prefetch = worker
+        QThreadPool.globalInstance().start(worker)
+
+    def on_home_prefetched(self, worker):
+        if worker is not self.home_prefetch:
+            return  # MainScreen was discarded
+        self.home_prefetch = None
+        self.main.music_pages[0].ensure_built()
+
+    # The login failed: drop the speculatively built MainScreen
+    def discard_main(self):
+        self.main_wanted = False
+        if self.home_prefetch:
+            self.home_prefetch.cancel()
+            self.home_prefetch = None
+        if self.main is not None:
+            self.main.cleanup_on_logout()
+            self.widget.removeWidget(self.main)
+            self.main.deleteLater()
+            self.main = None
+
     def goto_main(self):
-        # Load MainScreen dynamically after successful login.
+        # Normally already built while the user logged in
         if self.main is None:
-            self.main = MainScreen(self)
-            self.widget.addWidget(self.main)
+            self.build_main()
 
         self.widget.setCurrentWidget(self.main)
         self.switch_to_music_page(self.main.ui.tab_home)
@@ -114,6 +167,7 @@ class AppController:
                 old = music_stack.widget(4)
                 music_stack.removeWidget(old)
                 old.deleteLater()
+            from screens.artist_screen import ArtistScreen
             artist_widget = ArtistScreen(self, artist)
             music_stack.insertWidget(4, artist_widget)
             self.main.ui.home_stack.setCurrentIndex(0)
@@ -128,6 +182,7 @@ class AppController:
                 old = music_stack.widget(5)
                 music_stack.removeWidget(old)
                 old.deleteLater()
+            from screens.playlist_screen import PlaylistScreen
             playlist_widget = PlaylistScreen(self, browse_id, image)
             music_stack.insertWidget(5, playlist_widget)
             self.main.ui.home_stack.setCurrentIndex(0)
@@ -298,13 +353,34 @@ class AppController:
         self.main.ui.games_stack.setCurrentIndex(index)
 
     def open_music_player(self, song_title):
-        music_player = MusicPlayer(song_title)
-        music_player.exec()
-
-    def open_api_music_player(self, song):
+        from screens.library_list_view import get_library_model
+        from controllers.playback_service import get_playback_service
+        if self.music_player is None:
+            from screens.music_player import MusicPlayer
+            self.music_player = MusicPlayer()
+        get_playback_service().play_local(song_title, get_library_model().file_names())
+        self.show_music_player()
+
+    def open_api_music_player(self, song, playlist=None):
         print(f"{song['title']} - {song['artist']} ({song['videoId']}) {song['thumbnails']}")
-        music_player = ApiMusicPlayer(song)
-        music_player.exec()
+        from controllers.playback_service import get_playback_service
+        if self.api_music_player is None:
+            from screens.apionly_music_player import ApiMusicPlayer
+            self.api_music_player = ApiMusicPlayer()
+        get_playback_service().play_api(song, playlist)
+        self.show_music_player()
+
+    # Non-modal: the main window stays usable while the player is open
+    def show_music_player(self):
+        from controllers.playback_service import get_playback_service, LOCAL
+        playback = get_playback_service()
+        if playback.now_playing is None:
+            return
+        player = self.music_player if playback.source == LOCAL else self.api_music_player
+        if player is not None:
+            player.show()
+            player.raise_()
+            player.activateWindow()
 
     def show_game_detail(self, game_id, source=0):
         if self.main and hasattr(self.main, "ui"):
@@ -314,6 +390,7 @@ class AppController:
                 old = games_stack.widget(3)
                 games_stack.removeWidget(old)
                 old.deleteLater()
+            from screens.game_info_screen import GameInfoScreen
             game_info_widget = GameInfoScreen(self, game_id)
             games_stack.insertWidget(3, game_info_widget)
             self.main.ui.home_stack.setCurrentIndex(2)
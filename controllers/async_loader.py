@@ -1,26 +1,20 @@
 import os
 import config
 from functools import lru_cache
-from concurrent.futures import ThreadPoolExecutor
 
 from PyQt6.QtCore import (
     Qt, QSize, QUrl, QByteArray,
     QThreadPool, QRunnable, pyqtSignal, QObject
 )
 from PyQt6.QtGui import QPixmap, QIcon
-from PyQt6.QtNetwork import QNetworkAccessManager, QNetworkRequest
 
-import requests
-
-
-_network_manager = QNetworkAccessManager()
-_thread_pool = ThreadPoolExecutor(max_workers=8)
 
 @lru_cache(maxsize=256)
 def _cached_image_bytes(url: str) -> QByteArray:
+    from controllers.http_session import get_session  # requests is imported on the first image, not with the UI
 
     try:
-        response = requests.get(url, timeout=6)
+        response = get_session().get(url, timeout=6)
         response.raise_for_status()
         data = response.content
 
@@ -49,6 +43,71 @@ class ImageLoader(QRunnable):
         if not self._cancelled:
             self.signals.finished.emit(self.url, data)
 
+class TaskWorkerSignals(QObject):
+    started = pyqtSignal()  # a pool thread picked the task up
+    finished = pyqtSignal(object)  # result
+    error = pyqtSignal(str)  # error message
+
+class TaskWorker(QRunnable):
+    """Run a blocking call off the GUI thread and emit its result."""
+    def __init__(self, fn, *args, **kwargs):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = TaskWorkerSignals()
+        self._cancelled = False
+
+    # Results of a cancelled task are dropped (a call already running still completes).
+    def cancel(self):
+        self._cancelled = True
+
+    def run(self):
+        if self._cancelled:
+            return
+        self.signals.started.emit()
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            if not self._cancelled:
+                self.signals.error.emit(str(e))
+            return
+        if not self._cancelled:
+            self.signals.finished.emit(result)
+
+class PageLoaderSignals(QObject):
+    page = pyqtSignal(object)  # one page of results
+    finished = pyqtSignal()
+    error = pyqtSignal(str)
+
+class PageLoader(QRunnable):
+    """Run a generator function off the GUI thread and emit every page it yields."""
+    def __init__(self, fn, *args):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.signals = PageLoaderSignals()
+        self._cancelled = False
+
+    # Stop emitting; the generator is abandoned at its next page.
+    def cancel(self):
+        self._cancelled = True
+
+    def run(self):
+        if self._cancelled:
+            return
+        try:
+            for page in self.fn(*self.args):
+                if self._cancelled:
+                    return
+                self.signals.page.emit(page)
+        except Exception as e:
+            if not self._cancelled:
+                self.signals.error.emit(str(e))
+            return
+        if not self._cancelled:
+            self.signals.finished.emit()
+
 # Load placeholder once
 def load_placeholder_pixmap() -> QPixmap:
     """Load placeholder image from assets. Returns gray square if missing."""
@@ -0,0 +1,202 @@
+"""
+Persistent on-disk cache for downloaded API audio.
+
+Files are keyed by videoId and format and tracked in an index (index.json)
+that records size, duration, bitrate and last access time. Downloads are
+written to a .part file first and only moved into place once complete, so
+a partial download is never served. When the cache grows past its quota
+the least recently played files are evicted.
+
+Cache hits only update last access times in memory; the index is written
+when files are added or evicted, a few seconds after the last hit, and at
+exit.
+"""
+import os
+import json
+import atexit
+import time
+import tempfile
+import threading
+import config
+
+INDEX_FILE = "index.json"
+INDEX_SAVE_DELAY = 10  # seconds after a cache hit before its access time is written
+
+
+class AudioCache:
+    def __init__(self, cache_dir=config.AUDIO_CACHE_PATH, max_bytes=config.AUDIO_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(cache_dir, INDEX_FILE)
+        self._lock = threading.RLock()
+        self._in_progress = set()
+        self._dirty = False  # last access times changed since the index was written
+        self._save_timer = None
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self._entries = self._load_index()
+
+    @staticmethod
+    def make_key(video_id, format_id):
+        return f"{video_id}.{format_id}"
+
+    # Return the most recently used complete entry for a videoId (any format), or None.
+    def lookup(self, video_id):
+        with self._lock:
+            matches = [e for e in self._entries.values() if e["videoId"] == video_id]
+            for entry in sorted(matches, key=lambda e: e["last_access"], reverse=True):
+                path = os.path.join(self.cache_dir, entry["file"])
+                if os.path.exists(path):
+                    entry["last_access"] = time.time()
+                    self._mark_dirty()
+                    return dict(entry, path=path)
+                # File vanished behind our back
+                del self._entries[entry["key"]]
+                self._mark_dirty()
+            return None
+
+    def contains(self, video_id):
+        with self._lock:
+            return any(e["videoId"] == video_id for e in self._entries.values())
+
+    def is_writing(self, video_id):
+        with self._lock:
+            return any(key.startswith(video_id + ".") for key in self._in_progress)
+
+    # Reserve a key for downloading. Returns a .part path, or None if already cached/downloading.
+    def begin_write(self, video_id, format_id):
+        key = self.make_key(video_id, format_id)
+        with self._lock:
+            if key in self._entries or key in self._in_progress:
+                return None
+            self._in_progress.add(key)
+        fd, part_path = tempfile.mkstemp(prefix=key + ".", suffix=".part", dir=self.cache_dir)
+        os.close(fd)
+        return part_path
+
+    # Atomically move a finished download into the cache and record it in the index.
+    def commit(self, video_id, format_id, ext, part_path, duration=None, bitrate=None):
+        key = self.make_key(video_id, format_id)
+        file_name = f"{key}.{ext}"
+        path = os.path.join(self.cache_dir, file_name)
+        with self._lock:
+            os.replace(part_path, path)
+            now = time.time()
+            self._entries[key] = {
+                "key": key,
+                "videoId": video_id,
+                "format_id": format_id,
+                "file": file_name,
+                "size": os.path.getsize(path),
+                "duration": duration,
+                "bitrate": bitrate,
+                "created": now,
+                "last_access": now,
+            }
+            self._in_progress.discard(key)
+            self._evict(keep=key)
+            self._save_index()
+        return path
+
+    def abort(self, video_id, format_id, part_path):
+        with self._lock:
+            self._in_progress.discard(self.make_key(video_id, format_id))
+        if part_path and os.path.exists(part_path):
+            os.remove(part_path)
+
+    def flush(self):
+        """Write the index now if it has unsaved changes."""
+        with self._lock:
+            if self._dirty:
+                self._save_index()
+
+    def total_size(self):
+        with self._lock:
+            return sum(e["size"] for e in self._entries.values())
+
+    # Drop least recently used files until the cache fits in its quota.
+    def _evict(self, keep=None):
+        total = sum(e["size"] for e in self._entries.values())
+        if total <= self.max_bytes:
+            return
+        for entry in sorted(self._entries.values(), key=lambda e: e["last_access"]):
+            if total <= self.max_bytes:
+                break
+            if entry["key"] == keep:
+                continue
+            try:
+                os.remove(os.path.join(self.cache_dir, entry["file"]))
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"[AudioCache] Could not evict {entry['file']}: {e}")
+                continue
+            total -= entry["size"]
+            del self._entries[entry["key"]]
+
+    # Coalesce index writes from cache hits into one, INDEX_SAVE_DELAY after the first.
+    def _mark_dirty(self):
+        self._dirty = True
+        if self._save_timer is None:
+            self._save_timer = threading.Timer(INDEX_SAVE_DELAY, self._on_save_timer)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def _on_save_timer(self):
+        with self._lock:
+            self._save_timer = None
+            if self._dirty:
+                self._save_index()
+
+    def _load_index(self):
+        # Leftover partial downloads and index temp files from a previous run are never valid
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".part") or (name.startswith(INDEX_FILE + ".") and name.endswith(".tmp")):
+                try:
+                    os.remove(os.path.join(self.cache_dir, name))
+                except OSError:
+                    pass
+
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            print(f"[AudioCache] Index unreadable, starting fresh: {e}")
+            return {}
+
+        return {
+            key: entry for key, entry in entries.items()
+            if os.path.exists(os.path.join(self.cache_dir, entry.get("file", "")))
+        }
+
+    # Write the index to a temp file and swap it in so it is never half-written.
+    def _save_index(self):
+        if self._save_timer is not None:
+            self._save_timer.cancel()
+            self._save_timer = None
+        self._dirty = False
+        fd, tmp_path = tempfile.mkstemp(prefix=INDEX_FILE + ".", suffix=".tmp", dir=self.cache_dir)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f)
+            os.replace(tmp_path, self.index_path)
+        except Exception as e:
+            print(f"[AudioCache] Could not save index: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+
+_audio_cache = None
+_audio_cache_lock = threading.Lock()
+
+
+def get_audio_cache():
+    """Get the shared audio cache (created on first use)."""
+    global _audio_cache
+    with _audio_cache_lock:
+        if _audio_cache is None:
+            _audio_cache = AudioCache()
+            atexit.register(_audio_cache.flush)
+        return _audio_cache
@@ -0,0 +1,222 @@
+"""
+Audio pipeline for API (YouTube Music) playback.
+
+Resolving a song only extracts the best audio stream URL, so VLC can start
+progressive playback right away. The same stream is then downloaded in the
+background into the persistent audio cache so replays don't have to go back
+to YouTube. AudioPrefetcher does the same ahead of time for the next songs
+in the playback queue.
+
+Resolves (up to EXTRACTOR_TIMEOUT) and downloads (a whole file) are long,
+so they run on their own pool (get_audio_pool) and never hold the global
+pool's threads that the UI's image and page loaders need.
+"""
+import threading
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from controllers.audio_cache import get_audio_cache
+from controllers.extractor_pool import get_extractor_pool
+import config
+
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
+DOWNLOAD_TIMEOUT = 15  # seconds
+
+_audio_pool = None
+_audio_pool_lock = threading.Lock()
+
+
+def get_audio_pool():
+    """Get the thread pool stream resolves and audio downloads run on."""
+    global _audio_pool
+    with _audio_pool_lock:
+        if _audio_pool is None:
+            _audio_pool = QThreadPool()
+            _audio_pool.setMaxThreadCount(config.AUDIO_THREADS)
+        return _audio_pool
+
+
+# Stream info VLC and the downloader need, from an extractor pool result
+def _stream_from_result(video_id, result):
+    return {
+        "videoId": video_id,
+        "url": result["url"],
+        "ext": result.get("ext") or "webm",
+        "format_id": result.get("format_id"),
+        "http_headers": result.get("http_headers") or {},
+        "duration": result.get("duration"),
+        "abr": result.get("abr"),
+        "filesize": result.get("filesize"),
+        "expires": result["expires"],
+    }
+
+
+# Extract (without downloading) the best audio stream, in an extractor process.
+def resolve_audio_stream(video_id):
+    return _stream_from_result(video_id, get_extractor_pool().extract("audio", video_id))
+
+
+# Already extracted stream whose URL is still valid, or None. Never blocks.
+def cached_audio_stream(video_id):
+    result = get_extractor_pool().peek("audio", video_id)
+    return _stream_from_result(video_id, result) if result else None
+
+
+# VLC media options so googlevideo accepts the request like it did for yt-dlp.
+def vlc_media_options(stream):
+    headers = stream.get("http_headers", {})
+    options = []
+    if headers.get("User-Agent"):
+        options.append(f":http-user-agent={headers['User-Agent']}")
+    if headers.get("Referer"):
+        options.append(f":http-referrer={headers['Referer']}")
+    return options
+
+
+class StreamResolverSignals(QObject):
+    progress = pyqtSignal(str)  # status message
+    resolved = pyqtSignal(object)  # stream info dict
+    error = pyqtSignal(str)  # error message
+
+
+class StreamResolver(QRunnable):
+    def __init__(self, video_id):
+        super().__init__()
+        self.video_id = video_id
+        self.signals = StreamResolverSignals()
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def run(self):
+        if self._cancelled:
+            return
+        self.signals.progress.emit("Resolving audio stream...")
+        try:
+            stream = resolve_audio_stream(self.video_id)
+        except Exception as e:
+            if not self._cancelled:
+                self.signals.error.emit(str(e))
+            return
+        if not self._cancelled:
+            self.signals.resolved.emit(stream)
+
+
+class AudioDownloadSignals(QObject):
+    progress = pyqtSignal(int, int)  # bytes downloaded, total bytes (0 if unknown)
+    finished = pyqtSignal(str)  # path of the completed file
+    error = pyqtSignal(str)  # error message
+
+
+class AudioDownloader(QRunnable):
+    """Download an already resolved stream into the audio cache.
+
+    Keeps running after the player closes so the song is cached for next time.
+    """
+    def __init__(self, stream, cache=None):
+        super().__init__()
+        self.stream = stream
+        self.cache = cache or get_audio_cache()
+        self.signals = AudioDownloadSignals()
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def run(self):
+        video_id = self.stream["videoId"]
+        format_id = self.stream.get("format_id") or "best"
+
+        part_path = self.cache.begin_write(video_id, format_id)
+        if part_path is None:
+            return  # Already cached or being downloaded by another worker
+
+        import requests
+        try:
+            with requests.get(self.stream["url"], headers=self.stream.get("http_headers"),
+                              stream=True, timeout=DOWNLOAD_TIMEOUT) as response:
+                response.raise_for_status()
+                total = int(response.headers.get("Content-Length") or 0)
+                downloaded = 0
+                with open(part_path, "wb") as f:
+                    for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                        if self._cancelled:
+                            break
+                        f.write(chunk)
+                        downloaded += len(chunk)
+                        self.signals.progress.emit(downloaded, total)
+
+            if self._cancelled:
+                self.cache.abort(video_id, format_id, part_path)
+                return
+            if total and downloaded != total:
+                raise IOError(f"Incomplete download ({downloaded}/{total} bytes)")
+
+            path = self.cache.commit(
+                video_id, format_id, self.stream["ext"], part_path,
+                duration=self.stream.get("duration"),
+                bitrate=self.stream.get("abr"),
+            )
+        except Exception as e:
+            self.cache.abort(video_id, format_id, part_path)
+            if not self._cancelled:
+                self.signals.error.emit(str(e))
+            return
+
+        self.signals.finished.emit(path)
+
+
+class AudioPrefetcher(QObject):
+    """Resolve and cache upcoming songs in the background.
+
+    Resolved streams land in the extractor pool's cache, so a player that
+    switches to a prefetched song needs no extraction (and no network wait at
+    all once its download has landed in the audio cache).
+    """
+    def __init__(self):
+        super().__init__()
+        self._pending = {}  # videoId -> StreamResolver
+
+    def stream_for(self, video_id):
+        return cached_audio_stream(video_id)
+
+    def prefetch(self, songs):
+        cache = get_audio_cache()
+        for song in songs:
+            video_id = song.get("videoId")
+            if not video_id or video_id in self._pending:
+                continue
+            if cache.contains(video_id) or cache.is_writing(video_id):
+                continue
+
+            stream = self.stream_for(video_id)
+            if stream:
+                self._download(stream)
+                continue
+
+            resolver = StreamResolver(video_id)
+            resolver.signals.resolved.connect(self._on_resolved)
+            resolver.signals.error.connect(lambda _, v=video_id: self._on_error(v))
+            self._pending[video_id] = resolver
+            get_audio_pool().start(resolver)
+
+    def _on_resolved(self, stream):
+        self._pending.pop(stream["videoId"], None)
+        self._download(stream)
+
+    # A song that can't be prefetched is simply resolved again when it's played
+    def _on_error(self, video_id):
+        self._pending.pop(video_id, None)
+
+    def _download(self, stream):
+        get_audio_pool().start(AudioDownloader(stream))
+
+
+_prefetcher = None
+
+
+def get_prefetcher():
+    """Get the shared prefetcher (created on first use, after QApplication exists)."""
+    global _prefetcher
+    if _prefetcher is None:
+        _prefetcher = AudioPrefetcher()
+    return _prefetcher
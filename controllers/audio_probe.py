@@ -0,0 +1,406 @@
+"""
+Header-only probing of local audio files.
+
+Reads duration, bitrate, title/artist/album and the cover picture from the
+container headers through mmap, without decoding audio or loading the whole
+file: the ID3v2 tag, the first MPEG frame with its Xing/Info/VBRI header and
+the ID3v1 trailer for MP3, STREAMINFO/VORBIS_COMMENT/PICTURE blocks for
+FLAC, the identification/comment headers and the last page's granule
+position for Ogg Vorbis/Opus, and the moov atom for M4A. Only the pages
+touched by these reads are paged in, so scanning a library costs about as
+much as listing it.
+"""
+import os
+import mmap
+import struct
+
+MPEG_SYNC_SEARCH = 64 * 1024  # bytes after the ID3v2 tag searched for the first frame
+OGG_HEADER_SEARCH = 256 * 1024  # comment header is near the start, last page near the end
+
+# kbps by [MPEG1?][layer], index 1..14
+MPEG_BITRATES = {
+    (True, 1): (32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (True, 2): (32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (True, 3): (32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (False, 1): (32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (False, 2): (8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (False, 3): (8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+MPEG_SAMPLE_RATES = {3: (44100, 48000, 32000), 2: (22050, 24000, 16000), 0: (11025, 12000, 8000)}
+
+ID3_TEXT_FRAMES = {
+    "TIT2": "title", "TT2": "title",
+    "TPE1": "artist", "TP1": "artist",
+    "TALB": "album", "TAL": "album",
+}
+ID3_LYRICS_FRAMES = {"SYLT", "USLT", "SLT", "ULT"}
+COMMENT_LYRICS_MIN = 30  # comment text long enough to be lyrics (same heuristic as the eyed3 fallback)
+
+VORBIS_FIELDS = {"TITLE": "title", "ARTIST": "artist", "ALBUM": "album"}
+VORBIS_LYRICS_FIELDS = {"LYRICS", "UNSYNCEDLYRICS"}
+
+MP4_FIELDS = {b"\xa9nam": "title", b"\xa9ART": "artist", b"\xa9alb": "album"}
+
+
+def _be32(mm, pos):
+    return struct.unpack_from(">I", mm, pos)[0]
+
+
+def _le32(mm, pos):
+    return struct.unpack_from("<I", mm, pos)[0]
+
+
+def _syncsafe(data):
+    return (data[0] << 21) | (data[1] << 14) | (data[2] << 7) | data[3]
+
+
+def _decode(data, encoding):
+    codec = {0: "latin-1", 1: "utf-16", 2: "utf-16-be", 3: "utf-8"}.get(encoding, "latin-1")
+    return data.decode(codec, errors="replace").split("\x00", 1)[0].strip() or None
+
+
+# End of a null-terminated string in an ID3 frame (two zero bytes on a 2-byte boundary for UTF-16)
+def _terminator(data, start, encoding):
+    if encoding in (1, 2):
+        pos = start
+        while pos + 1 < len(data):
+            if data[pos] == 0 and data[pos + 1] == 0:
+                return pos, pos + 2
+            pos += 2
+        return len(data), len(data)
+    end = data.find(b"\x00", start)
+    return (end, end + 1) if end >= 0 else (len(data), len(data))
+
+
+def _apic(frame, legacy):
+    """(picture type, image bytes) of an APIC (ID3v2.3/2.4) or PIC (ID3v2.2) frame."""
+    encoding = frame[0]
+    if legacy:
+        pos = 4  # 3-byte image format
+    else:
+        pos = frame.find(b"\x00", 1) + 1
+        if pos <= 0:
+            return None, None
+    picture_type = frame[pos] if pos < len(frame) else None
+    _, data_start = _terminator(frame, pos + 1, encoding)
+    return picture_type, frame[data_start:] or None
+
+
+def _empty_info():
+    return {
+        "duration": None,
+        "bitrate": None,
+        "title": None,
+        "artist": None,
+        "album": None,
+        "cover": None,
+        "has_lyrics": False,
+    }
+
+
+# ---------------------------------------------------------------- MP3
+
+def _read_id3v2(mm, info):
+    """Parse the ID3v2 tag at the start of the file and return where the audio starts."""
+    if len(mm) < 10 or mm[:3] != b"ID3":
+        return 0
+    major, flags = mm[3], mm[5]
+    end = 10 + _syncsafe(mm[6:10])
+    audio_start = end + (10 if flags & 0x10 else 0)
+    if flags & 0x80 and major < 4:
+        return audio_start  # whole-tag unsynchronisation: frames can't be sliced as-is
+
+    pos = 10
+    if flags & 0x40:
+        pos += _syncsafe(mm[10:14]) if major == 4 else _be32(mm, 10) + 4
+    id_len, header_len = (3, 6) if major == 2 else (4, 10)
+    end = min(end, len(mm))
+    cover_type = None
+
+    while pos + header_len <= end:
+        frame_id = mm[pos:pos + id_len]
+        if frame_id[0] == 0:
+            break  # padding
+        if major == 2:
+            size = int.from_bytes(mm[pos + 3:pos + 6], "big")
+        elif major == 4:
+            size = _syncsafe(mm[pos + 4:pos + 8])
+        else:
+            size = _be32(mm, pos + 4)
+        body = pos + header_len
+        if size <= 0 or body + size > end:
+            break
+        pos = body + size
+        frame_id = frame_id.decode("latin-1")
+
+        field = ID3_TEXT_FRAMES.get(frame_id)
+        if field:
+            if info[field] is None:
+                info[field] = _decode(mm[body + 1:body + size], mm[body])
+        elif frame_id in ("APIC", "PIC"):
+            # Front cover wins, otherwise the first picture
+            if cover_type != 3:
+                picture_type, data = _apic(mm[body:body + size], frame_id == "PIC")
+                if data and (info["cover"] is None or picture_type == 3):
+                    info["cover"], cover_type = data, picture_type
+        elif frame_id in ID3_LYRICS_FRAMES:
+            info["has_lyrics"] = True
+        elif frame_id in ("COMM", "COM") and size > 4 + COMMENT_LYRICS_MIN:
+            info["has_lyrics"] = True
+    return audio_start
+
+
+def _read_id3v1(mm, info):
+    """Fill missing tags from the ID3v1 trailer; returns its size (0 or 128)."""
+    if len(mm) < 128 or mm[-128:-125] != b"TAG":
+        return 0
+    trailer = mm[-128:]
+    for field, start in (("title", 3), ("artist", 33), ("album", 63)):
+        if info[field] is None:
+            info[field] = _decode(trailer[start:start + 30], 0)
+    return 128
+
+
+def _mpeg_frame(header):
+    """(is_mpeg1, layer, bitrate_kbps, sample_rate, frame_length, mono) of a frame header, or None."""
+    if (header >> 21) & 0x7FF != 0x7FF:
+        return None
+    version = (header >> 19) & 3
+    layer = 4 - ((header >> 17) & 3)
+    bitrate_index = (header >> 12) & 0xF
+    rate_index = (header >> 10) & 3
+    if version == 1 or layer == 4 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+    mpeg1 = version == 3
+    bitrate = MPEG_BITRATES[(mpeg1, layer)][bitrate_index - 1]
+    sample_rate = MPEG_SAMPLE_RATES[version][rate_index]
+    padding = (header >> 9) & 1
+    if layer == 1:
+        length = (12 * bitrate * 1000 // sample_rate + padding) * 4
+    else:
+        length = (144 if mpeg1 or layer == 2 else 72) * bitrate * 1000 // sample_rate + padding
+    mono = (header >> 6) & 3 == 3
+    return mpeg1, layer, bitrate, sample_rate, length, mono
+
+
+def _first_frame(mm, start, end):
+    pos = start
+    limit = min(end, start + MPEG_SYNC_SEARCH)
+    while 0 <= pos < limit - 4:
+        pos = mm.find(b"\xff", pos, limit - 3)
+        if pos < 0:
+            return None, None
+        frame = _mpeg_frame(_be32(mm, pos))
+        if frame:
+            # Check the next frame header too, so stray 0xFF bytes aren't taken for a frame
+            following = pos + frame[4]
+            if following + 4 > end or _mpeg_frame(_be32(mm, following)):
+                return pos, frame
+        pos += 1
+    return None, None
+
+
+def _probe_mp3(mm, info):
+    audio_start = _read_id3v2(mm, info)
+    audio_end = len(mm) - _read_id3v1(mm, info)
+    pos, frame = _first_frame(mm, audio_start, audio_end)
+    if frame is None:
+        return
+    mpeg1, layer, bitrate, sample_rate, _, mono = frame
+    samples = 384 if layer == 1 else (1152 if mpeg1 or layer == 2 else 576)
+
+    frames = stream_bytes = None
+    xing = pos + 4 + ((17 if mono else 32) if mpeg1 else (9 if mono else 17))
+    if mm[xing:xing + 4] in (b"Xing", b"Info"):
+        flags = _be32(mm, xing + 4)
+        field = xing + 8
+        if flags & 1:
+            frames = _be32(mm, field)
+            field += 4
+        if flags & 2:
+            stream_bytes = _be32(mm, field)
+    elif mm[pos + 36:pos + 40] == b"VBRI":
+        stream_bytes = _be32(mm, pos + 46)
+        frames = _be32(mm, pos + 50)
+
+    if frames:
+        info["duration"] = frames * samples / sample_rate
+        info["bitrate"] = round((stream_bytes or audio_end - pos) * 8 / info["duration"] / 1000)
+    else:
+        # CBR: no frame count, the stream length gives the duration
+        info["duration"] = (audio_end - pos) * 8 / (bitrate * 1000)
+        info["bitrate"] = bitrate
+
+
+# ---------------------------------------------------------------- FLAC / Ogg (Vorbis comments)
+
+def _read_vorbis_comments(mm, pos, end, info):
+    vendor_length = _le32(mm, pos)
+    pos += 4 + vendor_length
+    count = _le32(mm, pos)
+    pos += 4
+    for _ in range(count):
+        if pos + 4 > end:
+            break
+        length = _le32(mm, pos)
+        comment = mm[pos + 4:pos + 4 + length].decode("utf-8", errors="replace")
+        pos += 4 + length
+        key, _, value = comment.partition("=")
+        key = key.upper()
+        field = VORBIS_FIELDS.get(key)
+        if field and info[field] is None:
+            info[field] = value.strip() or None
+        elif key in VORBIS_LYRICS_FIELDS and value.strip():
+            info["has_lyrics"] = True
+
+
+def _probe_flac(mm, info):
+    pos = 4
+    sample_rate = total_samples = 0
+    while pos + 4 <= len(mm):
+        header = mm[pos]
+        block_type = header & 0x7F
+        size = int.from_bytes(mm[pos + 1:pos + 4], "big")
+        body = pos + 4
+        if block_type == 0:  # STREAMINFO
+            sample_rate = int.from_bytes(mm[body + 10:body + 13], "big") >> 4
+            total_samples = ((mm[body + 13] & 0x0F) << 32) | _be32(mm, body + 14)
+        elif block_type == 4:  # VORBIS_COMMENT
+            _read_vorbis_comments(mm, body, body + size, info)
+        elif block_type == 6 and info["cover"] is None:  # PICTURE
+            picture_type = _be32(mm, body)
+            field = body + 8 + _be32(mm, body + 4)  # after MIME type
+            field += 4 + _be32(mm, field)  # after description
+            field += 16  # width, height, depth, colors
+            length = _be32(mm, field)
+            if picture_type == 3 or info["cover"] is None:
+                info["cover"] = mm[field + 4:field + 4 + length] or None
+        pos = body + size
+        if header & 0x80:
+            break
+
+    if sample_rate and total_samples:
+        info["duration"] = total_samples / sample_rate
+        info["bitrate"] = round((len(mm) - pos) * 8 / info["duration"] / 1000)
+
+
+def _probe_ogg(mm, info):
+    packet = 27 + mm[26]
+    if mm[packet:packet + 7] == b"\x01vorbis":
+        sample_rate, pre_skip = _le32(mm, packet + 12), 0
+        comments = mm.find(b"\x03vorbis", packet, OGG_HEADER_SEARCH)
+        comments = comments + 7 if comments >= 0 else -1
+    elif mm[packet:packet + 8] == b"OpusHead":
+        sample_rate, pre_skip = 48000, struct.unpack_from("<H", mm, packet + 10)[0]
+        comments = mm.find(b"OpusTags", packet, OGG_HEADER_SEARCH)
+        comments = comments + 8 if comments >= 0 else -1
+    else:
+        return
+
+    if comments >= 0:
+        try:
+            # A comment header spanning pages has page headers in it: read what's intact
+            _read_vorbis_comments(mm, comments, len(mm), info)
+        except (struct.error, IndexError):
+            pass
+
+    last_page = mm.rfind(b"OggS", max(len(mm) - OGG_HEADER_SEARCH, 0))
+    if last_page >= 0 and sample_rate:
+        granule = struct.unpack_from("<q", mm, last_page + 6)[0]
+        if granule > pre_skip:
+            info["duration"] = (granule - pre_skip) / sample_rate
+            info["bitrate"] = round(len(mm) * 8 / info["duration"] / 1000)
+
+
+# ---------------------------------------------------------------- M4A
+
+def _atoms(mm, start, end):
+    pos = start
+    while pos + 8 <= end:
+        size = _be32(mm, pos)
+        name = mm[pos + 4:pos + 8]
+        header = 8
+        if size == 1:
+            size = struct.unpack_from(">Q", mm, pos + 8)[0]
+            header = 16
+        elif size == 0:
+            size = end - pos
+        if size < header:
+            return
+        yield name, pos + header, min(pos + size, end)
+        pos += size
+
+
+def _child(mm, start, end, name):
+    for atom, body, atom_end in _atoms(mm, start, end):
+        if atom == name:
+            return body, atom_end
+    return None
+
+
+def _probe_m4a(mm, info):
+    moov = _child(mm, 0, len(mm), b"moov")
+    if not moov:
+        return
+
+    mvhd = _child(mm, *moov, b"mvhd")
+    if mvhd:
+        body = mvhd[0]
+        if mm[body] == 1:
+            timescale, duration = struct.unpack_from(">IQ", mm, body + 20)
+        else:
+            timescale, duration = struct.unpack_from(">II", mm, body + 12)
+        if timescale and duration:
+            info["duration"] = duration / timescale
+            info["bitrate"] = round(len(mm) * 8 / info["duration"] / 1000)
+
+    udta = _child(mm, *moov, b"udta")
+    meta = _child(mm, *udta, b"meta") if udta else None
+    ilst = _child(mm, meta[0] + 4, meta[1], b"ilst") if meta else None  # meta is a full box
+    if not ilst:
+        return
+    for name, body, end in _atoms(mm, *ilst):
+        data = _child(mm, body, end, b"data")
+        if not data:
+            continue
+        value = mm[data[0] + 8:data[1]]  # after type and locale
+        field = MP4_FIELDS.get(name)
+        if field:
+            info[field] = value.decode("utf-8", errors="replace").strip() or None
+        elif name == b"covr":
+            info["cover"] = value or None
+        elif name == b"\xa9lyr" and value.strip():
+            info["has_lyrics"] = True
+
+
+def probe(path):
+    """
+    Read duration, bitrate and tags of an audio file from its headers only.
+
+    Args:
+        path: Audio file path (MP3, FLAC, Ogg Vorbis/Opus or M4A; other
+              formats give an empty result)
+
+    Returns:
+        Dict with duration (seconds), bitrate (kbps), title, artist, album,
+        cover (image bytes) and has_lyrics; values are None/False when unknown
+    """
+    info = _empty_info()
+    try:
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return info
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                head = mm[:12]
+                if head[:4] == b"fLaC":
+                    _probe_flac(mm, info)
+                elif head[:4] == b"OggS":
+                    _probe_ogg(mm, info)
+                elif head[4:8] == b"ftyp":
+                    _probe_m4a(mm, info)
+                elif (head[:3] == b"ID3" or (head[0] == 0xFF and head[1] & 0xE0 == 0xE0)
+                      or os.path.splitext(path)[1].lower() == ".mp3"):
+                    _probe_mp3(mm, info)
+    except (OSError, ValueError, struct.error, IndexError) as e:
+        print(f"[Probe] Could not read {path}: {e}")
+    return info
@@ -0,0 +1,237 @@
+"""
+Process pool for yt-dlp extraction.
+
+yt-dlp extraction is CPU-heavy pure Python, so running it on a thread still
+makes the UI hitch because of the GIL. Jobs are sent to a few long-lived
+worker processes instead (controllers/extractor_worker.py), and the results
+are cached here until their stream URLs expire, so the UI process never
+runs extractor code itself.
+"""
+import time
+import atexit
+import importlib.util
+import threading
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FuturesTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from urllib.parse import urlparse, parse_qs
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from controllers import extractor_worker
+import config
+
+# Checked without importing yt_dlp into the UI process
+YT_DLP_AVAILABLE = importlib.util.find_spec("yt_dlp") is not None
+
+STREAM_URL_DEFAULT_TTL = 60 * 60  # seconds, used when the URL has no expire param
+STREAM_URL_EXPIRY_MARGIN = 60  # seconds
+
+
+def watch_url(video_id):
+    return f"https://www.youtube.com/watch?v={video_id}"
+
+
+# googlevideo URLs carry their expiry time as a unix timestamp in the query string
+def stream_url_expiry(url):
+    try:
+        return int(parse_qs(urlparse(url).query)["expire"][0])
+    except (KeyError, ValueError, IndexError):
+        return int(time.time()) + STREAM_URL_DEFAULT_TTL
+
+
+class ExtractorPool:
+    def __init__(self, max_workers=config.EXTRACTOR_PROCESSES, cache_entries=config.EXTRACTOR_CACHE_ENTRIES):
+        self.max_workers = max_workers
+        self.cache_entries = cache_entries
+        self._executor = None
+        self._lock = threading.Lock()
+        self._cache = OrderedDict()  # (profile, video_id) -> extraction result, least recently used first
+        self._inflight = {}  # (profile, video_id) -> (Future, executor it runs on)
+
+    def _get_executor(self):
+        if self._executor is None:
+            # spawn: never fork a process that has Qt and VLC threads running
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=extractor_worker.init_worker,
+            )
+        return self._executor
+
+    def peek(self, profile, video_id):
+        """Cached result whose URLs are still valid, or None. Never blocks."""
+        key = (profile, video_id)
+        with self._lock:
+            result = self._cache.get(key)
+            if result and result["expires"] - STREAM_URL_EXPIRY_MARGIN > time.time():
+                self._cache.move_to_end(key)
+                return result
+            self._cache.pop(key, None)
+            return None
+
+    def extract(self, profile, video_id, timeout=config.EXTRACTOR_TIMEOUT):
+        """Extract a video in a worker process. Blocks the calling (worker) thread."""
+        result = self.peek(profile, video_id)
+        if result:
+            return result
+
+        key = (profile, video_id)
+        with self._lock:
+            job = self._inflight.get(key)
+            if job is None:
+                executor = self._get_executor()
+                job = (executor.submit(extractor_worker.extract, profile, watch_url(video_id)), executor)
+                self._inflight[key] = job
+        future, executor = job
+
+        try:
+            result = future.result(timeout=timeout)
+        except BrokenProcessPool:
+            # A worker died (crash/kill): start a fresh pool for the next job
+            self._discard_executor(executor)
+            raise RuntimeError("Extractor process stopped unexpectedly")
+        except FuturesTimeoutError:
+            if not future.cancel():
+                # Hung in a worker process: that slot only comes back with a fresh pool
+                self._discard_executor(executor)
+            raise RuntimeError(f"Extraction timed out after {timeout} s")
+        finally:
+            with self._lock:
+                if self._inflight.get(key) is job:
+                    del self._inflight[key]
+
+        result["expires"] = stream_url_expiry(result["url"])
+        with self._lock:
+            self._cache[key] = result
+            self._trim_cache()
+        return result
+
+    # Drop expired results, then the least recently used ones past cache_entries (lock held).
+    def _trim_cache(self):
+        now = time.time()
+        for key in [k for k, r in self._cache.items() if r["expires"] - STREAM_URL_EXPIRY_MARGIN <= now]:
+            del self._cache[key]
+        while len(self._cache) > self.cache_entries:
+            self._cache.popitem(last=False)
+
+    def _discard_executor(self, executor):
+        """Stop a broken or stuck executor; the next job starts a new one."""
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+        # shutdown() leaves running jobs alone; a hung or dead worker has to be stopped
+        for process in list((getattr(executor, "_processes", None) or {}).values()):
+            if process.is_alive():
+                process.terminate()
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+_extractor_pool = None
+_extractor_pool_lock = threading.Lock()
+
+
+def get_extractor_pool():
+    """Get the shared extractor pool (processes start on the first job)."""
+    global _extractor_pool
+    with _extractor_pool_lock:
+        if _extractor_pool is None:
+            _extractor_pool = ExtractorPool()
+            atexit.register(_extractor_pool.shutdown)
+        return _extractor_pool
+
+
+_trailer_pool = None
+_trailer_pool_lock = threading.Lock()
+
+
+def get_trailer_pool():
+    """Get the thread pool trailer extractions wait on (each can take up to EXTRACTOR_TIMEOUT)."""
+    global _trailer_pool
+    with _trailer_pool_lock:
+        if _trailer_pool is None:
+            _trailer_pool = QThreadPool()
+            _trailer_pool.setMaxThreadCount(config.TRAILER_THREADS)
+        return _trailer_pool
+
+
+class ExtractionWorkerSignals(QObject):
+    finished = pyqtSignal(object)  # extraction result dict
+    error = pyqtSignal(str)  # error message
+
+
+class ExtractionWorker(QRunnable):
+    """Run an extraction from QThreadPool so the GUI thread never waits on the pool."""
+    def __init__(self, profile, video_id):
+        super().__init__()
+        self.profile = profile
+        self.video_id = video_id
+        self.signals = ExtractionWorkerSignals()
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def run(self):
+        if self._cancelled:
+            return
+        try:
+            result = get_extractor_pool().extract(self.profile, self.video_id)
+        except Exception as e:
+            if not self._cancelled:
+                self.signals.error.emit(str(e))
+            return
+        if not self._cancelled:
+            self.signals.finished.emit(result)
+
+
+def trailer_error_message(error_text):
+    """Short status text for a failed trailer extraction."""
+    if "Video unavailable" in error_text or "Private video" in error_text:
+        return "❌ Trailer not available on YouTube"
+    if "This video is not available" in error_text:
+        return "❌ TMDB trailer link is broken or private"
+    return "❌ Could not load trailer: Connection issue"
+
+
+def load_trailer(view, video_id, buttons, status_label):
+    """
+    Resolve a trailer's stream in the background and load it into view.media_player.
+
+    The buttons are enabled once it is ready. Nothing is loaded if another
+    detail view replaced view.media_player meanwhile.
+
+    Args:
+        view: Detail view owning media_player and vlc_instance
+        video_id: YouTube video id of the trailer
+        buttons: Player buttons to enable when the trailer is ready
+        status_label: QLabel showing the trailer's status
+
+    Returns:
+        The started ExtractionWorker
+    """
+    media_player = view.media_player
+
+    def on_trailer_resolved(result):
+        if view.media_player is not media_player:
+            return  # Another detail view replaced this player meanwhile
+        view.media_player.set_media(view.vlc_instance.media_new(result['url']))
+        for btn in buttons:
+            btn.setEnabled(True)
+        status_label.setText("Trailer ready - Click Play to watch")
+
+    def on_trailer_error(error_text):
+        print(f"yt-dlp extraction error: {error_text}")
+        if view.media_player is media_player:
+            status_label.setText(trailer_error_message(error_text))
+
+    worker = ExtractionWorker("trailer", video_id)
+    worker.signals.finished.connect(on_trailer_resolved)
+    worker.signals.error.connect(on_trailer_error)
+    get_trailer_pool().start(worker)
+    return worker
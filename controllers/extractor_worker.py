@@ -0,0 +1,68 @@
+"""
+Code that runs inside the yt-dlp extractor processes (see controllers/extractor_pool.py).
+
+Each process keeps one YoutubeDL instance per options profile for its whole
+life, so the player JS and signature caches stay warm between jobs. yt_dlp
+is only imported here, inside the worker processes; the UI process only
+pickles references to these functions. Only plain dicts go back over IPC.
+"""
+
+PROFILES = {
+    "audio": {
+        "format": "bestaudio/best",
+        "quiet": True,
+        "no_warnings": True,
+        "nocheckcertificate": True,
+    },
+    "trailer": {
+        "format": "best[height<=720]/best",
+        "quiet": True,
+        "no_warnings": True,
+    },
+}
+
+FORMAT_FIELDS = ("format_id", "url", "ext", "acodec", "vcodec", "abr", "tbr", "height",
+                 "filesize", "filesize_approx")
+
+_instances = {}
+
+
+def _get_ydl(profile):
+    ydl = _instances.get(profile)
+    if ydl is None:
+        import yt_dlp
+        ydl = yt_dlp.YoutubeDL(PROFILES[profile])
+        _instances[profile] = ydl
+    return ydl
+
+
+# Process initializer: build the extractors up front so the first job doesn't pay for it
+def init_worker():
+    for profile in PROFILES:
+        _get_ydl(profile)
+
+
+def extract(profile, url):
+    try:
+        info = _get_ydl(profile).extract_info(url, download=False)
+    except Exception as e:
+        # yt-dlp exceptions don't always survive pickling, send the message only
+        raise RuntimeError(str(e)) from None
+
+    if not info or not info.get("url"):
+        raise RuntimeError(f"No playable stream found for {url}")
+
+    return {
+        "id": info.get("id"),
+        "url": info["url"],
+        "format_id": info.get("format_id"),
+        "ext": info.get("ext"),
+        "http_headers": info.get("http_headers") or {},
+        "duration": info.get("duration"),
+        "abr": info.get("abr"),
+        "filesize": info.get("filesize") or info.get("filesize_approx"),
+        "formats": [
+            {field: fmt.get(field) for field in FORMAT_FIELDS}
+            for fmt in info.get("formats") or []
+        ],
+    }
@@ -1,14 +1,24 @@
 import os
-import requests
 from datetime import datetime
-from dotenv import load_dotenv
+from functools import lru_cache
 
-load_dotenv()
-API_KEY = os.getenv("RAWG_API_KEY")
 BASE_URL = "https://api.rawg.io/api"
 
+
+@lru_cache(maxsize=1)
+def rawg_api_key():
+    """RAWG key from the environment (.env is read the first time a game screen needs it)."""
+    from dotenv import load_dotenv
+    load_dotenv()
+    return os.getenv("RAWG_API_KEY")
+
+
+def _get(url, params):
+    from controllers.http_session import get_session
+    return get_session().get(url, params=params)
+
 # Fetch top games of the year
-def fetch_yearly_top_games(api_key=API_KEY, year=None, page_size=10):
+def fetch_yearly_top_games(api_key=None, year=None, page_size=10):
     if year is None:
         year = datetime.today().year
 
@@ -17,13 +27,13 @@ def fetch_yearly_top_games(api_key=API_KEY, year=None, page_size=10):
 
     url = f"{BASE_URL}/games"
     params = {
-        "key": api_key,
+        "key": api_key or rawg_api_key(),
         "dates": f"{start_date},{end_date}",
         "ordering": "-added",   # You can change to "-rating" or "-metacritic"
         "page_size": page_size
     }
 
-    response = requests.get(url, params=params)
+    response = _get(url, params)
 
     if response.status_code != 200:
         raise Exception(f"Error fetching data: {response.status_code}")
@@ -44,10 +54,10 @@ def fetch_yearly_top_games(api_key=API_KEY, year=None, page_size=10):
     return games
 
 # Function that fetch detailed info about a specific game.
-def fetch_game_info(api_key=API_KEY, game_id=None):
+def fetch_game_info(api_key=None, game_id=None):
     url = f"{BASE_URL}/games/{game_id}"
-    params = {"key": api_key}
-    response = requests.get(url, params=params)
+    params = {"key": api_key or rawg_api_key()}
+    response = _get(url, params)
 
     if response.status_code != 200:
         raise Exception(f"Error fetching game info: {response.status_code}")
@@ -66,10 +76,10 @@ def fetch_game_info(api_key=API_KEY, game_id=None):
     }
 
 # Function that search for games by title (20 items by default)
-def search_games(api_key=API_KEY, query=None, page_size=20):
+def search_games(api_key=None, query=None, page_size=20):
     url = f"{BASE_URL}/games"
-    params = {"key": api_key, "search": query, "page_size": page_size}
-    response = requests.get(url, params=params)
+    params = {"key": api_key or rawg_api_key(), "search": query, "page_size": page_size}
+    response = _get(url, params)
 
     if response.status_code != 200:
         raise Exception(f"Error searching games: {response.status_code}")
@@ -88,10 +98,10 @@ def search_games(api_key=API_KEY, query=None, page_size=20):
     return games
 
 # Function that fetch list of available genres.
-def fetch_genres(api_key=API_KEY):
+def fetch_genres(api_key=None):
     url = f"{BASE_URL}/genres"
-    params = {"key": api_key}
-    response = requests.get(url, params=params)
+    params = {"key": api_key or rawg_api_key()}
+    response = _get(url, params)
 
     if response.status_code != 200:
         raise Exception(f"Error fetching genres: {response.status_code}")
@@ -108,10 +118,10 @@ def fetch_genres(api_key=API_KEY):
     return genres
 
 # Function that fetch games from a specific genre.
-def fetch_games_by_genre(api_key=API_KEY, genre_slug=None, page_size=10, ordering="-added"):
+def fetch_games_by_genre(api_key=None, genre_slug=None, page_size=10, ordering="-added"):
     url = f"{BASE_URL}/games"
-    params = {"key": api_key, "genres": genre_slug, "page_size": page_size, "ordering": ordering}
-    response = requests.get(url, params=params)
+    params = {"key": api_key or rawg_api_key(), "genres": genre_slug, "page_size": page_size, "ordering": ordering}
+    response = _get(url, params)
 
     if response.status_code != 200:
         raise Exception(f"Error fetching games by genre: {response.status_code}")
@@ -130,7 +140,7 @@ def fetch_games_by_genre(api_key=API_KEY, genre_slug=None, page_size=10, orderin
     return games
 
 # Function that fetch games with sorting options
-def fetch_games_sorted(api_key=API_KEY, genre_slug=None, sort_by="recent", page_size=20):
+def fetch_games_sorted(api_key=None, genre_slug=None, sort_by="recent", page_size=20):
     """
     Fetch games with various sorting options.
     sort_by options: 'recent', 'rating', 'popular', 'views'
@@ -148,7 +158,7 @@ def fetch_games_sorted(api_key=API_KEY, genre_slug=None, sort_by="recent", page_
     ordering = ordering_map.get(sort_by, "-added")
     
     params = {
-        "key": api_key,
+        "key": api_key or rawg_api_key(),
         "page_size": page_size,
         "ordering": ordering
     }
@@ -156,7 +166,7 @@ def fetch_games_sorted(api_key=API_KEY, genre_slug=None, sort_by="recent", page_
     if genre_slug:
         params["genres"] = genre_slug
     
-    response = requests.get(url, params=params)
+    response = _get(url, params)
 
     if response.status_code != 200:
         raise Exception(f"Error fetching sorted games: {response.status_code}")
@@ -175,10 +185,10 @@ def fetch_games_sorted(api_key=API_KEY, genre_slug=None, sort_by="recent", page_
     return games
 
 # Fetch screenshots for a specific game
-def fetch_game_screenshots(api_key=API_KEY, game_id=None, page_size=10):
+def fetch_game_screenshots(api_key=None, game_id=None, page_size=10):
     url = f"{BASE_URL}/games/{game_id}/screenshots"
-    params = {"key": api_key, "page_size": page_size}
-    response = requests.get(url, params=params)
+    params = {"key": api_key or rawg_api_key(), "page_size": page_size}
+    response = _get(url, params)
 
     if response.status_code != 200:
         raise Exception(f"Error fetching screenshots: {response.status_code}")
@@ -197,7 +207,7 @@ def fetch_game_screenshots(api_key=API_KEY, game_id=None, page_size=10):
 # Example usage:
 if __name__ == "__main__":
 
-    top_games = fetch_yearly_top_games(api_key=API_KEY, year=2025)
+    top_games = fetch_yearly_top_games(year=2025)
     for idx, game in enumerate(top_games, start=1):
         print(f"{idx}. {game['name']} (Rating: {game['rating']})")
         print(f"   ID: {game['id']}")
@@ -205,7 +215,7 @@ if __name__ == "__main__":
         print(f"   Image: {game['background_image']}")
     
     
-    search_results = search_games(api_key=API_KEY, query="Elden Ring")
+    search_results = search_games(query="Elden Ring")
     for idx, game in enumerate(search_results, start=1):
         print(f"{idx}. {game['name']} (Rating: {game['rating']})")
         print(f"   Released: {game['released']}")
@@ -215,26 +225,26 @@ if __name__ == "__main__":
     for idx, game in enumerate(top_games, start=1):
         print(f"{idx}. {game['name']} (Rating: {game['rating']})")
 
-    info = fetch_game_info(API_KEY, game_id=3498)
+    info = fetch_game_info(rawg_api_key(), game_id=3498)
     print(info)
     
 
     # 2. Search for games
-    search_results = search_games(api_key=API_KEY, query="Elden Ring")
+    search_results = search_games(query="Elden Ring")
     for idx, game in enumerate(search_results, start=1):
         print(f"{idx}. {game['name']} (Released: {game['released']}, Rating: {game['rating']})")
     
     # 3. Get genre list
-    genres = fetch_genres(api_key=API_KEY)
+    genres = fetch_genres()
     for idx, genre in enumerate(genres, start=1):
         print(f"{idx}. {genre['name']} (Games Count: {genre['games_count']})")
     
     # 4. Get games from a specific genre
-    action_games = fetch_games_by_genre(api_key=API_KEY, genre_slug="action")
+    action_games = fetch_games_by_genre(genre_slug="action")
     for idx, game in enumerate(action_games, start=1):
         print(f"{idx}. {game['name']} (Rating: {game['rating']}) {game['background_image']}")
     
-    game_info = fetch_game_info(api_key=API_KEY, game_id=3498)  # Example: GTA V
+    game_info = fetch_game_info(game_id=3498)  # Example: GTA V
     print(f"Title: {game_info['name']}")
     print(f"Released: {game_info['released']}")
     print(f"Rating: {game_info['rating']}")
@@ -243,7 +253,7 @@ if __name__ == "__main__":
     print(f"Description: {game_info['description']}...")
     print(game_info['background_image'])
 
-    screenshots = fetch_game_screenshots(API_KEY, game_id=3498)
+    screenshots = fetch_game_screenshots(rawg_api_key(), game_id=3498)
     for idx, shot in enumerate(screenshots, start=1):
         print(f"{idx}. Screenshot URL: {shot['image']}")
     
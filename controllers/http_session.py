@@ -0,0 +1,36 @@
+"""
+Shared HTTP session for the API clients and image loaders.
+
+Every TMDB, RAWG, YouTube Music and image request goes through one
+requests.Session, so connections (and their TLS handshakes) are pooled per
+host and reused instead of being opened for each request. The startup
+warm-up (controllers/warmup.py) opens the first connection to each API host
+while the login screen is shown.
+"""
+import threading
+import config
+
+WARM_TIMEOUT = 5  # seconds
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """Get the shared requests.Session (requests is imported on first use)."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=config.HTTP_POOL_HOSTS, pool_maxsize=config.HTTP_POOL_SIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+
+def warm_connection(host):
+    """Open a kept-alive HTTPS connection to host (DNS, TCP and TLS) so the first real request skips it."""
+    get_session().head(f"https://{host}/", timeout=WARM_TIMEOUT, allow_redirects=False).close()
@@ -0,0 +1,133 @@
+"""
+Background scanning of the local music folder into the library index.
+
+Only files whose size or mtime changed since the last scan are opened;
+everything else is served from database/library_index.py. Files are read
+with the header-only probe (controllers/audio_probe.py), and large scans
+are split into batches parsed by a pool of processes, each batch written
+to the index in one transaction as it comes back.
+"""
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+from database.library_index import get_library_index
+from controllers.audio_probe import probe
+import config
+
+SCAN_BATCH_SIZE = 50
+SCAN_PROCESS_THRESHOLD = 100  # fewer changed files are parsed on the scan thread (no pool start-up)
+
+
+def read_track(song_path):
+    """Read the headers of one file (no audio decoding) into an index record."""
+    info = probe(song_path)
+    return {
+        "title": info["title"] or os.path.splitext(os.path.basename(song_path))[0],
+        "artist": info["artist"],
+        "album": info["album"],
+        "duration": info["duration"],
+        "bitrate": info["bitrate"],
+        "art": info["cover"],
+        "has_lyrics": info["has_lyrics"],
+    }
+
+
+# Runs in the scan processes: parse a batch of (file_name, size, mtime) into index records
+def read_batch(music_dir, batch):
+    records = []
+    for file_name, size, mtime in batch:
+        record = read_track(os.path.join(music_dir, file_name))
+        record.update(file_name=file_name, size=size, mtime=mtime)
+        records.append(record)
+    return records
+
+
+def _parsed_batches(music_dir, batches):
+    if sum(len(batch) for batch in batches) < SCAN_PROCESS_THRESHOLD:
+        for batch in batches:
+            yield read_batch(music_dir, batch)
+        return
+
+    # spawn: never fork a process that has Qt and VLC threads running
+    with ProcessPoolExecutor(max_workers=config.LIBRARY_SCAN_PROCESSES or os.cpu_count(),
+                             mp_context=multiprocessing.get_context("spawn")) as pool:
+        futures = [pool.submit(read_batch, music_dir, batch) for batch in batches]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+# Pair removed and added files with the same (size, mtime): a rename keeps both, so the
+# track can be moved in the index instead of being parsed again.
+def _detect_renames(added, removed):
+    removed_by_stat = {}
+    for name, stat in removed.items():
+        removed_by_stat.setdefault(stat, []).append(name)
+
+    renames = []
+    for name, stat in sorted(added.items()):
+        candidates = removed_by_stat.get(stat)
+        if candidates and len(candidates) == 1:
+            old_name = candidates.pop()
+            renames.append((old_name, name))
+            del removed[old_name]
+            del added[name]
+    return renames
+
+
+def scan_library(index=None, progress=None):
+    """
+    Bring the index up to date with the music folder.
+
+    Args:
+        index: LibraryIndex to update (the shared one by default)
+        progress: Optional callable(done, total) called after each batch is stored
+
+    Returns:
+        Dict of the changes applied: 'added', 'updated' and 'removed' file
+        names and 'renamed' (old, new) pairs
+    """
+    index = index or get_library_index()
+    added, modified, removed = index.diff()
+    renamed = _detect_renames(added, removed)
+    index.rename(renamed)
+    index.remove(list(removed))
+
+    changed = {**added, **modified}
+    items = [(name, size, mtime) for name, (size, mtime) in sorted(changed.items())]
+    batches = [items[i:i + SCAN_BATCH_SIZE] for i in range(0, len(items), SCAN_BATCH_SIZE)]
+
+    done = 0
+    for records in _parsed_batches(index.music_dir, batches):
+        index.upsert(records)
+        done += len(records)
+        if progress:
+            progress(done, len(items))
+
+    return {
+        "added": sorted(added),
+        "updated": sorted(modified),
+        "removed": sorted(removed),
+        "renamed": renamed,
+    }
+
+
+class LibraryScanSignals(QObject):
+    progress = pyqtSignal(int, int)  # files indexed, files to index
+    finished = pyqtSignal(object)  # changes applied (see scan_library)
+    error = pyqtSignal(str)
+
+
+class LibraryScanWorker(QRunnable):
+    def __init__(self):
+        super().__init__()
+        self.signals = LibraryScanSignals()
+
+    def run(self):
+        try:
+            summary = scan_library(progress=self.signals.progress.emit)
+        except Exception as e:
+            print(f"[Library] Scan failed: {e}")
+            self.signals.error.emit(str(e))
+            return
+        self.signals.finished.emit(summary)
@@ -0,0 +1,101 @@
+"""
+Live watching of the local music folder.
+
+QFileSystemWatcher reports changes from the OS (inotify on Linux,
+ReadDirectoryChangesW on Windows). When the folder can't be watched (e.g.
+it doesn't exist yet or the watch limit is reached) it is polled instead.
+Either way a burst of events is collapsed into one incremental scan
+(controllers/library_scanner.py), which only stats the folder and parses
+the files that were added or modified, and the applied changes are sent
+to the screens so they can update their lists without re-listing it.
+"""
+import os
+import threading
+from PyQt6.QtCore import QObject, QTimer, QThreadPool, QFileSystemWatcher, pyqtSignal
+from controllers.library_scanner import LibraryScanWorker
+import config
+
+SYNC_DELAY_MS = 500  # copying an album fires many events, scan once they settle
+POLL_INTERVAL_MS = 5000
+
+
+class LibraryWatcher(QObject):
+    progress = pyqtSignal(int, int)  # files indexed, files to index
+    changed = pyqtSignal(object)  # changes applied to the index (see scan_library)
+
+    def __init__(self, music_dir=config.LOCAL_MUSIC_PATH, parent=None):
+        super().__init__(parent)
+        self.music_dir = music_dir
+        self._scanning = False
+        self._rescan = False
+
+        # Own thread for the scans, which can wait long on the tag parsing processes;
+        # one is enough since scans never overlap
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+
+        self._sync_timer = QTimer(self)
+        self._sync_timer.setSingleShot(True)
+        self._sync_timer.setInterval(SYNC_DELAY_MS)
+        self._sync_timer.timeout.connect(self.sync)
+
+        self._poll_timer = QTimer(self)
+        self._poll_timer.setInterval(POLL_INTERVAL_MS)
+        self._poll_timer.timeout.connect(self._on_poll)
+
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(lambda _: self._sync_timer.start())
+        self._watch()
+
+    def _watch(self):
+        if os.path.isdir(self.music_dir) and self._watcher.addPath(self.music_dir):
+            self._poll_timer.stop()
+        else:
+            print(f"[Library] Can't watch {self.music_dir}, polling for changes")
+            self._poll_timer.start()
+
+    def _on_poll(self):
+        # The folder may have been created since: switch to OS events if it can be watched now
+        if not self._watcher.directories():
+            self._watch()
+        self.sync()
+
+    def sync(self):
+        """Apply changes in the music folder to the index in the background."""
+        if self._scanning:
+            self._rescan = True  # more events arrived mid-scan
+            return
+        self._scanning = True
+        self._rescan = False
+
+        worker = LibraryScanWorker()
+        worker.signals.progress.connect(self.progress)
+        worker.signals.finished.connect(self._on_scanned)
+        worker.signals.error.connect(lambda _: self._on_scanned(None))
+        self._pool.start(worker)
+
+    def _on_scanned(self, changes):
+        self._scanning = False
+        if changes and any(changes.values()):
+            self.changed.emit(changes)
+        if self._rescan:
+            self.sync()
+
+    def stop(self):
+        self._sync_timer.stop()
+        self._poll_timer.stop()
+        if self._watcher.directories():
+            self._watcher.removePaths(self._watcher.directories())
+
+
+_library_watcher = None
+_library_watcher_lock = threading.Lock()
+
+
+def get_library_watcher():
+    """Get the shared watcher (created on the GUI thread on first use)."""
+    global _library_watcher
+    with _library_watcher_lock:
+        if _library_watcher is None:
+            _library_watcher = LibraryWatcher()
+        return _library_watcher
@@ -0,0 +1,127 @@
+"""
+Compiled lyrics timelines.
+
+Lyrics are compiled once per song into parallel arrays of line start times
+and texts, so the player finds the current line with a binary search and
+knows when the next line starts; until then a playback tick has nothing to
+do. Enhanced LRC word timestamps (<mm:ss.xx>) are compiled the same way for
+karaoke highlighting. Parsed .lrc files are cached by (path, mtime).
+"""
+import os
+import re
+from bisect import bisect_right
+from functools import lru_cache
+
+# [mm:ss], [mm:ss.xx] or [mm:ss:xx] line timestamps, <mm:ss.xx> word timestamps
+LINE_TIME = re.compile(r"\[(\d+):(\d+(?:[.:]\d+)?)\]")
+WORD_TIME = re.compile(r"<(\d+):(\d+(?:[.:]\d+)?)>")
+OFFSET_TAG = re.compile(r"\[offset:\s*([+-]?\d+)\s*\]", re.IGNORECASE)
+
+
+def _to_ms(minutes, seconds):
+    return int((int(minutes) * 60 + float(seconds.replace(":", "."))) * 1000)
+
+
+class LyricsTimeline:
+    """Lines sorted by start time (ms), with optional per-line word timings."""
+    __slots__ = ("times", "lines", "words")
+
+    def __init__(self, entries=()):
+        # entries: (timestamp_ms, text) or (timestamp_ms, text, [(word_ms, word), ...])
+        entries = sorted(entries, key=lambda entry: entry[0])
+        self.times = [int(entry[0]) for entry in entries]
+        self.lines = [entry[1] for entry in entries]
+        # Per line: (word start times, word texts), or None without word timings
+        self.words = [
+            ([time for time, _ in entry[2]], [word for _, word in entry[2]])
+            if len(entry) > 2 and entry[2] else None
+            for entry in entries
+        ]
+
+    def __len__(self):
+        return len(self.times)
+
+    def __bool__(self):
+        return bool(self.times)
+
+    @property
+    def synced(self):
+        """False for plain lyrics shown as a single block (one line at 0)."""
+        return not (len(self.times) == 1 and self.times[0] == 0)
+
+    def line_at(self, position):
+        """
+        Current line for a playback position (ms).
+
+        Returns:
+            (index, next_change): the line index (the first line before it
+            starts) and when the following line starts, or None for the last line
+        """
+        index = max(bisect_right(self.times, position) - 1, 0)
+        next_change = self.times[index + 1] if index + 1 < len(self.times) else None
+        return index, next_change
+
+    def words_at(self, index, position):
+        """
+        Karaoke progress in a line with word timings.
+
+        Returns:
+            (sung, next_change): how many words have started and when the next
+            one does (None when the line has no word timings or all are sung)
+        """
+        words = self.words[index]
+        if not words:
+            return 0, None
+        times = words[0]
+        sung = bisect_right(times, position)
+        return sung, times[sung] if sung < len(times) else None
+
+
+def parse_lrc(text):
+    """Parse LRC / enhanced LRC text into timeline entries (repeated line timestamps and [offset:] supported)."""
+    offset_match = OFFSET_TAG.search(text)
+    offset = int(offset_match.group(1)) if offset_match else 0  # positive: lyrics appear sooner
+
+    entries = []
+    for raw_line in text.splitlines():
+        stamps = []
+        pos = 0
+        while (match := LINE_TIME.match(raw_line, pos)):
+            stamps.append(_to_ms(*match.groups()) - offset)
+            pos = match.end()
+        if not stamps:
+            continue
+
+        body = raw_line[pos:]
+        words = None
+        parts = WORD_TIME.split(body)
+        if len(parts) > 1:
+            # parts: [text before first tag, min, sec, word, min, sec, word, ...]
+            words = [(_to_ms(parts[i], parts[i + 1]) - offset, parts[i + 2])
+                     for i in range(1, len(parts) - 2, 3) if parts[i + 2].strip()]
+            body = "".join(parts[0:1] + parts[3::3])
+        line = " ".join(body.split())
+        if not line:
+            continue
+        for stamp in stamps:
+            entries.append((max(stamp, 0), line, words))
+    return entries
+
+
+@lru_cache(maxsize=64)
+def _load_lrc(lrc_path, mtime):
+    try:
+        with open(lrc_path, "r", encoding="utf-8-sig", errors="replace") as f:
+            return LyricsTimeline(parse_lrc(f.read()))
+    except OSError as e:
+        print(f"[Lyrics] Error reading external .lrc file: {e}")
+        return LyricsTimeline()
+
+
+def load_lrc(lrc_path):
+    """Compiled timeline of an .lrc file (empty if it can't be read), re-parsed only when the file changes."""
+    try:
+        mtime = os.stat(lrc_path).st_mtime
+    except OSError:
+        return LyricsTimeline()
+    return _load_lrc(lrc_path, mtime)
@@ -0,0 +1,167 @@
+"""
+Index of the external .lrc files in the lyrics folder.
+
+Songs are matched to lyric files by normalized keys (file name, title and
+"artist title" from the .lrc name or its [ti:]/[ar:] header tags) with a
+dict lookup, then by token overlap through an inverted token index, so
+naming differences (artist prefix, punctuation, case, "(Official Video)")
+still find the lyrics. Underscores separate words like spaces, so
+"queen_bohemian_rhapsody.lrc" is found for "Bohemian Rhapsody". The index
+is built once and brought up to date incrementally when the folder
+changes (its mtime moves on add/remove/rename).
+"""
+import os
+import re
+import threading
+import unicodedata
+import config
+
+LRC_EXTENSION = ".lrc"
+HEADER_BYTES = 2048  # [ti:]/[ar:] tags sit at the top of the file
+FUZZY_THRESHOLD = 0.6  # Dice coefficient between the token sets
+MAX_POSTINGS = 200  # tokens in more files than this (e.g. "the", "love") don't pick candidates
+
+NOISE = re.compile(r"[(\[{][^)\]}]*(official|video|audio|lyrics?|remaster(ed)?|hd|hq|mv)[^)\]}]*[)\]}]", re.IGNORECASE)
+FEATURING = re.compile(r"\b(feat|ft|featuring)\b.*$", re.IGNORECASE)
+HEADER_TAG = re.compile(r"\[(ti|ar):([^\]]*)\]", re.IGNORECASE)
+
+
+def normalize(text):
+    """Lower-case, accent-free, punctuation-free form used for keys."""
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).lower().replace("_", " ")
+    text = FEATURING.sub("", NOISE.sub(" ", text))
+    return " ".join(re.findall(r"[^\W_]+", text))
+
+
+def _read_header(path):
+    try:
+        with open(path, "r", encoding="utf-8-sig", errors="replace") as f:
+            head = f.read(HEADER_BYTES)
+    except OSError:
+        return {}
+    return {tag.lower(): value.strip() for tag, value in HEADER_TAG.findall(head)}
+
+
+class LyricsIndex:
+    def __init__(self, lyrics_dir=config.LYRICS_PATH):
+        self.lyrics_dir = lyrics_dir
+        self._lock = threading.Lock()
+        self._dir_mtime = None
+        self._files = {}  # file name -> (mtime, keys, tokens)
+        self._keys = {}  # normalized key -> file names
+        self._postings = {}  # token -> file names
+
+    def _refresh(self):
+        try:
+            dir_mtime = os.stat(self.lyrics_dir).st_mtime
+        except OSError:
+            dir_mtime = None
+        if dir_mtime == self._dir_mtime and dir_mtime is not None:
+            return
+        self._dir_mtime = dir_mtime
+
+        on_disk = {}
+        if dir_mtime is not None:
+            with os.scandir(self.lyrics_dir) as entries:
+                for entry in entries:
+                    if entry.is_file() and entry.name.lower().endswith(LRC_EXTENSION):
+                        on_disk[entry.name] = entry.stat().st_mtime
+
+        for name in [name for name in self._files if on_disk.get(name) != self._files[name][0]]:
+            self._remove(name)
+        for name, mtime in on_disk.items():
+            if name not in self._files:
+                self._add(name, mtime)
+
+    def _add(self, name, mtime):
+        stem = os.path.splitext(name)[0]
+        header = _read_header(os.path.join(self.lyrics_dir, name))
+        keys = {normalize(stem)}
+        if " - " in stem:
+            # "Artist - Title" file names
+            keys.add(normalize(stem.split(" - ", 1)[1]))
+        if header.get("ti"):
+            keys.add(normalize(header["ti"]))
+            if header.get("ar"):
+                keys.add(normalize(f"{header['ar']} {header['ti']}"))
+        keys.discard("")
+
+        tokens = set()
+        for key in keys:
+            tokens.update(key.split())
+
+        self._files[name] = (mtime, keys, tokens)
+        for key in keys:
+            self._keys.setdefault(key, set()).add(name)
+        for token in tokens:
+            self._postings.setdefault(token, set()).add(name)
+
+    def _remove(self, name):
+        _, keys, tokens = self._files.pop(name)
+        for key in keys:
+            self._keys[key].discard(name)
+            if not self._keys[key]:
+                del self._keys[key]
+        for token in tokens:
+            self._postings[token].discard(name)
+            if not self._postings[token]:
+                del self._postings[token]
+
+    def find(self, song_name, title=None, artist=None):
+        """
+        Find the .lrc file for a song.
+
+        Args:
+            song_name: Song file name (with or without extension)
+            title: Title tag, if known
+            artist: Artist tag, if known
+
+        Returns:
+            Path of the best matching .lrc file, or None
+        """
+        stem = os.path.splitext(os.path.basename(song_name))[0]
+        queries = [normalize(stem)]
+        if title:
+            queries += [normalize(f"{artist} {title}") if artist else "", normalize(title)]
+        queries = [query for query in queries if query]
+
+        with self._lock:
+            self._refresh()
+
+            # Exact keys first
+            for query in queries:
+                names = self._keys.get(query)
+                if names:
+                    return os.path.join(self.lyrics_dir, min(names))
+
+            # Token overlap with the files sharing a not-too-common token
+            best_name, best_score = None, FUZZY_THRESHOLD
+            for query in queries:
+                query_tokens = set(query.split())
+                candidates = set()
+                for token in query_tokens:
+                    names = self._postings.get(token, ())
+                    if len(names) <= MAX_POSTINGS:
+                        candidates.update(names)
+                for name in candidates:
+                    tokens = self._files[name][2]
+                    score = 2 * len(query_tokens & tokens) / (len(query_tokens) + len(tokens))
+                    if score > best_score or (score == best_score and best_name and name < best_name):
+                        best_name, best_score = name, score
+            return os.path.join(self.lyrics_dir, best_name) if best_name else None
+
+
+_lyrics_index = None
+_lyrics_index_lock = threading.Lock()
+
+
+def get_lyrics_index():
+    """Get the shared lyrics index (the folder is read on the first lookup)."""
+    global _lyrics_index
+    with _lyrics_index_lock:
+        if _lyrics_index is None:
+            _lyrics_index = LyricsIndex()
+        return _lyrics_index
@@ -2,7 +2,6 @@ import os
 from datetime import datetime
 from PyQt6.QtCore import QObject, pyqtSignal, QRunnable, QThreadPool, QMutex, QMutexLocker
 from functools import lru_cache
-import requests
 import time
 from collections import deque
 import config
@@ -50,20 +49,22 @@ _rate_limiter = RateLimiter(max_requests_per_second=config.TMDB_MAX_REQUESTS_PER
 def _cached_api_request(url: str, params_str: str):
     """Cached API request to avoid redundant calls with rate limiting."""
     import json
+    import requests
+    from controllers.http_session import get_session
     params = json.loads(params_str)
     
     # Apply rate limiting
     _rate_limiter.wait_if_needed()
     
     try:
-        response = requests.get(url, params=params, timeout=config.TMDB_REQUEST_TIMEOUT)
+        response = get_session().get(url, params=params, timeout=config.TMDB_REQUEST_TIMEOUT)
         if response.status_code == 200:
             return response.json()
         elif response.status_code == 429:  # Too Many Requests
             print("Rate limit hit, waiting 2 seconds...")
             time.sleep(2)
             # Retry once
-            response = requests.get(url, params=params, timeout=config.TMDB_REQUEST_TIMEOUT)
+            response = get_session().get(url, params=params, timeout=config.TMDB_REQUEST_TIMEOUT)
             if response.status_code == 200:
                 return response.json()
     except requests.exceptions.Timeout:
@@ -162,9 +163,6 @@ class ThreadPoolManager:
         """Get the managed thread pool instance."""
         return self.pool
 
-# Global thread pool manager
-_thread_pool_manager = ThreadPoolManager()
-
 
 # Generic TMDB API worker
 class TMDBWorker(QRunnable):
@@ -176,6 +174,7 @@ class TMDBWorker(QRunnable):
         self.signals = TMDBWorkerSignals()
         self._cancelled = False
         self.setAutoDelete(True)
+        ThreadPoolManager()  # limits the pool the first time TMDB is used
 
     def cancel(self):
         self._cancelled = True
@@ -1,32 +1,17 @@
-import os, config, eyed3, re
+import os, config
+from functools import lru_cache
 
-import requests
 from PyQt6.QtGui import QPixmap, QImage
-from eyed3.id3.frames import ImageFrame
+from controllers.lyrics_engine import LyricsTimeline, load_lrc
+from controllers.lyrics_index import get_lyrics_index
 
-def get_embedded_image(song_path, square=False):
+# Build a pixmap from cover bytes (falls back to the default art), optionally center-cropped to 1:1.
+def cover_pixmap(image_data, square=False):
     pixmap = None
-    try:
-        audiofile = eyed3.load(song_path)
-        if audiofile and audiofile.tag:
-            image_data = None
-            for image in audiofile.tag.images:
-                if image.picture_type == ImageFrame.FRONT_COVER:
-                    image_data = image.image_data
-                    break
-
-            if not image_data and audiofile.tag.images:
-                image_data = list(audiofile.tag.images)[0].image_data
-
-            if image_data:
-                pixmap = QPixmap()
-                if pixmap.loadFromData(image_data):
-                    print("Album art loaded from:", song_path)
-                else:
-                    pixmap = None
-
-    except Exception as e:
-        print("Error extracting album art:", e)
+    if image_data:
+        pixmap = QPixmap()
+        if not pixmap.loadFromData(image_data):
+            pixmap = None
 
     # Fallback if no album art found
     if not pixmap or pixmap.isNull():
@@ -44,90 +29,161 @@ def get_embedded_image(song_path, square=False):
 
     return pixmap
 
-def get_music_metadata(song_path):
-    artist = "Unknown Artist"
-    pixmap = get_embedded_image(song_path)
-
+# Cover bytes of a loaded eyed3 file: the front cover, else the first image.
+def cover_image_data(audiofile):
+    from eyed3.id3.frames import ImageFrame
+    if not audiofile or not audiofile.tag:
+        return None
+    for image in audiofile.tag.images:
+        if image.picture_type == ImageFrame.FRONT_COVER:
+            return image.image_data
+    if audiofile.tag.images:
+        return list(audiofile.tag.images)[0].image_data
+    return None
+
+# SYLT text encodings: (codec, string terminator)
+SYLT_ENCODINGS = {0: ("latin-1", b"\0"), 1: ("utf-16", b"\0\0"), 2: ("utf-16-be", b"\0\0"), 3: ("utf-8", b"\0")}
+
+def _find_terminator(data, start, terminator):
+    end = data.find(terminator, start)
+    # UTF-16 terminators must sit on a character boundary
+    while end != -1 and len(terminator) == 2 and (end - start) % 2:
+        end = data.find(terminator, end + 1)
+    return end
+
+# Parse a raw SYLT (synchronised lyrics) frame body into (timestamp_ms, text) pairs.
+def parse_sylt(data):
+    if not data or len(data) < 6 or data[0] not in SYLT_ENCODINGS:
+        return []
+    codec, terminator = SYLT_ENCODINGS[data[0]]
+    if data[4] != 2:  # Timestamps in MPEG frames instead of milliseconds aren't supported
+        return []
+
+    # Skip the content descriptor
+    pos = _find_terminator(data, 6, terminator)
+    if pos == -1:
+        return []
+    pos += len(terminator)
+
+    lines = []
+    while pos < len(data):
+        end = _find_terminator(data, pos, terminator)
+        if end == -1 or end + len(terminator) + 4 > len(data):
+            break
+        text = data[pos:end].decode(codec, errors="replace").strip()
+        pos = end + len(terminator)
+        timestamp = int.from_bytes(data[pos:pos + 4], "big")
+        pos += 4
+        if text:
+            lines.append((timestamp, text))
+    return sorted(lines, key=lambda x: x[0])
+
+def _tag_lyrics(tag):
+    # --- Step 1: Synchronised lyrics (SYLT) ---
+    lyrics_data = []
+    for frame in tag.frame_set.get(b"SYLT", []):
+        lyrics_data.extend(parse_sylt(getattr(frame, "data", None)))
+    if lyrics_data:
+        return sorted(lyrics_data, key=lambda x: x[0])
+
+    # --- Step 2: Standard embedded lyrics (USLT) ---
+    for lyric_tag in getattr(tag, "lyrics", None) or []:
+        if lyric_tag.text:
+            lyrics_data.append((0, lyric_tag.text.strip()))
+    if lyrics_data:
+        return lyrics_data
+
+    # --- Step 3: Try to find lyrics inside custom metadata text fields ---
+    possible_fields = [
+        getattr(tag, "comment", None),
+        getattr(tag, "description", None),
+        getattr(tag, "synopsis", None),
+    ]
+    text_blocks = []
+
+    for field in possible_fields:
+        if isinstance(field, str) and len(field.strip()) > 30:  # heuristic: long enough to be lyrics
+            text_blocks.append(field)
+        elif hasattr(field, "text") and field.text and len(field.text.strip()) > 30:
+            text_blocks.append(field.text)
+
+    # Combine and extract possible lyric lines
+    if text_blocks:
+        combined_text = "\n".join(text_blocks)
+        # Try to cut out only the part after 'LYRICS:' if exists
+        if "LYRICS:" in combined_text.upper():
+            combined_text = combined_text.split("LYRICS:", 1)[1]
+        lines = [line.strip() for line in combined_text.splitlines() if line.strip()]
+        lyrics_data = [(i * 5000, line) for i, line in enumerate(lines)]  # fake timestamps for scrolling
+    return lyrics_data
+
+@lru_cache(maxsize=32)
+def _read_track_tags(song_path, mtime):  # shared cache entries: callers get copies (read_track_tags)
+    record = {
+        "title": os.path.splitext(os.path.basename(song_path))[0],
+        "artist": None,
+        "album": None,
+        "duration": None,
+        "cover": None,
+        "lyrics": [],
+    }
     try:
+        import eyed3  # imported on first use; library scans read headers with the probe instead (audio_probe.py)
         audiofile = eyed3.load(song_path)
-        if audiofile and audiofile.tag and audiofile.tag.artist:
-            artist = audiofile.tag.artist
+        if not audiofile:
+            return record
+
+        if audiofile.info:
+            record["duration"] = audiofile.info.time_secs
+
+        tag = audiofile.tag
+        if tag:
+            record["title"] = tag.title or record["title"]
+            record["artist"] = tag.artist
+            record["album"] = tag.album
+            record["cover"] = cover_image_data(audiofile)
+            record["lyrics"] = _tag_lyrics(tag)
     except Exception as e:
-        print("Error extracting artist:", e)
-
-    return artist, pixmap
+        print(f"Error reading tags of {song_path}: {e}")
 
-def get_lyrics(song_path):
-    lyrics_data = []
+    return record
 
+# Parse a file's tags once: title, artist, album, duration (seconds), cover bytes and embedded
+# lyrics as (timestamp_ms, text) pairs. Memoized by (path, mtime), so an edited file is re-read;
+# each call gets its own copy, so changing it doesn't change the cache.
+def read_track_tags(song_path):
     try:
-        audiofile = eyed3.load(song_path)
-        tag = getattr(audiofile, "tag", None)
-
-        # --- Step 1: Try standard embedded lyrics (USLT) ---
-        if tag and getattr(tag, "lyrics", None):
-            for lyric_tag in tag.lyrics:
-                if hasattr(lyric_tag, "sync") and lyric_tag.sync:
-                    for (timestamp, text) in lyric_tag.sync:
-                        lyrics_data.append((timestamp, text.strip()))
-                elif lyric_tag.text:
-                    lyrics_data.append((0, lyric_tag.text.strip()))
-            if lyrics_data:
-                return sorted(lyrics_data, key=lambda x: x[0])
-
-        # --- Step 2: Try to find lyrics inside custom metadata text fields ---
-        possible_fields = [
-            getattr(tag, "comment", None),
-            getattr(tag, "description", None),
-            getattr(tag, "synopsis", None),
-        ]
-        text_blocks = []
-
-        for field in possible_fields:
-            if isinstance(field, str) and len(field.strip()) > 30:  # heuristic: long enough to be lyrics
-                text_blocks.append(field)
-            elif hasattr(field, "text") and field.text and len(field.text.strip()) > 30:
-                text_blocks.append(field.text)
-
-        # Combine and extract possible lyric lines
-        if text_blocks:
-            combined_text = "\n".join(text_blocks)
-            # Try to cut out only the part after 'LYRICS:' if exists
-            if "LYRICS:" in combined_text.upper():
-                combined_text = combined_text.split("LYRICS:", 1)[1]
-            lines = [line.strip() for line in combined_text.splitlines() if line.strip()]
-            lyrics_data = [(i * 5000, line) for i, line in enumerate(lines)]  # fake timestamps for scrolling
-            if lyrics_data:
-                return lyrics_data
+        mtime = os.stat(song_path).st_mtime
+    except OSError:
+        mtime = None
+    record = _read_track_tags(song_path, mtime)
+    return dict(record, lyrics=list(record["lyrics"]))
 
-    except Exception as e:
-        print(f"[Lyrics] Error extracting embedded/custom lyrics: {e}")
+def get_embedded_image(song_path, square=False):
+    return cover_pixmap(read_track_tags(song_path)["cover"], square)
 
-    # Fallback to external .lrc file
-    try:
-        song_name = os.path.splitext(os.path.basename(song_path))[0]
-        lrc_path = os.path.join(config.LYRICS_PATH, f"{song_name}.lrc")
-
-        if os.path.exists(lrc_path):
-            with open(lrc_path, "r", encoding="utf-8") as f:
-                for line in f:
-                    matches = re.findall(r"\[(\d+):(\d+(?:\.\d+)?)\](.*)", line)
-                    for match in matches:
-                        minutes = int(match[0])
-                        seconds = float(match[1])
-                        timestamp_ms = int((minutes * 60 + seconds) * 1000)
-                        lyric_text = match[2].strip()
-                        if lyric_text:
-                            lyrics_data.append((timestamp_ms, lyric_text))
-    except Exception as e:
-        print(f"[Lyrics] Error reading external .lrc file: {e}")
+def get_music_metadata(song_path):
+    tags = read_track_tags(song_path)
+    return tags["artist"] or "Unknown Artist", cover_pixmap(tags["cover"])
+
+def get_lyrics(song_path):
+    # Embedded lyrics first, then the external .lrc file
+    tags = read_track_tags(song_path)
+    if tags["lyrics"]:
+        return LyricsTimeline(tags["lyrics"])
+    return read_lrc_lyrics(song_path, tags["title"], tags["artist"])
 
-    return sorted(lyrics_data, key=lambda x: x[0])
+# Lyrics from the .lrc file in lyrics/ matching the song (by file name, or title/artist tags when
+# given) as a compiled LyricsTimeline, empty if there is none.
+def read_lrc_lyrics(song_path, title=None, artist=None):
+    lrc_path = get_lyrics_index().find(song_path, title, artist)
+    return load_lrc(lrc_path) if lrc_path else LyricsTimeline()
 
 
 def display_thumbnail(url):
+    from controllers.http_session import get_session
     try:
-        resp = requests.get(url)
+        resp = get_session().get(url)
         resp.raise_for_status()
         image = QImage()
         image.loadFromData(resp.content)
@@ -0,0 +1,110 @@
+"""
+Multi-facet music search.
+
+A query is searched with the songs, artists, albums and playlists filters
+at the same time, one worker per facet, and every facet is reported as
+soon as it lands. A facet that takes longer than its timeout is reported
+as timed out so its section never waits on the network; its late result
+still ends up in the shared search cache for the next query.
+
+Searches run on their own small pool, so downloads, library scans and
+image loads on the global pool never keep them waiting, and the timeout
+only counts from when a facet's request actually starts.
+"""
+import threading
+from PyQt6.QtCore import QObject, QTimer, QThreadPool, pyqtSignal
+import controllers.api_client as ytapi
+from controllers.async_loader import TaskWorker
+import config
+
+FACET_TIMEOUT_MS = 8000
+
+_search_pool = None
+_search_pool_lock = threading.Lock()
+
+
+def get_search_pool():
+    """Get the thread pool network searches run on."""
+    global _search_pool
+    with _search_pool_lock:
+        if _search_pool is None:
+            _search_pool = QThreadPool()
+            _search_pool.setMaxThreadCount(config.SEARCH_THREADS)
+        return _search_pool
+
+
+class MusicSearch(QObject):
+    facet_ready = pyqtSignal(str, object)  # facet, results
+    facet_failed = pyqtSignal(str, str)  # facet, error message
+
+    def __init__(self, facets=ytapi.SEARCH_FACETS, timeout_ms=FACET_TIMEOUT_MS, parent=None):
+        super().__init__(parent)
+        self.facets = facets
+        self.timeout_ms = timeout_ms
+        self.query = None
+        self._generation = 0
+        self._workers = {}  # facet -> TaskWorker
+        self._timers = {}  # facet -> timeout QTimer
+
+    def peek(self, query):
+        """Cached (or prefix-filtered) results per facet, without any network call."""
+        cached = {}
+        for facet in self.facets:
+            items = ytapi.peek_search(query, facet)
+            if items is not None:
+                cached[facet] = items
+        return cached
+
+    def search(self, query):
+        self.cancel()
+        self.query = query
+        generation = self._generation
+
+        for facet in self.facets:
+            worker = TaskWorker(ytapi.search_music, query, facet)
+            worker.signals.finished.connect(lambda items, f=facet: self._on_finished(generation, f, items))
+            worker.signals.error.connect(lambda message, f=facet: self._on_failed(generation, f, message))
+            self._workers[facet] = worker
+
+            # Counted from when the request starts, not while it waits for a thread
+            timer = QTimer(self)
+            timer.setSingleShot(True)
+            timer.setInterval(self.timeout_ms)
+            timer.timeout.connect(lambda f=facet: self._on_failed(generation, f, "Timed out"))
+            worker.signals.started.connect(lambda f=facet: self._on_started(generation, f))
+            self._timers[facet] = timer
+
+            get_search_pool().start(worker)
+
+    def cancel(self):
+        """Drop every pending facet of the current query."""
+        self._generation += 1
+        for worker in self._workers.values():
+            worker.cancel()
+        for timer in self._timers.values():
+            timer.stop()
+            timer.deleteLater()
+        self._workers.clear()
+        self._timers.clear()
+
+    def _on_started(self, generation, facet):
+        if generation == self._generation and facet in self._timers:
+            self._timers[facet].start()
+
+    def _finish_facet(self, generation, facet):
+        # True only the first time a facet of the current query settles
+        if generation != self._generation or facet not in self._workers:
+            return False
+        del self._workers[facet]
+        timer = self._timers.pop(facet)
+        timer.stop()
+        timer.deleteLater()
+        return True
+
+    def _on_finished(self, generation, facet, items):
+        if self._finish_facet(generation, facet):
+            self.facet_ready.emit(facet, items)
+
+    def _on_failed(self, generation, facet, message):
+        if self._finish_facet(generation, facet):
+            self.facet_failed.emit(facet, message)
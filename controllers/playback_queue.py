@@ -0,0 +1,131 @@
+"""
+Playback queue shared by the music players.
+
+Holds the tracks of the list the song was started from (playlist, album,
+artist top songs, genre or the local library) and decides what plays next
+for each repeat mode. The shuffle order is computed once when shuffle is
+turned on, so picking the next song never has to re-read the source list.
+"""
+import random
+
+# Repeat modes, same values the players cycle through with the loop_shuffle button
+CONTINUE = 0
+LOOP = 1
+SHUFFLE = 2
+
+
+class PlaybackQueue:
+    def __init__(self, tracks, start_index=0, repeat=CONTINUE):
+        self.tracks = list(tracks)
+        self.order = list(range(len(self.tracks)))
+        self.position = min(max(start_index, 0), max(len(self.tracks) - 1, 0))
+        self.repeat = CONTINUE
+        self.set_repeat(repeat)
+
+    def __len__(self):
+        return len(self.tracks)
+
+    def current_index(self):
+        """Index of the current track in self.tracks (not the play order)."""
+        if not self.tracks:
+            return -1
+        return self.order[self.position]
+
+    def current(self):
+        if not self.tracks:
+            return None
+        return self.tracks[self.current_index()]
+
+    def set_repeat(self, mode):
+        current = self.current_index()
+        self.repeat = mode
+
+        if mode == SHUFFLE and self.tracks:
+            # Current song stays first, the rest are shuffled once
+            rest = [i for i in range(len(self.tracks)) if i != current]
+            random.shuffle(rest)
+            self.order = [current] + rest
+            self.position = 0
+        else:
+            self.order = list(range(len(self.tracks)))
+            self.position = max(current, 0)
+
+    def jump_to(self, track_index):
+        """Make tracks[track_index] the current track and return it."""
+        if not 0 <= track_index < len(self.tracks):
+            return None
+        self.position = self.order.index(track_index)
+        return self.current()
+
+    def insert(self, track_index, track):
+        """Add a track at track_index (e.g. a file added to the library) without changing the current one."""
+        track_index = min(max(track_index, 0), len(self.tracks))
+        current = self.current_index()
+        self.tracks.insert(track_index, track)
+        self.order = [i + 1 if i >= track_index else i for i in self.order]
+
+        if self.repeat == SHUFFLE:
+            # Somewhere in the part of the shuffle order that hasn't played yet (first if it's empty)
+            self.order.insert(random.randint(min(self.position + 1, len(self.order)), len(self.order)), track_index)
+        else:
+            self.order.insert(track_index, track_index)
+            if 0 <= track_index <= current:
+                self.position += 1
+
+    def remove(self, track_index):
+        """Drop tracks[track_index]; if it was the current track, the one after it plays next."""
+        if not 0 <= track_index < len(self.tracks):
+            return
+        removed_at = self.order.index(track_index)
+        del self.tracks[track_index]
+        del self.order[removed_at]
+        self.order = [i - 1 if i > track_index else i for i in self.order]
+
+        if removed_at <= self.position:
+            self.position -= 1
+        if self.position < 0:
+            self.position = max(len(self.order) - 1, 0)  # wraps to the first track on next_track
+
+    def move(self, track_index, new_index):
+        """Move tracks[track_index] to new_index (an index among the other tracks), keeping the current track (and the shuffle order)."""
+        if not 0 <= track_index < len(self.tracks):
+            return
+        indices = list(range(len(self.tracks)))
+        del indices[track_index]
+        new_index = min(max(new_index, 0), len(indices))
+        indices.insert(new_index, track_index)
+
+        self.tracks = [self.tracks[i] for i in indices]
+        new_position = {old: new for new, old in enumerate(indices)}
+        if self.repeat == SHUFFLE:
+            self.order = [new_position[i] for i in self.order]
+        else:
+            # Plays in list order, from the current track's new place
+            current = new_position[self.order[self.position]]
+            self.order = list(range(len(self.tracks)))
+            self.position = current
+
+    def next_track(self):
+        """Advance for an ended song: LOOP repeats it, the other modes move on (wrapping)."""
+        if not self.tracks:
+            return None
+        if self.repeat != LOOP:
+            self.position = (self.position + 1) % len(self.order)
+        return self.current()
+
+    def skip(self, step=1):
+        """Move forward/backward in the play order regardless of repeat mode."""
+        if not self.tracks:
+            return None
+        self.position = (self.position + step) % len(self.order)
+        return self.current()
+
+    def upcoming(self, count):
+        """Next `count` tracks in play order after the current one (for prefetching)."""
+        if len(self.tracks) < 2 or self.repeat == LOOP:
+            return []
+        count = min(count, len(self.order) - 1)
+        return [
+            self.tracks[self.order[(self.position + offset) % len(self.order)]]
+            for offset in range(1, count + 1)
+        ]
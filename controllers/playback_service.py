@@ -0,0 +1,491 @@
+"""
+Playback service shared by every player view.
+
+One VLC player, one queue and the now-playing state live here for the whole
+session. The full players (screens/music_player.py for the local library,
+screens/apionly_music_player.py for streamed songs) and the MiniPlayerBar
+are views: they call the service and redraw from its signals. Opening
+another song or closing a player window never stops or rebuilds the player,
+so music keeps playing while the user browses the rest of the app.
+
+Position, duration and end of media come from libVLC events. They arrive
+on libVLC's own thread and are handed to the GUI thread through queued
+signals; a burst of time events wakes the GUI thread once, and a paused
+player sends none, so nothing runs between events.
+"""
+import os
+import bisect
+import threading
+import vlc
+from PyQt6.QtCore import QObject, QThreadPool, QByteArray, pyqtSignal
+from PyQt6.QtGui import QPixmap
+from controllers.async_loader import ImageLoader
+from controllers.audio_pipeline import StreamResolver, AudioDownloader, vlc_media_options, get_prefetcher, get_audio_pool
+from controllers.audio_cache import get_audio_cache
+from controllers.library_watcher import get_library_watcher
+from controllers.music_metadata import get_music_metadata
+from controllers.playback_queue import PlaybackQueue, CONTINUE, LOOP
+from controllers.thumbnail_store import get_thumbnail_store, SPINNER_SIZE
+from database.library_index import get_library_index
+import config
+
+# Where the current track comes from
+LOCAL = "local"
+API = "api"
+
+
+class PlaybackService(QObject):
+    track_changed = pyqtSignal(object)  # now-playing dict (see _load_local / _load_api)
+    art_changed = pyqtSignal(object)  # cover of the current track as a QPixmap, None for the default art
+    position_changed = pyqtSignal(int)  # ms
+    duration_changed = pyqtSignal(int)  # ms
+    state_changed = pyqtSignal(bool)  # playing
+    status_changed = pyqtSignal(str)  # loading messages of streamed songs
+    load_failed = pyqtSignal(str)
+    repeat_changed = pyqtSignal(int)
+    queue_changed = pyqtSignal()  # a new queue was started
+    stopped = pyqtSignal()
+    # Emitted on libVLC's event thread, delivered on the GUI thread (with the media generation they belong to)
+    _time_event = pyqtSignal(int)
+    _length_event = pyqtSignal(int, int)  # generation, ms
+    _end_event = pyqtSignal(int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.instance = get_vlc_instance()
+        self.player = self.instance.media_player_new()
+        self.volume = config.DEFAULT_VOLUME
+        self.player.audio_set_volume(self.volume)
+
+        # Bumped whenever the media is replaced, so late events of the previous one are dropped
+        self._generation = 0
+        self._vlc_time = 0
+        self._time_pending = False
+        self._time_event.connect(self._on_time_event)
+        self._length_event.connect(self._on_length_event)
+        self._end_event.connect(self._on_end_event)
+
+        events = self.player.event_manager()
+        events.event_attach(vlc.EventType.MediaPlayerTimeChanged, self._vlc_time_changed)
+        events.event_attach(vlc.EventType.MediaPlayerLengthChanged, self._vlc_length_changed)
+        events.event_attach(vlc.EventType.MediaPlayerEndReached, self._vlc_end_reached)
+
+        self.library = get_library_index()
+        self.source = None
+        self.queue = PlaybackQueue([])
+        self.api_playlist = None  # list a streamed song was opened from, if any
+        self.repeat = CONTINUE
+        self.now_playing = None
+        self.art = None
+        self.is_playing = False
+        self.position = 0
+        self.duration = 0
+
+        # Streamed song state and its background workers
+        self.stream = None
+        self.cached_path = None
+        self.resolver = None
+        self.downloader = None
+        self.thumbnail_loader = None
+
+        # Files added/removed/renamed while the library is queued go straight into the queue
+        get_library_watcher().changed.connect(self._on_library_changed)
+
+    # === Starting playback ===
+    def play_local(self, file_name, tracks):
+        """Play a local file, queued with the rest of the library (file names sorted like the library list)."""
+        if self.source == LOCAL and file_name in self.queue.tracks:
+            # Same library queue: keep the shuffle order
+            self.queue.jump_to(self.queue.tracks.index(file_name))
+            self._load()
+            return
+
+        tracks = list(tracks)
+        start_index = bisect.bisect_left(tracks, file_name)
+        if start_index == len(tracks) or tracks[start_index] != file_name:
+            tracks.insert(start_index, file_name)  # Not indexed yet
+        self.api_playlist = None
+        self._start(LOCAL, PlaybackQueue(tracks, start_index))
+
+    def play_api(self, song, playlist=None):
+        """Play a streamed song, queued with the list it was opened from (just the song itself if none)."""
+        video_id = song.get("videoId")
+        if self.source == API and playlist and playlist == self.api_playlist:
+            index = next((i for i, s in enumerate(self.queue.tracks) if s.get("videoId") == video_id), None)
+            if index is not None:
+                self.jump_to(index)
+                return
+
+        tracks = list(playlist) if playlist else [song]
+        start_index = next((i for i, s in enumerate(tracks) if s.get("videoId") == video_id), None)
+        if start_index is None:
+            tracks.insert(0, song)
+            start_index = 0
+        self.api_playlist = playlist
+        self._start(API, PlaybackQueue(tracks, start_index))
+
+    def _start(self, source, queue):
+        self.source = source
+        self.queue = queue
+        self.repeat = queue.repeat
+        self.queue_changed.emit()
+        self.repeat_changed.emit(self.repeat)
+        self._load()
+
+    def jump_to(self, track_index):
+        """Play the queued track at track_index."""
+        if self.queue.jump_to(track_index) is not None:
+            self._load()
+
+    def skip(self, step=1):
+        """Play the next (1) or previous (-1) track in the play order."""
+        if self.now_playing is not None and self.queue.skip(step) is not None:
+            self._load()
+
+    def _load(self):
+        if self.queue.current() is None:
+            self.stop()  # e.g. the library watcher removed every queued file
+            return
+        self._cancel_workers()
+        self._stop_media()
+        self.stream = None
+        self.cached_path = None
+        self.position = 0
+        self.duration = 0
+        self.art = None
+
+        if self.source == LOCAL:
+            self._load_local(self.queue.current())
+        else:
+            self._load_api(self.queue.current())
+
+    # === Local files ===
+    def _load_local(self, file_name):
+        song_path = os.path.join(config.LOCAL_MUSIC_PATH, file_name)
+
+        # Metadata from the index, reading the file only if it isn't indexed yet
+        track = self.library.track(file_name)
+        if track:
+            artist = track['artist'] or "Unknown Artist"
+            # Pre-scaled spinner-size cover shared by the album's tracks
+            self.art = get_thumbnail_store().pixmap(track['art_hash'], SPINNER_SIZE)
+            # The indexed duration is shown before VLC has parsed the file
+            self.duration = int(track['duration'] * 1000) if track['duration'] else 0
+        else:
+            artist, self.art = get_music_metadata(song_path)
+
+        self.now_playing = {
+            "source": LOCAL,
+            "file_name": file_name,
+            "path": song_path,
+            "title": os.path.splitext(file_name)[0],
+            "artist": artist or "Unknown Artist",
+            "track": track,
+        }
+        self._announce()
+
+        if not os.path.exists(song_path):
+            print("Song file not found:", song_path)
+            self.load_failed.emit(f"Song file not found: {file_name}")
+            return
+        try:
+            self.player.set_media(self.instance.media_new(song_path))
+        except Exception as e:
+            print("Warning: Failed to load media:", e)
+            return
+        self.play()
+
+    # === Streamed songs ===
+    # Show song info right away, then play from the cache or resolve the stream on a worker
+    def _load_api(self, song):
+        title = song.get("title", "Unknown Title")
+        self.now_playing = {
+            "source": API,
+            "song": song,
+            "title": title,
+            "artist": song.get("artist", "Unknown Artist"),
+        }
+        self._announce()
+
+        thumbnail_url = song.get("thumbnails")
+        if thumbnail_url:
+            self._load_thumbnail(thumbnail_url)
+
+        video_id = song.get("videoId")
+        if not video_id:
+            print("No videoId for song")
+            self.status_changed.emit("No audio available for: " + title)
+            return
+
+        cached = get_audio_cache().lookup(video_id)
+        if cached:
+            self._play_cached(cached)
+            return
+
+        # Already resolved by the prefetcher, no extraction needed
+        stream = get_prefetcher().stream_for(video_id)
+        if stream:
+            self._on_stream_resolved(stream)
+            return
+
+        self.status_changed.emit("Loading: " + title)
+
+        self.resolver = StreamResolver(video_id)
+        self.resolver.signals.progress.connect(self.status_changed)
+        self.resolver.signals.resolved.connect(self._on_stream_resolved)
+        self.resolver.signals.error.connect(self._on_stream_error)
+        get_audio_pool().start(self.resolver)
+
+    def _current_video_id(self):
+        if self.now_playing is None or self.source != API:
+            return None
+        return self.now_playing["song"].get("videoId")
+
+    # Start progressive playback from the stream URL, then cache it in the background
+    def _on_stream_resolved(self, stream):
+        if stream.get("videoId") != self._current_video_id():
+            return  # Superseded by another song
+
+        self.resolver = None
+        self.stream = stream
+        self.player.set_media(self.instance.media_new(stream["url"], *vlc_media_options(stream)))
+        self._set_duration(stream.get("duration"))
+
+        self.status_changed.emit("Now Playing: " + self.now_playing["title"])
+        self.play()
+
+        self.downloader = AudioDownloader(stream)
+        self.downloader.signals.finished.connect(self._on_download_finished)
+        self.downloader.signals.error.connect(self._on_download_error)
+        get_audio_pool().start(self.downloader)
+
+        self._prefetch_upcoming()
+
+    def _on_download_error(self, message):
+        print(f"Error downloading audio: {message}")  # playback goes on from the stream
+
+    def _on_stream_error(self, message):
+        self.resolver = None
+        print("Error resolving audio:", message)
+        self.status_changed.emit("Could not load: " + self.now_playing["title"])
+        self.load_failed.emit("Audio unavailable, please try again.")
+
+    # Cached songs play straight from disk, no network needed
+    def _play_cached(self, entry):
+        self.cached_path = entry["path"]
+        self.stream = entry
+        self.player.set_media(self.instance.media_new(self.cached_path))
+        self._set_duration(entry.get("duration"))
+
+        self.status_changed.emit("Now Playing: " + self.now_playing["title"])
+        self.play()
+        self._prefetch_upcoming()
+
+    # Resolve and cache the next few queued songs so switching to them has no network wait
+    def _prefetch_upcoming(self):
+        if self.source == API:
+            get_prefetcher().prefetch(self.queue.upcoming(config.PREFETCH_AHEAD))
+
+    # Cached copy is used for replays instead of the stream URL
+    def _on_download_finished(self, path):
+        self.downloader = None
+        if self.stream and self.stream.get("videoId") == self._current_video_id():
+            self.cached_path = path
+
+    def _load_thumbnail(self, url):
+        self.thumbnail_loader = ImageLoader(url)
+
+        def on_finished(img_url, data: QByteArray):
+            self.thumbnail_loader = None
+            if self.source != API or img_url != self.now_playing["song"].get("thumbnails") or data.isEmpty():
+                return
+            pixmap = QPixmap()
+            if pixmap.loadFromData(data):
+                self.art = pixmap
+                self.art_changed.emit(pixmap)
+
+        self.thumbnail_loader.signals.finished.connect(on_finished)
+        QThreadPool.globalInstance().start(self.thumbnail_loader)
+
+    # Stop pending resolve/thumbnail work for the current song.
+    # A running download is left alone so the song still ends up in the cache.
+    def _cancel_workers(self):
+        for worker in (self.resolver, self.thumbnail_loader):
+            if worker:
+                worker.cancel()
+        self.resolver = None
+        self.downloader = None
+        self.thumbnail_loader = None
+
+    # === Controls ===
+    def play(self):
+        if self.now_playing is None or not self.player.get_media():
+            return
+        self.player.play()
+        self.is_playing = True
+        self.state_changed.emit(True)
+
+    def pause(self):
+        self.player.set_pause(1)
+        self.is_playing = False
+        self.state_changed.emit(False)
+
+    def toggle(self):
+        if self.is_playing:
+            self.pause()
+        else:
+            self.play()
+
+    def seek(self, position):
+        """Jump to position (ms) in the current track."""
+        if self.player.get_length() > 0:
+            self.player.set_time(position)
+            self.position = position
+            self.position_changed.emit(position)
+
+    def seek_by(self, offset):
+        """Move forward/backward by offset ms, within the track."""
+        duration = self.player.get_length()
+        if duration > 0:
+            self.seek(min(max(self.player.get_time() + offset, 0), duration))
+
+    def set_volume(self, value):
+        self.volume = value
+        self.player.audio_set_volume(value)
+
+    def cycle_repeat(self):
+        """Continue -> loop -> shuffle."""
+        self.repeat = (self.repeat + 1) % 3
+        self.queue.set_repeat(self.repeat)
+        self._prefetch_upcoming()
+        self.repeat_changed.emit(self.repeat)
+
+    def stop(self):
+        """Stop playback and forget the current track (e.g. on logout)."""
+        self._cancel_workers()
+        self._stop_media()
+        self.is_playing = False
+        self.now_playing = None
+        self.source = None
+        self.queue = PlaybackQueue([])
+        self.state_changed.emit(False)
+        self.stopped.emit()
+
+    # === State updates ===
+    def _announce(self):
+        self.track_changed.emit(self.now_playing)
+        self.art_changed.emit(self.art)
+        self.duration_changed.emit(self.duration)
+        self.position_changed.emit(0)
+
+    def _set_duration(self, seconds):
+        if seconds:
+            self.duration = int(seconds * 1000)
+            self.duration_changed.emit(self.duration)
+
+    def _stop_media(self):
+        # stop() is synchronous: no event of the old media is emitted after it returns
+        self.player.stop()
+        self._generation += 1
+
+    # === libVLC events (called on libVLC's thread: only hand them over to the GUI thread) ===
+    def _vlc_time_changed(self, event):
+        # Keep the latest time and wake the GUI thread once for a burst of events
+        self._vlc_time = event.u.new_time
+        if not self._time_pending:
+            self._time_pending = True
+            self._time_event.emit(self._generation)
+
+    def _vlc_length_changed(self, event):
+        self._length_event.emit(self._generation, event.u.new_length)
+
+    def _vlc_end_reached(self, event):
+        self._end_event.emit(self._generation)
+
+    def _on_time_event(self, generation):
+        self._time_pending = False
+        position = self._vlc_time
+        if generation == self._generation and position >= 0 and position != self.position:
+            self.position = position
+            self.position_changed.emit(position)
+
+    def _on_length_event(self, generation, duration):
+        if generation == self._generation and duration > 0 and duration != self.duration:
+            self.duration = duration
+            self.duration_changed.emit(duration)
+
+    # What plays after a song ends (3 modes, handled by the queue)
+    def _on_end_event(self, generation):
+        if generation != self._generation or self.now_playing is None:
+            return
+        if self.repeat == LOOP:
+            print("Looping current song...")
+            self._replay()
+        elif self.source == API and len(self.queue) < 2:
+            # Nothing queued after a single streamed song
+            self.stop()
+        else:
+            self.queue.next_track()
+            if self.queue.current() is None:
+                self.stop()  # every queued file was removed meanwhile
+            else:
+                self._load()
+
+    # Replay from the cached copy when available, otherwise from the stream (or the local file)
+    def _replay(self):
+        if self.source == LOCAL:
+            media = self.instance.media_new(self.now_playing["path"])
+        elif self.cached_path:
+            media = self.instance.media_new(self.cached_path)
+        elif self.stream:
+            media = self.instance.media_new(self.stream["url"], *vlc_media_options(self.stream))
+        else:
+            return
+        self.player.set_media(media)
+        self.play()
+
+    # Apply library changes to a local queue in place (keeps the current song and shuffle order)
+    def _on_library_changed(self, changes):
+        if self.source != LOCAL:
+            return
+        for old_name, new_name in changes['renamed']:
+            tracks = self.queue.tracks
+            if old_name in tracks:
+                # Keep the queue sorted by file name, so added files and play_local find their place
+                index = tracks.index(old_name)
+                tracks[index] = new_name
+                self.queue.move(index, bisect.bisect(tracks[:index] + tracks[index + 1:], new_name))
+            if self.now_playing["file_name"] == old_name:
+                self.now_playing["file_name"] = new_name
+                self.now_playing["path"] = os.path.join(config.LOCAL_MUSIC_PATH, new_name)
+        tracks = self.queue.tracks
+        for name in changes['removed']:
+            if name in tracks:
+                self.queue.remove(tracks.index(name))
+        for name in changes['added']:
+            if name not in tracks:
+                self.queue.insert(bisect.bisect(tracks, name), name)
+
+
+_vlc_instance = None
+_vlc_instance_lock = threading.Lock()
+_playback_service = None
+_playback_service_lock = threading.Lock()
+
+
+def get_vlc_instance():
+    """Get the shared libVLC instance (any thread; loading libVLC's plugins is the slow part of the player)."""
+    global _vlc_instance
+    with _vlc_instance_lock:
+        if _vlc_instance is None:
+            _vlc_instance = vlc.Instance('--quiet', '--no-video')  # No video, quiet mode
+        return _vlc_instance
+
+
+def get_playback_service():
+    """Get the app-wide playback service (GUI thread only; made on first use)."""
+    global _playback_service
+    with _playback_service_lock:
+        if _playback_service is None:
+            _playback_service = PlaybackService()
+        return _playback_service
@@ -1,6 +1,8 @@
 """Request manager to handle debouncing and prevent UI freezing."""
 from PyQt6.QtCore import QTimer, QObject, pyqtSignal
+from collections import OrderedDict
 from functools import wraps
+import threading
 import time
 
 
@@ -26,6 +28,11 @@ class DebouncedFunction:
         
         return wrapper
 
+    def cancel(self):
+        """Drop the pending call, if any."""
+        if self.timer is not None:
+            self.timer.stop()
+
 
 class RequestThrottle:
     """Throttle requests to prevent too many rapid calls."""
@@ -49,6 +56,50 @@ class RequestThrottle:
         return max(0, int(remaining * 1000))
 
 
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after ttl_seconds."""
+    def __init__(self, maxsize=128, ttl_seconds=300):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._data = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """Get a live value and mark it as recently used."""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            if item[0] < time.time():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return item[1]
+
+    def set(self, key, value):
+        """Store a value, evicting the least recently used entries past maxsize."""
+        with self._lock:
+            self._data[key] = (time.time() + self.ttl_seconds, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def items(self):
+        """Snapshot of the live (key, value) pairs."""
+        now = time.time()
+        with self._lock:
+            return [(key, value) for key, (expires, value) in self._data.items() if expires >= now]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+def normalize_query(query):
+    """Lowercase and collapse whitespace so equivalent queries share a cache key."""
+    return " ".join(str(query).lower().split())
+
+
 class LoadingStateManager(QObject):
     """Manage loading states to prevent multiple simultaneous operations."""
     loading_started = pyqtSignal()
@@ -90,10 +141,13 @@ def debounce(delay_ms=300):
     return DebouncedFunction(delay_ms)
 
 
-# Singleton loading manager
-_global_loading_manager = LoadingStateManager()
+# Singleton loading manager (made on first use, so importing this module off the GUI thread creates no QObject)
+_global_loading_manager = None
 
 
 def get_loading_manager():
     """Get the global loading state manager."""
+    global _global_loading_manager
+    if _global_loading_manager is None:
+        _global_loading_manager = LoadingStateManager()
     return _global_loading_manager
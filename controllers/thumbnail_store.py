@@ -0,0 +1,133 @@
+"""
+Pre-scaled album art for the local library.
+
+Embedded covers are often 1000-3000px JPEGs, but the library list draws
+them at 64px and the player at the spinner size. Each cover (identified by
+the content hash the library index stores it under) is decoded once,
+cropped square, scaled to those sizes and written to the thumbnail cache,
+so tracks of the same album share one small file and screens never keep a
+full-size cover in memory.
+"""
+import os
+import threading
+from collections import OrderedDict
+from PyQt6.QtCore import Qt, QObject, QRunnable, pyqtSignal
+from PyQt6.QtGui import QImage, QPixmap
+from database.library_index import get_library_index
+import config
+
+THUMB_SIZE = 64  # library list icons
+SPINNER_SIZE = 400  # player CD (the spinner label's full size)
+MAX_CACHED_PIXMAPS = 256
+JPEG_QUALITY = 90
+
+
+def square_scaled(image, size):
+    """Center-crop a QImage to 1:1 and scale it to size x size."""
+    side = min(image.width(), image.height())
+    image = image.copy((image.width() - side) // 2, (image.height() - side) // 2, side, side)
+    return image.scaled(size, size, Qt.AspectRatioMode.IgnoreAspectRatio,
+                        Qt.TransformationMode.SmoothTransformation)
+
+
+class ThumbnailStore:
+    def __init__(self, cache_dir=config.THUMBNAIL_CACHE_PATH, index=None):
+        self.cache_dir = cache_dir
+        self.index = index or get_library_index()
+        os.makedirs(cache_dir, exist_ok=True)
+        self._pixmaps = OrderedDict()  # (art_hash, size) -> QPixmap, GUI thread only
+
+    def path(self, art_hash, size):
+        return os.path.join(self.cache_dir, f"{art_hash}_{size}.jpg")
+
+    def image(self, art_hash, size):
+        """
+        Thumbnail as a QImage, made from the indexed cover the first time.
+        Safe to call from worker threads; returns None if the cover is missing.
+        """
+        if not art_hash:
+            return None
+        path = self.path(art_hash, size)
+        image = QImage(path)
+        if not image.isNull():
+            return image
+
+        data = self.index.cover(art_hash)
+        image = QImage.fromData(data) if data else QImage()
+        if image.isNull():
+            return None
+        image = square_scaled(image, size)
+
+        # Write under a temporary name so a half-written file is never picked up
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        if image.save(tmp_path, "JPG", JPEG_QUALITY):
+            try:
+                os.replace(tmp_path, path)
+            except OSError as e:
+                print(f"[Thumbnails] Could not store {path}: {e}")
+        return image
+
+    def cached(self, art_hash, size):
+        """Thumbnail already loaded in memory, or None. GUI thread only."""
+        key = (art_hash, size)
+        pixmap = self._pixmaps.get(key)
+        if pixmap is not None:
+            self._pixmaps.move_to_end(key)
+        return pixmap
+
+    def add(self, art_hash, size, image):
+        """Keep a loaded thumbnail in memory (least recently used dropped first). GUI thread only."""
+        pixmap = QPixmap.fromImage(image)
+        self._pixmaps[(art_hash, size)] = pixmap
+        while len(self._pixmaps) > MAX_CACHED_PIXMAPS:
+            self._pixmaps.popitem(last=False)
+        return pixmap
+
+    def pixmap(self, art_hash, size):
+        """Thumbnail as a QPixmap, loading it on the calling (GUI) thread if needed."""
+        pixmap = self.cached(art_hash, size)
+        if pixmap is None:
+            image = self.image(art_hash, size)
+            pixmap = self.add(art_hash, size, image) if image is not None else None
+        return pixmap
+
+
+_thumbnail_store = None
+_thumbnail_store_lock = threading.Lock()
+
+
+def get_thumbnail_store():
+    """Get the shared thumbnail store."""
+    global _thumbnail_store
+    with _thumbnail_store_lock:
+        if _thumbnail_store is None:
+            _thumbnail_store = ThumbnailStore()
+        return _thumbnail_store
+
+
+class ThumbnailLoaderSignals(QObject):
+    finished = pyqtSignal(str, int, object)  # art_hash, size, QImage (None if there is no cover)
+
+
+class ThumbnailLoader(QRunnable):
+    """Load (or make) one thumbnail off the GUI thread."""
+    def __init__(self, art_hash, size):
+        super().__init__()
+        self.art_hash = art_hash
+        self.size = size
+        self.signals = ThumbnailLoaderSignals()
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def run(self):
+        if self._cancelled:
+            return
+        try:
+            image = get_thumbnail_store().image(self.art_hash, self.size)
+        except Exception as e:
+            print(f"[Thumbnails] Failed to load {self.art_hash}: {e}")
+            image = None
+        if not self._cancelled:
+            self.signals.finished.emit(self.art_hash, self.size, image)
@@ -0,0 +1,163 @@
+"""
+Central control of the UI's periodic work (animations, marquees).
+
+Screens register their periodic callbacks here rather than running their own
+QTimers. Each governed timer is tied to the widget it draws on and only runs
+while the owner wants it (e.g. music is playing) and that widget can be seen:
+it stops while the widget's page is not the current one, the window is hidden,
+minimized or not exposed (fully covered, on platforms that report it), and it
+slows down or pauses while the window is in the background. When nothing on
+screen changes no timer wakes the app up.
+"""
+import threading
+from PyQt6.QtCore import QObject, QEvent, QTimer, pyqtSignal
+
+# Events after which a timer re-checks whether its widget can be seen
+WIDGET_EVENTS = (QEvent.Type.Show, QEvent.Type.Hide)
+WINDOW_EVENTS = (QEvent.Type.Show, QEvent.Type.Hide, QEvent.Type.WindowStateChange,
+                 QEvent.Type.WindowActivate, QEvent.Type.WindowDeactivate)
+
+
+class GovernedTimer(QObject):
+    """A periodic callback that runs only while its widget is on screen (see TimerGovernor.register)."""
+
+    def __init__(self, governor, widget, callback, interval, background_interval):
+        super().__init__(widget)
+        self.governor = governor
+        self.widget = widget
+        self.interval = interval
+        self.background_interval = background_interval
+        self.enabled = False
+        self._window = None
+        self._window_handle = None
+        self._update_pending = False
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(callback)
+        widget.installEventFilter(self)
+
+    @property
+    def current_interval(self):
+        """Interval the timer runs at now (0 while stopped)."""
+        return self.timer.interval() if self.timer.isActive() else 0
+
+    def set_enabled(self, enabled):
+        """Whether the owner wants the work done at all (it still only runs while visible)."""
+        if enabled != self.enabled:
+            self.enabled = enabled
+            self.update()
+
+    def update(self):
+        self._update_pending = False
+        self._watch_window()
+        interval = self._wanted_interval()
+        was_active = self.timer.isActive()
+        if not interval:
+            self.timer.stop()
+        elif not was_active or self.timer.interval() != interval:
+            self.timer.start(interval)
+        if was_active != self.timer.isActive():
+            self.governor.timer_state_changed()
+
+    def _wanted_interval(self):
+        if not self.enabled or not self.widget.isVisible():
+            return 0
+        window = self.widget.window()
+        if window.isMinimized():
+            return 0
+        if self._window_handle is not None and not self._window_handle.isExposed():
+            return 0
+        return self.interval if window.isActiveWindow() else self.background_interval
+
+    # The widget may be put in another window after the timer was registered
+    def _watch_window(self):
+        window = self.widget.window()
+        if window is not self._window:
+            if self._window is not None:
+                self._window.removeEventFilter(self)
+            self._window = window
+            if window is not self.widget:
+                window.installEventFilter(self)
+            self._window_handle = None
+        handle = window.windowHandle()
+        if handle is not self._window_handle:
+            # Expose events (window covered/uncovered) only reach the QWindow
+            if self._window_handle is not None:
+                self._window_handle.removeEventFilter(self)
+            self._window_handle = handle
+            if handle is not None:
+                handle.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        kind = event.type()
+        if ((obj is self.widget and kind in WIDGET_EVENTS)
+                or (obj is self._window and kind in WINDOW_EVENTS)
+                or (obj is self._window_handle and kind == QEvent.Type.Expose)):
+            # The window's own handlers run first, so its new state is settled on the next turn
+            if not self._update_pending:
+                self._update_pending = True
+                QTimer.singleShot(0, self.update)
+        return False
+
+
+class TimerGovernor(QObject):
+    active_count_changed = pyqtSignal(int)  # timers running right now
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._timers = []
+        self._active_count = 0
+
+    def register(self, widget, callback, interval, background_interval=None):
+        """
+        Run callback every interval ms while widget is on screen.
+
+        Args:
+            widget: Widget the work draws on (the timer is deleted with it)
+            callback: Periodic work
+            interval: Interval (ms) while the window is active
+            background_interval: Interval while the window is in the background,
+                0 to pause, None for the same as interval
+
+        Returns:
+            GovernedTimer, disabled until set_enabled(True)
+        """
+        if background_interval is None:
+            background_interval = interval
+        governed = GovernedTimer(self, widget, callback, interval, background_interval)
+        self._timers.append(governed)
+        governed.destroyed.connect(lambda _: self._forget(governed))
+        return governed
+
+    def _forget(self, governed):
+        if governed in self._timers:
+            self._timers.remove(governed)
+        self.timer_state_changed()
+
+    def active_count(self):
+        """Number of governed timers currently running."""
+        return self._active_count
+
+    def timer_state_changed(self):
+        count = 0
+        for governed in self._timers:
+            try:
+                count += governed.timer.isActive()
+            except RuntimeError:
+                pass  # being deleted
+        if count != self._active_count:
+            self._active_count = count
+            self.active_count_changed.emit(count)
+
+
+_timer_governor = None
+_timer_governor_lock = threading.Lock()
+
+
+def get_timer_governor():
+    """Get the app-wide timer governor (GUI thread only)."""
+    global _timer_governor
+    with _timer_governor_lock:
+        if _timer_governor is None:
+            _timer_governor = TimerGovernor()
+        return _timer_governor
@@ -0,0 +1,260 @@
+"""
+Startup warm-up.
+
+While the splash and login screens are shown, the work the main screen
+would otherwise do on first use runs in the background: the user database,
+libVLC and the playback service, the ytmusicapi client, the library index
+and model, the main screen's modules, and the first HTTPS connection to
+each API host (kept alive in the shared session, controllers/http_session.py).
+
+Each task names the tasks it depends on and starts as soon as they are
+done, so independent tasks run at the same time. Most run on the
+warm-up's own thread pool; tasks that create QObjects for the GUI run on
+the GUI thread. Every task's time is printed, and a summary once all are
+done. A task that fails is only logged; whoever needs its result later
+does the work on demand as before (see Warmup.wait_for and Warmup.require).
+"""
+import threading
+import time
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+
+WORKER_THREADS = 4  # own pool, so slow handshakes don't hold up the UI's image loaders
+API_HOSTS = ("api.themoviedb.org", "image.tmdb.org", "api.rawg.io", "music.youtube.com")
+
+# Task states
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+SKIPPED = "skipped"  # a dependency failed
+
+
+class WarmupTask:
+    def __init__(self, name, func, depends=(), gui_thread=False):
+        self.name = name
+        self.func = func
+        self.depends = tuple(depends)
+        self.gui_thread = gui_thread
+        self.state = PENDING
+        self.queued = False  # GUI-thread task waiting for the event loop
+        self.result = None
+        self.error = None
+        self.ms = None
+        self.done = threading.Event()  # set when it stops running, whatever the outcome
+
+    def run(self):
+        self.state = RUNNING
+        start = time.perf_counter()
+        try:
+            self.result = self.func()
+            self.state = DONE
+        except Exception as e:
+            self.error = e
+            self.state = FAILED
+        self.ms = (time.perf_counter() - start) * 1000
+        self.done.set()
+
+
+class WarmupRunnerSignals(QObject):
+    finished = pyqtSignal(str)  # task name
+
+
+class WarmupRunner(QRunnable):
+    """Run one worker-thread task."""
+    def __init__(self, task):
+        super().__init__()
+        self.task = task
+        self.signals = WarmupRunnerSignals()
+
+    def run(self):
+        self.task.run()
+        self.signals.finished.emit(self.task.name)
+
+
+class Warmup(QObject):
+    task_finished = pyqtSignal(str, str, float)  # name, state, ms
+    finished = pyqtSignal(object)  # {name: ms}
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.tasks = {}
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(WORKER_THREADS)
+        self._runners = set()  # keeps each runner's signals alive until it reports
+        self._started_at = None
+        self._reported = False
+
+    def add(self, name, func, depends=(), gui_thread=False):
+        """
+        Add a task. Its dependencies must have been added before it (so there are no cycles).
+
+        Args:
+            name: Unique task name
+            func: Work to do, called without arguments; its return value is the task's result
+            depends: Names of the tasks that must be done first
+            gui_thread: Run on the GUI thread (for tasks that create QObjects)
+        """
+        unknown = [dep for dep in depends if dep not in self.tasks]
+        if name in self.tasks or unknown:
+            raise ValueError(f"Bad warm-up task {name!r} (unknown dependencies: {unknown})")
+        self.tasks[name] = WarmupTask(name, func, depends, gui_thread)
+
+    def start(self):
+        self._started_at = time.perf_counter()
+        self._schedule()
+
+    def is_done(self, *names):
+        """Whether the named tasks have all stopped running (done, failed or skipped)."""
+        return all(self.tasks[name].done.is_set() for name in names)
+
+    def timings(self):
+        """Time each finished task took, in ms."""
+        return {name: task.ms for name, task in self.tasks.items() if task.ms is not None}
+
+    def wait_for(self, name):
+        """
+        Get a task's result from a worker thread.
+
+        Waits until the warm-up has run the task, without holding up the GUI
+        thread. If it failed or was skipped, its work is tried again here.
+        """
+        task = self.tasks[name]
+        task.done.wait()
+        return task.result if task.state == DONE else task.func()
+
+    def require(self, name):
+        """
+        Get a task's result now (GUI thread).
+
+        Waits if the task is running, and runs it (after its dependencies) right
+        away if it hasn't started yet. If it failed, its work is tried again here.
+        Only for results the GUI can't go on without; elsewhere use wait_for().
+        """
+        task = self.tasks[name]
+        if task.state == PENDING:
+            for dep in task.depends:
+                self.require(dep)
+            if task.state == PENDING:
+                task.run()
+                self._on_task_finished(name)
+        task.done.wait()
+        return task.result if task.state == DONE else task.func()
+
+    def _schedule(self):
+        for task in self.tasks.values():
+            if task.state != PENDING or task.queued:
+                continue
+            states = [self.tasks[dep].state for dep in task.depends]
+            if any(state in (FAILED, SKIPPED) for state in states):
+                task.state = SKIPPED
+                task.done.set()
+                self._on_task_finished(task.name)
+            elif all(state == DONE for state in states):
+                self._start_task(task)
+
+    def _start_task(self, task):
+        if task.gui_thread:
+            task.queued = True
+            QTimer.singleShot(0, lambda: self._run_on_gui_thread(task))
+            return
+        task.state = RUNNING
+        runner = WarmupRunner(task)
+        runner.signals.finished.connect(lambda name: self._on_runner_finished(runner, name))
+        self._runners.add(runner)
+        self.pool.start(runner)
+
+    def _run_on_gui_thread(self, task):
+        task.queued = False
+        if task.state != PENDING:
+            return  # Already run by require()
+        task.run()
+        self._on_task_finished(task.name)
+
+    def _on_runner_finished(self, runner, name):
+        self._runners.discard(runner)
+        self._on_task_finished(name)
+
+    def _on_task_finished(self, name):
+        task = self.tasks[name]
+        if task.state == FAILED:
+            print(f"[Warmup] {name} failed after {task.ms:.0f} ms: {task.error}")
+        elif task.state == SKIPPED:
+            print(f"[Warmup] {name} skipped (a dependency failed)")
+        else:
+            print(f"[Warmup] {name}: {task.ms:.0f} ms")
+        self.task_finished.emit(name, task.state, task.ms or 0.0)
+
+        self._schedule()
+        if not self._reported and all(t.done.is_set() for t in self.tasks.values()):
+            self._reported = True
+            total = (time.perf_counter() - self._started_at) * 1000 if self._started_at else 0
+            work = sum(self.timings().values())
+            print(f"[Warmup] {len(self.tasks)} tasks done in {total:.0f} ms ({work:.0f} ms of work)")
+            self.finished.emit(self.timings())
+
+
+# Tasks
+
+def _init_database():
+    from controllers.auth_controller import AuthController
+    return AuthController()  # creates the tables
+
+
+def _init_http_session():
+    from controllers.http_session import get_session
+    return get_session()
+
+
+def _warm_host(host):
+    def warm():
+        from controllers.http_session import warm_connection
+        warm_connection(host)
+    return warm
+
+
+def _init_ytmusic():
+    from controllers.api_client import get_ytmusic
+    return get_ytmusic()
+
+
+def _init_media_engine():
+    from controllers.playback_service import get_vlc_instance
+    return get_vlc_instance()
+
+
+def _init_library_index():
+    from database.library_index import get_library_index
+    return get_library_index()
+
+
+def _import_main_screen():
+    import screens.main_screen
+    return screens.main_screen
+
+
+def _init_playback_service():
+    from controllers.playback_service import get_playback_service
+    return get_playback_service()
+
+
+def _init_library_model():
+    from screens.library_list_view import get_library_model
+    return get_library_model()
+
+
+def start_warmup(parent=None):
+    """Start warming up everything the main screen needs, and return the Warmup."""
+    warmup = Warmup(parent)
+    warmup.add("database", _init_database)
+    warmup.add("http_session", _init_http_session)
+    for host in API_HOSTS:
+        warmup.add(f"connect {host}", _warm_host(host), depends=["http_session"])
+    warmup.add("ytmusic", _init_ytmusic, depends=["http_session"])
+    warmup.add("media_engine", _init_media_engine)
+    warmup.add("library_index", _init_library_index)
+    # After media_engine, so only one thread at a time imports playback_service
+    warmup.add("main_screen", _import_main_screen, depends=["media_engine"])
+    warmup.add("playback_service", _init_playback_service, depends=["main_screen", "library_index"], gui_thread=True)
+    warmup.add("library_model", _init_library_model, depends=["main_screen", "library_index"], gui_thread=True)
+    warmup.start()
+    return warmup
@@ -2,63 +2,120 @@ import sqlite3
 import os
 import hashlib
 import secrets
+import threading
+import config
+
+# Applied to every new connection (journal_mode is stored in the database file itself)
+PRAGMAS = (
+    "PRAGMA journal_mode = WAL",  # readers don't block the writer; a commit appends to the WAL
+    "PRAGMA synchronous = NORMAL",  # in WAL mode only a checkpoint waits for fsync
+    "PRAGMA cache_size = -8000",  # 8 MB page cache per connection
+    "PRAGMA mmap_size = 67108864",  # read up to 64 MB through memory mapping
+    "PRAGMA temp_store = MEMORY",
+)
+BUSY_TIMEOUT = 5  # seconds a connection waits for another one's write lock
+CACHED_STATEMENTS = 256  # prepared statements kept per connection
+
+
+class PersistentConnection(sqlite3.Connection):
+    """
+    A connection kept open for its thread by DatabaseConnection.get_connection.
+    close() only hands it back: a transaction left open is rolled back (as a
+    real close would do) and the connection stays open for the next caller.
+    """
+
+    def close(self):
+        if self.in_transaction:
+            self.rollback()
+
+    def close_now(self):
+        super().close()
+
 
 class DatabaseConnection:
     """
     SQLite database connection and initialization.
     Creates users table and initializes with one admin account.
+
+    Each thread gets one persistent connection per database file, opened in
+    WAL mode with the PRAGMAS above, so frequent small reads and writes don't
+    pay for opening the file and re-preparing their statements every time.
+    Schemas are versioned with PRAGMA user_version (see migrate).
     """
     
-    DB_PATH = "user_database.db"
+    DB_PATH = config.DB_PATH
+    _local = threading.local()  # .connections: {db_path: (pid, PersistentConnection)}
+    _initialized = False
+    _init_lock = threading.Lock()
     
     @classmethod
-    def get_connection(cls):
-        """Get a connection to the SQLite database."""
-        conn = sqlite3.connect(cls.DB_PATH)
+    def get_connection(cls, db_path=None):
+        """
+        Get this thread's connection to the SQLite database (the users database unless db_path is given).
+
+        Callers may close() it when done as before; that returns it to the
+        thread instead of closing it (see PersistentConnection).
+        """
+        path = os.path.abspath(db_path or cls.DB_PATH)
+        connections = getattr(cls._local, 'connections', None)
+        if connections is None:
+            connections = cls._local.connections = {}
+        entry = connections.get(path)
+        if entry is not None and entry[0] == os.getpid():  # not inherited through fork
+            return entry[1]
+
+        conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT, factory=PersistentConnection,
+                               cached_statements=CACHED_STATEMENTS)
         conn.row_factory = sqlite3.Row  # Access columns by name
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        connections[path] = (os.getpid(), conn)
         return conn
+
+    @classmethod
+    def close_thread_connections(cls):
+        """Close the calling thread's connections (they are reopened on the next get_connection)."""
+        connections = getattr(cls._local, 'connections', {})
+        cls._local.connections = {}
+        for pid, conn in connections.values():
+            if pid == os.getpid():
+                conn.close_now()
+
+    @classmethod
+    def migrate(cls, conn, migrations):
+        """
+        Bring a database's schema up to date.
+
+        Args:
+            conn: Connection to the database
+            migrations: Functions taking a connection, one per schema version in
+                order; those past the stored PRAGMA user_version run once, in
+                one transaction, and the version is then set to len(migrations)
+        """
+        if conn.execute("PRAGMA user_version").fetchone()[0] >= len(migrations):
+            return
+        conn.execute("BEGIN IMMEDIATE")  # another thread or process may be migrating too
+        try:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            for migration in migrations[version:]:
+                migration(conn)
+            conn.execute(f"PRAGMA user_version = {len(migrations)}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
     
     @classmethod
     def initialize_database(cls):
         """
         Initialize the database with users table.
-        Creates the table if it doesn't exist and adds default admin user.
+        Runs the schema migrations once per process; later calls return at once.
         """
-        conn = cls.get_connection()
-        cursor = conn.cursor()
-        
-        # Create users table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                username TEXT UNIQUE NOT NULL,
-                password_hash TEXT NOT NULL,
-                salt TEXT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # Check if admin user already exists
-        cursor.execute("SELECT COUNT(*) FROM users WHERE username = ?", ("admin",))
-        count = cursor.fetchone()[0]
-        
-        if count == 0:
-            # Create default admin user
-            password = "admin123"
-            salt = secrets.token_hex(16)  # 32 character hex string
-            password_hash = cls.hash_password(password, salt)
-            
-            cursor.execute('''
-                INSERT INTO users (username, password_hash, salt)
-                VALUES (?, ?, ?)
-            ''', ("admin", password_hash, salt))
-            
-            print("Database initialized with default admin user.")
-            print("Username: admin")
-            print("Password: admin123")
-        
-        conn.commit()
-        conn.close()
+        with cls._init_lock:
+            if cls._initialized:
+                return
+            cls.migrate(cls.get_connection(), USERS_MIGRATIONS)
+            cls._initialized = True
     
     @staticmethod
     def hash_password(password: str, salt: str) -> str:
@@ -111,7 +168,7 @@ class DatabaseConnection:
             return input_hash == stored_hash
             
         finally:
-            conn.close()
+            cursor.close()
     
     @classmethod
     def user_exists(cls, username: str) -> bool:
@@ -124,4 +181,39 @@ class DatabaseConnection:
             count = cursor.fetchone()[0]
             return count > 0
         finally:
-            conn.close()
\ No newline at end of file
+            cursor.close()
+
+
+# Users database schema, one function per version
+
+def _create_users(conn):
+    """Version 1: users table with the default admin account."""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT UNIQUE NOT NULL,
+            password_hash TEXT NOT NULL,
+            salt TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    # Databases made before versioning already have it
+    count = conn.execute("SELECT COUNT(*) FROM users WHERE username = ?", ("admin",)).fetchone()[0]
+    if count == 0:
+        # Create default admin user
+        password = "admin123"
+        salt = secrets.token_hex(16)  # 32 character hex string
+        password_hash = DatabaseConnection.hash_password(password, salt)
+
+        conn.execute('''
+            INSERT INTO users (username, password_hash, salt)
+            VALUES (?, ?, ?)
+        ''', ("admin", password_hash, salt))
+
+        print("Database initialized with default admin user.")
+        print("Username: admin")
+        print("Password: admin123")
+
+
+USERS_MIGRATIONS = [_create_users]
@@ -0,0 +1,226 @@
+import os
+import hashlib
+import threading
+from database.connection import DatabaseConnection
+import config
+
+# File types VLC plays that we list in the local library
+AUDIO_EXTENSIONS = {'.mp3', '.m4a', '.flac', '.ogg', '.opus', '.wav', '.aac', '.wma'}
+
+
+class LibraryIndex:
+    """
+    SQLite index of the local music library.
+    One row per file in the music folder with its size, mtime and tags, so
+    screens never have to open audio files to list or show them. Cover art
+    is stored once per content hash and shared by tracks of the same album.
+    """
+
+    def __init__(self, music_dir=config.LOCAL_MUSIC_PATH, db_path=config.LIBRARY_DB_PATH):
+        self.music_dir = music_dir
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.initialize()
+
+    def connect(self):
+        """Get a connection to the library database."""
+        return DatabaseConnection.get_connection(self.db_path)
+
+    def initialize(self):
+        """Create the library tables, or update them if the index was made by an older version."""
+        DatabaseConnection.migrate(self.connect(), LIBRARY_MIGRATIONS)
+
+    def tracks(self):
+        """
+        Get every indexed track, sorted by file name.
+
+        Returns:
+            List of dicts with the library_tracks columns
+        """
+        conn = self.connect()
+        try:
+            rows = conn.execute("SELECT * FROM library_tracks ORDER BY file_name").fetchall()
+            return [dict(row) for row in rows]
+        finally:
+            conn.close()
+
+    def file_names(self):
+        """Get the indexed file names, sorted."""
+        conn = self.connect()
+        try:
+            rows = conn.execute("SELECT file_name FROM library_tracks ORDER BY file_name").fetchall()
+            return [row['file_name'] for row in rows]
+        finally:
+            conn.close()
+
+    def track(self, file_name):
+        """Get one indexed track as a dict, or None if it isn't indexed yet."""
+        conn = self.connect()
+        try:
+            row = conn.execute("SELECT * FROM library_tracks WHERE file_name = ?", (file_name,)).fetchone()
+            return dict(row) if row else None
+        finally:
+            conn.close()
+
+    def cover(self, art_hash):
+        """Get the cover image bytes stored under art_hash, or None."""
+        if not art_hash:
+            return None
+        conn = self.connect()
+        try:
+            row = conn.execute("SELECT data FROM library_art WHERE hash = ?", (art_hash,)).fetchone()
+            return row['data'] if row else None
+        finally:
+            conn.close()
+
+    def stat_files(self):
+        """
+        Stat the audio files in the music folder.
+
+        Returns:
+            Dict of file name -> (size, mtime)
+        """
+        files = {}
+        try:
+            with os.scandir(self.music_dir) as entries:
+                for entry in entries:
+                    if not entry.is_file() or os.path.splitext(entry.name)[1].lower() not in AUDIO_EXTENSIONS:
+                        continue
+                    st = entry.stat()
+                    files[entry.name] = (st.st_size, st.st_mtime)
+        except FileNotFoundError:
+            pass
+        return files
+
+    def diff(self):
+        """
+        Compare the music folder with the index.
+
+        Returns:
+            (added, modified, removed): dicts of file name -> (size, mtime) for
+            new files, files whose size or mtime changed (current stat), and
+            indexed files that are gone (last indexed stat)
+        """
+        on_disk = self.stat_files()
+        conn = self.connect()
+        try:
+            indexed = {row['file_name']: (row['size'], row['mtime'])
+                       for row in conn.execute("SELECT file_name, size, mtime FROM library_tracks")}
+        finally:
+            conn.close()
+
+        added = {name: stat for name, stat in on_disk.items() if name not in indexed}
+        modified = {name: stat for name, stat in on_disk.items() if name in indexed and indexed[name] != stat}
+        removed = {name: stat for name, stat in indexed.items() if name not in on_disk}
+        return added, modified, removed
+
+    def upsert(self, records):
+        """
+        Insert or update tracks in one transaction.
+
+        Args:
+            records: Dicts with file_name, size, mtime, title, artist, album,
+                     duration, bitrate, has_lyrics and the cover bytes under 'art'
+        """
+        if not records:
+            return
+        conn = self.connect()
+        try:
+            with conn:
+                for record in records:
+                    art = record.get('art')
+                    art_hash = hashlib.sha1(art).hexdigest() if art else None
+                    if art_hash:
+                        conn.execute("INSERT OR IGNORE INTO library_art (hash, data) VALUES (?, ?)",
+                                     (art_hash, art))
+                    conn.execute('''
+                        INSERT OR REPLACE INTO library_tracks
+                            (file_name, size, mtime, title, artist, album, duration, bitrate, art_hash, has_lyrics)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ''', (record['file_name'], record['size'], record['mtime'], record.get('title'),
+                          record.get('artist'), record.get('album'), record.get('duration'), record.get('bitrate'),
+                          art_hash, int(bool(record.get('has_lyrics')))))
+                self._drop_unused_art(conn)
+        finally:
+            conn.close()
+
+    def remove(self, file_names):
+        """Remove tracks (and cover art no other track uses) from the index."""
+        if not file_names:
+            return
+        conn = self.connect()
+        try:
+            with conn:
+                conn.executemany("DELETE FROM library_tracks WHERE file_name = ?",
+                                 [(name,) for name in file_names])
+                self._drop_unused_art(conn)
+        finally:
+            conn.close()
+
+    def rename(self, renames):
+        """Move tracks to new file names, keeping their tags (list of (old, new) pairs)."""
+        if not renames:
+            return
+        conn = self.connect()
+        try:
+            with conn:
+                conn.executemany("UPDATE library_tracks SET file_name = ? WHERE file_name = ?",
+                                 [(new, old) for old, new in renames])
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _drop_unused_art(conn):
+        conn.execute('''
+            DELETE FROM library_art
+            WHERE hash NOT IN (SELECT art_hash FROM library_tracks WHERE art_hash IS NOT NULL)
+        ''')
+
+
+# Library index schema, one function per version
+
+def _create_library_tables(conn):
+    """Version 1: tracks and their shared cover art."""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS library_tracks (
+            file_name TEXT PRIMARY KEY,
+            size INTEGER NOT NULL,
+            mtime REAL NOT NULL,
+            title TEXT,
+            artist TEXT,
+            album TEXT,
+            duration REAL,
+            bitrate INTEGER,
+            art_hash TEXT,
+            has_lyrics INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS library_art (
+            hash TEXT PRIMARY KEY,
+            data BLOB NOT NULL
+        )
+    ''')
+
+
+def _add_bitrate(conn):
+    """Version 2: bitrates (indexes made before they were probed get the column and re-scan every file once)."""
+    columns = {row['name'] for row in conn.execute("PRAGMA table_info(library_tracks)")}
+    if 'bitrate' not in columns:
+        conn.execute("ALTER TABLE library_tracks ADD COLUMN bitrate INTEGER")
+        conn.execute("UPDATE library_tracks SET mtime = -1")
+
+
+LIBRARY_MIGRATIONS = [_create_library_tables, _add_bitrate]
+
+_library_index = None
+_library_index_lock = threading.Lock()
+
+
+def get_library_index():
+    """Get the shared library index (tables are created on first use)."""
+    global _library_index
+    with _library_index_lock:
+        if _library_index is None:
+            _library_index = LibraryIndex()
+        return _library_index
@@ -5,12 +5,16 @@ import os
 os.environ["PYTHON_VLC_MODULE_PATH"] = r"C:\Program Files\VideoLAN\VLC"
 os.environ["PATH"] = os.environ["PYTHON_VLC_MODULE_PATH"] + os.pathsep + os.environ["PATH"]
 
+import multiprocessing
 from PyQt6.QtWidgets import QApplication
-from controllers.app_controller import AppController
 
 os.environ["QT_SCALE_FACTOR"] = "1"
 
 def main():
+    # Imported here so the spawned yt-dlp extractor processes, which re-import
+    # this module, don't load the whole UI
+    from controllers.app_controller import AppController
+
     app = QApplication(sys.argv)
 
     controller = AppController()
@@ -21,4 +25,5 @@ def main():
         print(f"Application error: {e}")
 
 if __name__ == '__main__':
+    multiprocessing.freeze_support()
     main()
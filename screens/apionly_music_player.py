@@ -1,102 +1,71 @@
-import os
-import tempfile
-import requests
-import vlc
-import yt_dlp
 from functools import partial
 from PyQt6.QtWidgets import QDialog, QWidget, QScrollArea, QPushButton, QButtonGroup, QVBoxLayout
-from PyQt6.QtCore import Qt, QTimer
-from PyQt6.QtGui import QIcon, QPixmap, QPainter, QPainterPath, QImage
+from PyQt6.QtGui import QIcon
 from UI.music_player_ui import Ui_Dialog
+from controllers.playback_service import get_playback_service, API
+from controllers.timer_governor import get_timer_governor
+from screens.cd_spinner import CdSpinner
 import config
 
 
 class ApiMusicPlayer(QDialog):
-    def __init__(self, song_metadata, playlist=None, parent=None):
+    """Full player for streamed songs; a view over the playback service that is shown and hidden, never rebuilt."""
+    def __init__(self, parent=None):
         super().__init__(parent)
 
         # UI setup
         self.ui = Ui_Dialog()
         self.ui.setupUi(self)
 
-        self.song_metadata = song_metadata
-        self.temp_dir = tempfile.TemporaryDirectory()
-        self.temp_file_path = None
-        self.playlist = playlist
+        self.playback = get_playback_service()
+        self.following_position = False
+        self.active = False  # the service is playing a streamed song
 
         # Playback options
-        self.repeat = 0
-        self.rotation_angle = 0
         self.scroll_offset = 0
         self.artist_full_text = ""
         self.isPlaying = False
-        self.current_lyric_index = 0
+        self.is_seeking = False  # the user is dragging the progress slider
 
-        # VLC instance
-        self.instance = vlc.Instance('--quiet', '--no-video')
-        self.player = self.instance.media_player_new()
+        # Spinning CD (pre-rendered frames)
+        self.spinner = CdSpinner(self.ui.spinner, self)
 
-        # Exit player when music ends
-        self.player.event_manager().event_attach(
-            vlc.EventType.MediaPlayerEndReached,
-            self.on_music_end
-        )
-
-        # Timers
-        self.rotation_timer = QTimer(self)
-        self.rotation_timer.timeout.connect(self.spin_pixmap)
-        self.rotation_timer.start(30)  # ~33 FPS
-
-        self.position_timer = QTimer(self)
-        self.position_timer.timeout.connect(self.update_position_and_duration)
-        self.position_timer.start(100)
-
-        self.scroll_timer = QTimer(self)
-        self.scroll_timer.timeout.connect(self.scroll_artist_name)
-        self.scroll_timer.start(150)
+        # Marquee (only runs while the window is shown)
+        self.scroll_timer = get_timer_governor().register(self.ui.artist_name, self.scroll_artist_name, 150,
+                                                          background_interval=0)  # speed (ms)
+        self.artist_text_width = 0
 
         # Button group for playlist
         self.button_group = QButtonGroup(self)
+        self.playlist_area = None
 
-        # Load music and setup UI
-        self.load_music()
-        self.display_playlist([])  # Empty by default
         self.init_ui()
-        self.play()
-
-    # Close dialog when music ends
-    def on_music_end(self, event):
-        QTimer.singleShot(0, self.close)
-
-    # Cleanup method to stop playback and timers
-    def cleanup(self):
-        # Cleanup method to stop playback and timers
-        if hasattr(self, 'player') and self.player:
-            self.player.stop()
-        if hasattr(self, 'rotation_timer'):
-            self.rotation_timer.stop()
-        if hasattr(self, 'scroll_timer'):
-            self.scroll_timer.stop()
-        if hasattr(self, 'position_timer'):
-            self.position_timer.stop()
-        if hasattr(self, 'temp_dir'):
-            self.temp_dir.cleanup()
-
-    # Stop playback and clean up on close
-    def closeEvent(self, event):
-        # Stop playback and clean up on close
-        self.cleanup()
-        event.accept()
+
+        # Redraw from the service (it keeps playing while this window is hidden)
+        self.playback.queue_changed.connect(self.on_queue_changed)
+        self.playback.track_changed.connect(self.on_track_changed)
+        self.playback.art_changed.connect(self.on_art_changed)
+        self.playback.duration_changed.connect(self.on_duration_changed)
+        self.playback.state_changed.connect(self.on_state_changed)
+        self.playback.status_changed.connect(self.set_status)
+        self.playback.load_failed.connect(self.on_load_failed)
+        self.playback.repeat_changed.connect(self.on_repeat_changed)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.ui.volume_slider.setValue(self.playback.volume)
+        self.set_artist_text(self.artist_full_text)  # the label may have been resized
+        self.follow_position(True)
+
+    def hideEvent(self, event):
+        # Nothing to refresh while hidden; playback goes on in the service
+        self.follow_position(False)
+        super().hideEvent(event)
 
     # Setup UI signals and default values
     def init_ui(self):
         self.ui.lyrics_tab.hide()
 
-        if not self.playlist:
-            self.ui.playback_tab.hide()
-            self.ui.list_tab.hide()
-            self.ui.loop_shuffle.hide()
-
         # Setup UI signals and default values
         self.ui.playButton.setIcon(QIcon(config.ICON_PATH + "play.svg"))
         self.ui.nextButton.setIcon(QIcon(config.ICON_PATH + "next.svg"))
@@ -106,11 +75,12 @@ class ApiMusicPlayer(QDialog):
 
         self.ui.volume_frame.setVisible(False)
 
-        self.ui.loop_shuffle.clicked.connect(self.loop_shuffle)
-        self.ui.playButton.clicked.connect(self.toggle_play_pause)
+        self.ui.loop_shuffle.clicked.connect(self.playback.cycle_repeat)
+        self.ui.playButton.clicked.connect(self.playback.toggle)
 
-        self.ui.nextButton.clicked.connect(self.seek_forward)
-        self.ui.prevButton.clicked.connect(self.seek_backward)
+        # Move forward/backward by 10 seconds
+        self.ui.nextButton.clicked.connect(lambda: self.playback.seek_by(10000))
+        self.ui.prevButton.clicked.connect(lambda: self.playback.seek_by(-10000))
 
         self.ui.playback_tab.clicked.connect(lambda: self.ui.stackedWidget.setCurrentIndex(0))
         self.ui.list_tab.clicked.connect(lambda: self.ui.stackedWidget.setCurrentIndex(1))
@@ -120,156 +90,112 @@ class ApiMusicPlayer(QDialog):
         self.ui.progressTime.sliderReleased.connect(self.slider_released)
 
         self.ui.volume_slider.setRange(0, 100)
-        self.ui.volume_slider.setValue(config.DEFAULT_VOLUME)
-        self.player.audio_set_volume(config.DEFAULT_VOLUME)
-        self.ui.volume_label.setText(str(config.DEFAULT_VOLUME))
+        self.ui.volume_slider.setValue(self.playback.volume)
+        self.ui.volume_label.setText(str(self.playback.volume))
         self.ui.volume_slider.valueChanged.connect(self.change_volume)
 
     def change_volume(self, value):
-        self.player.audio_set_volume(value)
+        self.playback.set_volume(value)
         self.ui.volume_label.setText(str(value))
 
-    # Download image from URL and return as QPixmap
-    def pixmap_from_url(self, url):
-        try:
-            resp = requests.get(url)
-            resp.raise_for_status()
-            image = QImage()
-            image.loadFromData(resp.content)
-            return QPixmap.fromImage(image)
-        except Exception as e:
-            print("Failed to load pixmap from URL:", e)
-            return None
-
-    # Download audio via yt-dlp and load into VLC
-    def load_music(self):
-        video_id = self.song_metadata.get("videoId")
-        if not video_id:
-            print("No videoId for song")
-            return
+    def set_status(self, message):
+        if self.active:
+            self.setWindowTitle(message)
 
-        ydl_opts = {
-            "format": "bestaudio/best",
-            "outtmpl": os.path.join(self.temp_dir.name, "%(title)s.%(ext)s"),
-            "quiet": True,
-            "nocheckcertificate": True,
-        }
-        url = f"https://www.youtube.com/watch?v={video_id}"
-        try:
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(url, download=True)
-                self.temp_file_path = ydl.prepare_filename(info)
-        except Exception as e:
-            print("Error downloading audio:", e)
+    # A new list was started: rebuild the playlist tab (empty when opened without a playlist)
+    def on_queue_changed(self):
+        if self.playback.source != API:
             return
-
-        if not os.path.exists(self.temp_file_path):
-            print("Downloaded file not found")
+        has_playlist = bool(self.playback.api_playlist)
+        self.ui.playback_tab.setVisible(has_playlist)
+        self.ui.list_tab.setVisible(has_playlist)
+        self.ui.loop_shuffle.setVisible(has_playlist)
+        if not has_playlist:
+            self.ui.stackedWidget.setCurrentIndex(0)
+        self.display_playlist(self.playback.queue.tracks if has_playlist else [])
+
+    # Show song info right away; the service plays it once the audio is found
+    def on_track_changed(self, now_playing):
+        self.active = now_playing is not None and now_playing["source"] == API
+        if not self.active:
+            self.hide()  # A local song took over the player
             return
 
-        media = self.instance.media_new(self.temp_file_path)
-        self.player.set_media(media)
-
-        title = self.song_metadata.get("title", "Unknown Title")
-        artist = self.song_metadata.get("artist", "Unknown Artist")
+        self.ui.song_title.setText(now_playing["title"])
+        self.set_artist_text(now_playing["artist"])
 
-        thumbnails = self.song_metadata.get("thumbnails", [])
-        thumbnail_url = thumbnails if thumbnails else ""
-        pixmap = self.pixmap_from_url(thumbnail_url) if thumbnail_url else None
+        current_btn = self.button_group.button(self.playback.queue.current_index())
+        if current_btn:
+            current_btn.setChecked(True)
 
-        self.ui.song_title.setText(title)
-        self.artist_full_text = artist
-        self.ui.artist_name.setText(artist)
-        self.scroll_offset = 0
-        self.setWindowTitle('Now Playing: ' + title)
-
-        if pixmap and not pixmap.isNull():
-            size = max(1, self.ui.spinner.width())
-            cd_pixmap = self.cd_pixmap(pixmap, size)
-            self.fixed_pixmap = cd_pixmap
-            self.ui.spinner.setPixmap(cd_pixmap)
+    def on_load_failed(self, message):
+        if self.active:
+            self.set_artist_text(message)
 
-        self.ui.progressTime.setValue(0)
-        self.ui.currentTime.setText("00:00")
-        self.ui.totalTime.setText("00:00")
-
-        QTimer.singleShot(100, self.play)  # safe delayed play
+    def on_art_changed(self, pixmap):
+        if not self.active or pixmap is None:
+            return
+        self.spinner.set_cover(pixmap)
 
-    def play(self):
-        if self.temp_file_path:
-            self.player.play()
-            self.isPlaying = True
+    def on_state_changed(self, playing):
+        if not self.active:
+            return
+        self.isPlaying = playing
+        self.update_marquee()
+        if playing:
             self.ui.playButton.setIcon(QIcon(config.ICON_PATH + "pause.svg"))
-
-    def pause(self):
-        self.player.pause()
-        self.isPlaying = False
-        self.ui.playButton.setIcon(QIcon(config.ICON_PATH + "play.svg"))
-
-    def toggle_play_pause(self):
-        if self.isPlaying:
-            self.pause()
+            self.spinner.start()
         else:
-            self.play()
+            self.ui.playButton.setIcon(QIcon(config.ICON_PATH + "play.svg"))
+            self.spinner.stop()
 
-    def loop_shuffle(self):
-        self.repeat = (self.repeat + 1) % 3
-        if self.repeat == 0:
+    def on_repeat_changed(self, repeat):
+        if repeat == 0:
             self.ui.loop_shuffle.setIcon(QIcon(config.ICON_PATH + "continue.svg"))
-        elif self.repeat == 1:
+        elif repeat == 1:
             self.ui.loop_shuffle.setIcon(QIcon(config.ICON_PATH + "loop.svg"))
-        elif self.repeat == 2:
+        elif repeat == 2:
             self.ui.loop_shuffle.setIcon(QIcon(config.ICON_PATH + "shuffle.svg"))
 
-    # Move forward by 10 seconds
-    def seek_forward(self):
-        if not self.player:
-            return
-        current = self.player.get_time()
-        new_time = current + 10000  # +10 seconds
-        duration = self.player.get_length()
-        if new_time > duration:
-            new_time = duration
-        self.player.set_time(new_time)
-        self.ui.progressTime.setValue(new_time)
-
-    # Move backward by 10 seconds
-    def seek_backward(self):
-        if not self.player:
-            return
-        current = self.player.get_time()
-        new_time = current - 10000  # -10 seconds
-        if new_time < 0:
-            new_time = 0
-        self.player.set_time(new_time)
-        self.ui.progressTime.setValue(new_time)
-
     def slider_pressed(self):
         self.is_seeking = True
 
     def slider_released(self):
         self.is_seeking = False
-        position = self.ui.progressTime.value()
-        if self.player.get_length() > 0:
-            self.player.set_time(position)
+        self.playback.seek(self.ui.progressTime.value())
 
-    def update_position_and_duration(self):
-        if not self.player or not self.player.get_media():
+    # Position updates are only taken while the window is shown
+    def follow_position(self, follow):
+        if follow == self.following_position:
             return
+        self.following_position = follow
+        if follow:
+            self.playback.position_changed.connect(self.on_position_changed)
+            self.on_position_changed(self.playback.position)
+        else:
+            self.playback.position_changed.disconnect(self.on_position_changed)
 
-        duration = self.player.get_length()
-        position = self.player.get_time()
-
+    def on_duration_changed(self, duration):
+        if not self.active:
+            return
         if duration > 0:
             self.ui.progressTime.setMaximum(duration)
-            self.ui.totalTime.setText(self.format_time(duration))
+        self.ui.totalTime.setText(self.format_time(duration))
 
-        if not getattr(self, "is_seeking", False):
-            self.ui.progressTime.setValue(position)
-            self.ui.currentTime.setText(self.format_time(position))
+    def on_position_changed(self, position):
+        if not self.active or self.is_seeking:
+            return
+        self.ui.progressTime.setValue(position)
+        self.ui.currentTime.setText(self.format_time(position))
 
-    # Displays buttons for each song (empty for now, extend as needed)
+    # Displays buttons for each queued song (empty when opened without a playlist)
     def display_playlist(self, playlist):
+        if self.playlist_area is not None:
+            for btn in self.button_group.buttons():
+                self.button_group.removeButton(btn)
+            self.ui.list_layout.removeWidget(self.playlist_area)
+            self.playlist_area.deleteLater()
+
         scroll_area = QScrollArea()
         scroll_area.setWidgetResizable(True)
         content_widget = QWidget()
@@ -277,74 +203,34 @@ class ApiMusicPlayer(QDialog):
         for i, song in enumerate(playlist):
             btn = QPushButton(song.get("title", "Unknown"))
             btn.setCheckable(True)
-            btn.clicked.connect(partial(self.change_music, song))
+            btn.clicked.connect(partial(self.change_music, i))
             self.button_group.addButton(btn, i)
             content_layout.addWidget(btn)
         scroll_area.setWidget(content_widget)
         self.ui.list_layout.addWidget(scroll_area)
+        self.playlist_area = scroll_area
 
-    def change_music(self, song):
-        self.song_metadata = song
-        self.load_music()
-        self.play()
+    # Play the queued song at track_index
+    def change_music(self, track_index):
+        self.playback.jump_to(track_index)
 
-    @staticmethod
-    def cd_pixmap(pixmap, size, hole_ratio=0.25):
-        w, h = pixmap.width(), pixmap.height()
-        if w != h:
-            side = min(w, h)
-            x = (w - side) // 2
-            y = (h - side) // 2
-            pixmap = pixmap.copy(x, y, side, side)
-        scaled = pixmap.scaled(size, size, Qt.AspectRatioMode.IgnoreAspectRatio,
-                               Qt.TransformationMode.SmoothTransformation)
-        mask = QPixmap(size, size)
-        mask.fill(Qt.GlobalColor.transparent)
-        painter = QPainter(mask)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        outer_path = QPainterPath()
-        outer_path.addEllipse(0, 0, size, size)
-        hole_size = int(size * hole_ratio)
-        hole_offset = (size - hole_size) // 2
-        inner_path = QPainterPath()
-        inner_path.addEllipse(hole_offset, hole_offset, hole_size, hole_size)
-        final_path = outer_path.subtracted(inner_path)
-        painter.setClipPath(final_path)
-        painter.drawPixmap(0, 0, scaled)
-        painter.end()
-        return mask
-
-    def spin_pixmap(self):
-        if hasattr(self, "fixed_pixmap") and not self.fixed_pixmap.isNull():
-            self.rotation_angle = (self.rotation_angle + 2) % 360
-            size = self.fixed_pixmap.size()
-            rotated_canvas = QPixmap(size)
-            rotated_canvas.fill(Qt.GlobalColor.transparent)
-            painter = QPainter(rotated_canvas)
-            painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
-            painter.translate(size.width()/2, size.height()/2)
-            painter.rotate(self.rotation_angle)
-            painter.translate(-size.width()/2, -size.height()/2)
-            painter.drawPixmap(0, 0, self.fixed_pixmap)
-            painter.end()
-            self.ui.spinner.setPixmap(rotated_canvas)
+    # Marquee-like effect for artist names wider than the label (measured once per name)
+    def set_artist_text(self, text):
+        label = self.ui.artist_name
+        self.artist_full_text = text
+        self.scroll_offset = 0
+        self.artist_text_width = label.fontMetrics().horizontalAdvance(text) if text else 0
+        label.setIndent(0)
+        label.setText(text + "   " + text if self.artist_text_width > label.width() else text)
+        self.update_marquee()
+
+    # Scrolls only while playing (the governor also stops it while the label can't be seen)
+    def update_marquee(self):
+        self.scroll_timer.set_enabled(self.isPlaying and self.artist_text_width > self.ui.artist_name.width())
 
     def scroll_artist_name(self):
-        label = self.ui.artist_name
-        text = self.artist_full_text
-        if not text:
-            return
-        fm = label.fontMetrics()
-        text_width = fm.horizontalAdvance(text)
-        label_width = label.width()
-        if text_width > label_width:
-            self.scroll_offset = (self.scroll_offset + 3) % (text_width + 30)
-            display_text = text + "   " + text
-            label.setText(display_text)
-            label.setIndent(-self.scroll_offset)
-        else:
-            label.setText(text)
-            label.setIndent(0)
+        self.scroll_offset = (self.scroll_offset + 3) % (self.artist_text_width + 30)
+        self.ui.artist_name.setIndent(-self.scroll_offset)
 
     @staticmethod
     def format_time(ms):
@@ -426,7 +426,8 @@ class ArtistScreen(QWidget):
                 background-color: #169c46;
             }
         """)
-        play_btn.clicked.connect(lambda: self.app_controller.open_api_music_player(song))
+        play_btn.clicked.connect(
+            lambda: self.app_controller.open_api_music_player(song, self.artist_metadata.get('songs', [])))
 
         song_layout.addWidget(icon_label)
         song_layout.addWidget(text_container, 1)
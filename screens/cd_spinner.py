@@ -0,0 +1,80 @@
+"""
+Spinning CD shown by MusicPlayer and ApiMusicPlayer.
+
+Drives the players' spinner QLabel with the pre-rendered frames from
+controllers/spinner_frames.py. The worker sends the still disc as soon as
+it is cut and the turning frames once they are rendered; until then the
+previous cover stays up. Frames are turned into QPixmaps the first time
+they are shown. The animation is a governed timer
+(controllers/timer_governor.py): it stops while the spinner can't be seen
+and runs at half rate while the window is in the background.
+"""
+from PyQt6.QtCore import QObject, QThreadPool
+from PyQt6.QtGui import QPixmap
+from controllers.spinner_frames import SpinnerFramesRenderer, FRAME_COUNT, FRAME_INTERVAL_MS
+from controllers.timer_governor import get_timer_governor
+
+BACKGROUND_STEP = 2  # frames advanced per tick while the window is in the background
+
+
+class CdSpinner(QObject):
+    def __init__(self, label, parent=None):
+        super().__init__(parent)
+        self.label = label
+        self.frames = []  # QImage, or QPixmap once shown
+        self.frame_index = 0
+        self.spinning = False  # wanted by the player (music is playing)
+        self.renderer = None
+
+        # Same turning speed in the background, two frames per tick
+        self.timer = get_timer_governor().register(label, self.next_frame, FRAME_INTERVAL_MS,
+                                                   background_interval=FRAME_INTERVAL_MS * BACKGROUND_STEP)
+
+    def set_cover(self, pixmap):
+        """Show a new cover as a disc once the worker has cut it; it turns once its frames are rendered."""
+        if self.renderer:
+            self.renderer.cancel()
+            self.renderer = None
+        if pixmap is None or pixmap.isNull():
+            return
+
+        renderer = SpinnerFramesRenderer(pixmap.toImage(), max(1, self.label.width()))  # avoid zero
+        renderer.signals.disc.connect(lambda disc: self._on_disc(renderer, disc))
+        renderer.signals.finished.connect(lambda frames: self._on_frames(renderer, frames))
+        self.renderer = renderer
+        QThreadPool.globalInstance().start(renderer)
+
+    def _on_disc(self, renderer, disc):
+        if renderer is not self.renderer:
+            return  # Superseded by another cover
+        self.frames = [disc]
+        self.frame_index = 0
+        self.label.setPixmap(QPixmap.fromImage(disc))
+        self._update_timer()
+
+    def _on_frames(self, renderer, frames):
+        if renderer is not self.renderer:
+            return
+        self.renderer = None
+        self.frames = frames
+        self._update_timer()
+
+    def start(self):
+        self.spinning = True
+        self._update_timer()
+
+    def stop(self):
+        self.spinning = False
+        self._update_timer()
+
+    def next_frame(self):
+        step = max(self.timer.current_interval // FRAME_INTERVAL_MS, 1)
+        self.frame_index = (self.frame_index + step) % len(self.frames)
+        frame = self.frames[self.frame_index]
+        if not isinstance(frame, QPixmap):
+            frame = self.frames[self.frame_index] = QPixmap.fromImage(frame)
+        self.label.setPixmap(frame)
+
+    # Turns only while playing and fully rendered
+    def _update_timer(self):
+        self.timer.set_enabled(self.spinning and len(self.frames) == FRAME_COUNT)
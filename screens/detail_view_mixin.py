@@ -7,6 +7,7 @@ from PyQt6.QtCore import Qt, QThreadPool
 from PyQt6.QtGui import QPixmap, QFont
 from controllers.movie_api_client import fetch_movie_details, fetch_tv_details, get_image_url
 from controllers.async_loader import ImageLoader
+from controllers.extractor_pool import YT_DLP_AVAILABLE, load_trailer
 import os
 
 try:
@@ -15,11 +16,6 @@ try:
 except ImportError:
     VLC_AVAILABLE = False
 
-try:
-    import yt_dlp
-    YT_DLP_AVAILABLE = True
-except ImportError:
-    YT_DLP_AVAILABLE = False
 
 
 class DetailViewMixin:
@@ -435,45 +431,18 @@ class DetailViewMixin:
             else:  # Linux
                 self.media_player.set_xwindow(int(self.video_frame.winId()))
             
-            # YouTube trailer URL
-            youtube_url = f"https://www.youtube.com/watch?v={trailer_key}"
+            # Extract the stream URL in the extractor pool; buttons are enabled once it is ready
             status_label.setText("Extracting stream URL...")
-            
-            # Get streamable URL using yt-dlp
-            try:
-                ydl_opts = {
-                    'format': 'best[height<=720]/best',
-                    'quiet': True,
-                    'no_warnings': True,
-                    'extract_flat': False,
-                }
-                with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                    info = ydl.extract_info(youtube_url, download=False)
-                    stream_url = info['url']
-                    
-                    media = self.vlc_instance.media_new(stream_url)
-                    self.media_player.set_media(media)
-                    
-                    play_btn.clicked.connect(lambda: self.play_trailer(status_label))
-                    pause_btn.clicked.connect(lambda: self.pause_trailer(status_label))
-                    stop_btn.clicked.connect(lambda: self.stop_trailer(status_label))
-                    
-                    status_label.setText("Trailer ready - Click Play to watch")
-                    
-            except Exception as e:
-                print(f"yt-dlp extraction error: {e}")
-                error_text = str(e)
-                if "Video unavailable" in error_text or "Private video" in error_text:
-                    status_label.setText("❌ Trailer not available on YouTube")
-                elif "This video is not available" in error_text:
-                    status_label.setText("❌ TMDB trailer link is broken or private")
-                else:
-                    status_label.setText(f"❌ Could not load trailer: Connection issue")
-                # Disable buttons
-                play_btn.setEnabled(False)
-                pause_btn.setEnabled(False)
-                stop_btn.setEnabled(False)
-            
+            buttons = (play_btn, pause_btn, stop_btn)
+            for btn in buttons:
+                btn.setEnabled(False)
+
+            play_btn.clicked.connect(lambda: self.play_trailer(status_label))
+            pause_btn.clicked.connect(lambda: self.pause_trailer(status_label))
+            stop_btn.clicked.connect(lambda: self.stop_trailer(status_label))
+
+            load_trailer(self, trailer_key, buttons, status_label)
+
         except Exception as e:
             status_label.setText(f"Error initializing player: {str(e)[:50]}")
             print(f"VLC error: {e}")
@@ -2,12 +2,17 @@ from PyQt6.QtWidgets import QWidget, QLabel, QPushButton, QHBoxLayout, QVBoxLayo
 from PyQt6.QtCore import Qt, QSize, QByteArray, QThreadPool, QObject, pyqtSignal
 from PyQt6.QtGui import QPixmap, QFont, QIcon
 from controllers.clickable import ClickableLabel
-import os, config, requests
+import os, config
 from controllers.game_api_client import fetch_genres, fetch_games_by_genre
 from controllers.async_loader import ImageLoader, load_placeholder_pixmap
 from typing import List
+from functools import lru_cache
 
-GAME_GENRES = fetch_genres()
+
+# Fetched when the genre page is first built, not when the module is imported
+@lru_cache(maxsize=1)
+def game_genres():
+    return fetch_genres()
 
 class GameGenreScreen(QWidget):
     def __init__(self, app_controller=None):
@@ -32,7 +37,7 @@ class GameGenreScreen(QWidget):
         genre_section = self.create_genre_section()
         self.main_layout.addWidget(genre_section)
 
-        genre_games_section = self.create_games_section(GAME_GENRES[0])
+        genre_games_section = self.create_games_section(game_genres()[0])
         self.main_layout.addWidget(genre_games_section)
 
         self.main_layout.addStretch()
@@ -87,7 +92,7 @@ class GameGenreScreen(QWidget):
         scroll_layout.setContentsMargins(0, 0, 10, 10)
         scroll_layout.setSpacing(10)
 
-        for genre in GAME_GENRES:
+        for genre in game_genres():
             genre_card = self.create_genre_card(genre)
             scroll_layout.addWidget(genre_card)
 
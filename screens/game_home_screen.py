@@ -4,7 +4,7 @@ from PyQt6.QtGui import QPixmap, QFont, QIcon
 from controllers.game_api_client import fetch_yearly_top_games, fetch_genres, fetch_games_by_genre, fetch_games_sorted
 from controllers.clickable import ClickableLabel
 from controllers.async_loader import ImageLoader, load_placeholder_pixmap
-import os, config, requests
+import os, config
 from typing import List
 
 class GameHomeScreen(QWidget):
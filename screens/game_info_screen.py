@@ -2,7 +2,7 @@ from PyQt6.QtWidgets import QWidget, QLabel, QPushButton, QHBoxLayout, QVBoxLayo
 from PyQt6.QtCore import Qt, QSize, QByteArray, QThreadPool
 from PyQt6.QtGui import QPixmap, QFont, QIcon
 from controllers.clickable import ClickableLabel
-import os, config, requests
+import os, config
 from controllers.game_api_client import fetch_game_info
 from controllers.async_loader import ImageLoader, load_placeholder_pixmap
 from typing import List
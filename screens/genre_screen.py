@@ -1,10 +1,10 @@
-from PyQt6.QtWidgets import QWidget, QLabel, QPushButton, QHBoxLayout, QVBoxLayout, QFrame, QSizePolicy, QScrollArea
-from PyQt6.QtCore import Qt, QByteArray, QThreadPool
-from PyQt6.QtGui import QPixmap, QFont
+from PyQt6.QtWidgets import QWidget, QLabel, QHBoxLayout, QVBoxLayout, QFrame, QSizePolicy, QScrollArea
+from PyQt6.QtCore import Qt, QThreadPool
+from PyQt6.QtGui import QFont
 import controllers.api_client as ytapi
 from controllers.clickable import ClickableLabel
-from controllers.async_loader import ImageLoader, load_placeholder_pixmap
-from typing import List
+from controllers.async_loader import PageLoader
+from screens.track_list_view import TrackListView
 
 GENRES = [
     {'name': 'OPM',   'id': 'RDCLAK5uy_l3gmCPbU_mzs8z79aSnl_DDZY1EdqPc8U'},
@@ -23,13 +23,13 @@ class GenreScreen(QWidget):
 
         # Keep references to clickable labels to avoid garbage collection
         self.genre_labels = []
-        self.active_loaders: List[ImageLoader] = []
+
+        # Loads the selected genre's playlist page by page
+        self.page_loader = None
 
         self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
         self.setStyleSheet("background-color: #121212;")
 
-        self._placeholder = load_placeholder_pixmap()
-
         self.init_ui()
 
     def init_ui(self):
@@ -128,26 +128,18 @@ class GenreScreen(QWidget):
         self.results_label.setStyleSheet("color: white;")
         results_layout.addWidget(self.results_label)
 
-        # Scrollable area for results
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-        self.scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-        self.scroll_area.setStyleSheet("""
-            QScrollArea {
-                background: transparent;
-                border: none;
-            }
-        """)
-
-        # Inner content widget
-        scroll_content = QWidget()
-        scroll_content.setStyleSheet("background-color: transparent;")
-        self.scroll_layout = QVBoxLayout(scroll_content)
-        self.scroll_layout.setContentsMargins(0, 0, 0, 0)
-        self.scroll_layout.setSpacing(10)
+        self.status_label = QLabel()
+        self.status_label.setFont(QFont('Segoe UI', 12))
+        self.status_label.setStyleSheet('color: #BBBBBB;')
+        self.status_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.status_label.setVisible(False)
+        results_layout.addWidget(self.status_label)
 
-        self.scroll_area.setWidget(scroll_content)
-        results_layout.addWidget(self.scroll_area)
+        # Virtualized list: genre playlists hold hundreds of tracks
+        self.track_list = TrackListView()
+        self.track_list.play_requested.connect(
+            lambda song: self.app_controller.open_api_music_player(song, self.track_list.track_model.tracks))
+        results_layout.addWidget(self.track_list)
 
         self.handle_selected_genre(genre) # Initial load
 
@@ -159,44 +151,42 @@ class GenreScreen(QWidget):
 
         self.results_label.setText(f"{genre['name']} Songs")
 
-        # Cancels all pending image loads
-        for loader in self.active_loaders[:]:
-            loader.cancel()
-        self.active_loaders.clear()
-
-        scroll_content = QWidget()
-        scroll_content.setStyleSheet("background-color: transparent;")
-        content_layout = QVBoxLayout(scroll_content)
-        content_layout.setContentsMargins(0, 0, 0, 0)
-        content_layout.setSpacing(10)
-
-        try:
-            playlist = ytapi.get_playlist(genre.get('id'))
-            songs = playlist.get('tracks', [])
-        except Exception as e:
-            print('Error fetching songs:', e)
-            songs = []
-
-        if not songs:
-            placeholder = QLabel('No results found.')
-            placeholder.setFont(QFont('Segoe UI', 12))
-            placeholder.setStyleSheet('color: #BBBBBB;')
-            placeholder.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            content_layout.addWidget(placeholder)
-        else:
-            for song in songs:
-                song_widget = self.create_song_item(song)
-                content_layout.addWidget(song_widget)
-
-        content_layout.addStretch()
-
-        # Replace scroll widget safely
-        old_widget = self.scroll_area.widget()
-        if old_widget:
-            # Delay deletion to avoid race with pending events
-            old_widget.deleteLater()
-
-        self.scroll_area.setWidget(scroll_content)
+        # Drop the previous genre's pages and thumbnails
+        if self.page_loader:
+            self.page_loader.cancel()
+        self.track_list.track_model.clear()
+        self.track_list.scrollToTop()
+
+        self.status_label.setText('Loading...')
+        self.status_label.setVisible(True)
+
+        loader = PageLoader(ytapi.iter_playlist_pages, genre.get('id'))
+        loader.signals.page.connect(lambda page: self.on_genre_page(loader, page))
+        loader.signals.finished.connect(lambda: self.on_genre_finished(loader))
+        loader.signals.error.connect(lambda message: self.on_genre_error(loader, message))
+        self.page_loader = loader
+        QThreadPool.globalInstance().start(loader)
+
+    def on_genre_page(self, loader, page):
+        if loader is not self.page_loader:
+            return  # Another genre was selected meanwhile
+        self.status_label.setVisible(False)
+        self.track_list.track_model.append_tracks(page.get('tracks', []))
+
+    def on_genre_finished(self, loader):
+        if loader is not self.page_loader:
+            return
+        if not self.track_list.track_model.rowCount():
+            self.status_label.setText('No results found.')
+            self.status_label.setVisible(True)
+
+    def on_genre_error(self, loader, message):
+        if loader is not self.page_loader:
+            return
+        print('Error fetching songs:', message)
+        if not self.track_list.track_model.rowCount():
+            self.status_label.setText('No results found.')
+            self.status_label.setVisible(True)
 
     def create_genre_card(self, genre):
         card = QFrame()
@@ -223,116 +213,3 @@ class GenreScreen(QWidget):
 
         vbox.addWidget(title_label)
         return card
-
-    def create_song_item(self, song):
-        song_widget = QWidget()
-        song_layout = QHBoxLayout(song_widget)
-        song_layout.setContentsMargins(12, 8, 12, 8)
-        song_layout.setSpacing(14)
-
-        # Icon
-        icon_label = QLabel()
-        icon_label.setFixedSize(48, 48)
-        icon_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-
-        placeholder = self._placeholder.scaled(
-            48, 48,
-            Qt.AspectRatioMode.KeepAspectRatio,
-            Qt.TransformationMode.SmoothTransformation
-        )
-        icon_label.setPixmap(placeholder)
-
-        thumbnail_url = song.get('thumbnails')
-        if thumbnail_url:
-            self._async_load_icon(thumbnail_url, icon_label)
-        else:
-            icon_label.setText("♪")
-
-        icon_label.setStyleSheet("""
-            QLabel {
-                background-color: #1DB954;
-                border-radius: 6px;
-                color: white;
-                font-size: 22px;
-                font-weight: bold;
-            }
-        """)
-
-        # Title and Artist stacked vertically
-        text_container = QWidget()
-        text_layout = QVBoxLayout(text_container)
-        text_layout.setContentsMargins(0, 0, 0, 0)
-        text_layout.setSpacing(2)
-
-        name_label = QLabel(song.get('title'))
-        name_label.setFont(QFont("Segoe UI", 14, QFont.Weight.Bold))
-        name_label.setStyleSheet("color: white; background-color: transparent;")
-        name_label.setWordWrap(False)
-
-        artist_label = QLabel(song.get('artist', 'Unknown Artist'))
-        artist_label.setFont(QFont("Segoe UI", 11))
-        artist_label.setStyleSheet("color: white; background-color: transparent;")
-        artist_label.setWordWrap(False)
-
-        text_layout.addWidget(name_label)
-        text_layout.addWidget(artist_label)
-
-        # Play button
-        play_btn = QPushButton("▶")
-        play_btn.setFixedSize(40, 40)
-        play_btn.setCursor(Qt.CursorShape.PointingHandCursor)
-        play_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #1DB954;
-                border: none;
-                border-radius: 20px;
-                color: white;
-                font-size: 14px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #1ed760;
-            }
-            QPushButton:pressed {
-                background-color: #169c46;
-            }
-        """)
-        play_btn.clicked.connect(lambda: self.app_controller.open_api_music_player(song))
-
-        song_layout.addWidget(icon_label)
-        song_layout.addWidget(text_container, 1)
-        song_layout.addWidget(play_btn)
-
-        return song_widget
-
-    def _async_load_icon(self, url: str, label: QLabel):
-        loader = ImageLoader(url)
-        self.active_loaders.append(loader)  # Track it
-
-        def on_finished(img_url: str, data: QByteArray):
-            # Remove from active list first
-            if loader in self.active_loaders:
-                self.active_loaders.remove(loader)
-
-            if img_url != url or data.isEmpty():
-                return
-
-            # Safety: if label was deleted, skip
-            if label is None or not label.parent():
-                return
-
-            pix = QPixmap()
-            if not pix.loadFromData(data):
-                return
-
-            # Force 1:1 square
-            pix = pix.scaled(
-                48, 48,
-                Qt.AspectRatioMode.KeepAspectRatioByExpanding,
-                Qt.TransformationMode.SmoothTransformation
-            )
-            pix = pix.copy((pix.width() - 48) // 2, (pix.height() - 48) // 2, 48, 48)
-            label.setPixmap(pix)
-
-        loader.signals.finished.connect(on_finished)
-        QThreadPool.globalInstance().start(loader)
\ No newline at end of file
@@ -7,7 +7,7 @@ from PyQt6.QtGui import QPixmap, QFont, QIcon
 import controllers.api_client as ytapi
 from controllers.clickable import ClickableLabel
 from controllers.async_loader import ImageLoader, load_placeholder_pixmap
-import os, config, requests
+import os, config
 
 
 class HomeScreen(QWidget):
@@ -366,7 +366,8 @@ class HomeScreen(QWidget):
                         return f.read()
                 return b""
 
-            response = requests.get(image_url, timeout=5)
+            from controllers.http_session import get_session
+            response = get_session().get(image_url, timeout=5)
             response.raise_for_status()
             return response.content
 
@@ -0,0 +1,38 @@
+"""
+Placeholder pages for MainScreen's stacked widgets.
+
+A LazyPage takes its page's place (and index) in a QStackedWidget and
+builds the real page the first time it is shown, or earlier when MainScreen
+pre-warms it. Logging in then only costs the page that is shown first,
+however many tabs there are.
+"""
+from PyQt6.QtWidgets import QWidget, QVBoxLayout
+from PyQt6.QtCore import pyqtSignal
+
+
+class LazyPage(QWidget):
+    built = pyqtSignal(object)  # the real page
+
+    def __init__(self, factory, parent=None):
+        super().__init__(parent)
+        self.factory = factory
+        self.page = None
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(0)
+
+    def is_built(self):
+        return self.page is not None
+
+    def ensure_built(self):
+        """Build the real page now if it hasn't been yet, and return it."""
+        if self.page is None:
+            self.page = self.factory()
+            self.factory = None
+            self.layout().addWidget(self.page)
+            self.built.emit(self.page)
+        return self.page
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.ensure_built()
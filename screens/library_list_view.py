@@ -0,0 +1,294 @@
+"""
+Virtualized local library list shared by MainScreen and MusicPlayer.
+
+One LibraryModel sits over the library index for the whole app: both
+screens show it in a LibraryListView, rows are painted on demand by
+LibraryItemDelegate, and the playing track is kept in the model so every
+view highlights the same row. Changes found by the library watcher are
+applied to the model row by row instead of rebuilding the list.
+"""
+import os
+import bisect
+from PyQt6.QtWidgets import QListView, QStyledItemDelegate, QStyle, QAbstractItemView, QFrame
+from PyQt6.QtCore import Qt, QSize, QRect, QPoint, QTimer, QThreadPool, QAbstractListModel, QModelIndex, pyqtSignal
+from PyQt6.QtGui import QFontMetrics, QColor
+from database.library_index import get_library_index
+from controllers.library_watcher import get_library_watcher
+from controllers.thumbnail_store import get_thumbnail_store, ThumbnailLoader, THUMB_SIZE
+import controllers.music_metadata as metadata
+
+ROW_PADDING = 8
+ROW_SPACING = 6
+PRELOAD_ROWS = 5  # thumbnails fetched just below the visible rows
+
+TrackRole = Qt.ItemDataRole.UserRole
+FileNameRole = Qt.ItemDataRole.UserRole + 1
+CurrentRole = Qt.ItemDataRole.UserRole + 2
+
+
+class LibraryModel(QAbstractListModel):
+    def __init__(self, index=None, parent=None):
+        super().__init__(parent)
+        self.library = index or get_library_index()
+        self.thumbnails = get_thumbnail_store()
+        self.tracks = self.library.tracks()  # sorted by file name, like the index
+        self._names = [track['file_name'] for track in self.tracks]
+        self.current = None  # file name of the playing track
+        self._loaders = {}  # art_hash -> ThumbnailLoader still running
+        self._wanted = {}  # view key -> art hashes its visible rows still need
+        self._missing_art = set()  # art hashes whose cover couldn't be decoded
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.tracks)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        track = self.tracks[index.row()]
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            return os.path.splitext(track['file_name'])[0]
+        if role == Qt.ItemDataRole.DecorationRole:
+            return self.thumbnails.cached(track['art_hash'], THUMB_SIZE) if track['art_hash'] else None
+        if role == FileNameRole:
+            return track['file_name']
+        if role == CurrentRole:
+            return track['file_name'] == self.current
+        if role == TrackRole:
+            return track
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return f"{track['title'] or os.path.splitext(track['file_name'])[0]} - {track['artist'] or 'Unknown Artist'}"
+        return None
+
+    def row_of(self, file_name):
+        """Row showing file_name, or -1."""
+        row = bisect.bisect_left(self._names, file_name)
+        return row if row < len(self._names) and self._names[row] == file_name else -1
+
+    def file_names(self):
+        return list(self._names)
+
+    def set_current(self, file_name):
+        """Mark the playing track (None for nothing playing)."""
+        previous, self.current = self.current, file_name
+        for name in (previous, file_name):
+            row = self.row_of(name) if name else -1
+            if row >= 0:
+                index = self.index(row)
+                self.dataChanged.emit(index, index, [CurrentRole])
+
+    # Changes applied to the index by the library watcher (see scan_library)
+    def apply_changes(self, changes):
+        for old_name, new_name in changes['renamed']:
+            self._remove(old_name)
+            if self.current == old_name:
+                self.current = new_name
+        for name in changes['removed']:
+            self._remove(name)
+
+        for name in changes['updated']:
+            row = self.row_of(name)
+            track = self.library.track(name)
+            if row >= 0 and track:
+                self.tracks[row] = track
+                index = self.index(row)
+                self.dataChanged.emit(index, index)
+
+        for name in changes['added'] + [new_name for _, new_name in changes['renamed']]:
+            track = self.library.track(name)
+            if track and self.row_of(name) < 0:
+                row = bisect.bisect_left(self._names, name)
+                self.beginInsertRows(QModelIndex(), row, row)
+                self.tracks.insert(row, track)
+                self._names.insert(row, name)
+                self.endInsertRows()
+
+    def _remove(self, file_name):
+        row = self.row_of(file_name)
+        if row < 0:
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self.tracks[row]
+        del self._names[row]
+        self.endRemoveRows()
+
+    # Load thumbnails for a view's rows first..last. Pending loads are cancelled only once
+    # no view (MainScreen's list, the player's list) has them in range any more.
+    def load_thumbnails(self, first, last, view_key=None):
+        wanted = set()
+        for row in range(max(first, 0), min(last, len(self.tracks) - 1) + 1):
+            art_hash = self.tracks[row]['art_hash']
+            if (art_hash and art_hash not in self._missing_art
+                    and self.thumbnails.cached(art_hash, THUMB_SIZE) is None):
+                wanted.add(art_hash)
+        self._wanted[view_key] = wanted
+        self._cancel_unwanted()
+
+        for art_hash in wanted - self._loaders.keys():
+            loader = ThumbnailLoader(art_hash, THUMB_SIZE)
+            loader.signals.finished.connect(self._on_thumbnail_loaded)
+            self._loaders[art_hash] = loader
+            QThreadPool.globalInstance().start(loader)
+
+    def release_thumbnails(self, view_key=None):
+        """A view no longer shows any rows (hidden or deleted)."""
+        if self._wanted.pop(view_key, None) is not None:
+            self._cancel_unwanted()
+
+    def _cancel_unwanted(self):
+        wanted = set().union(*self._wanted.values())
+        for art_hash in list(self._loaders):
+            if art_hash not in wanted:
+                self._loaders.pop(art_hash).cancel()
+
+    def _on_thumbnail_loaded(self, art_hash, size, image):
+        if self._loaders.pop(art_hash, None) is None:
+            return
+        if image is None:
+            self._missing_art.add(art_hash)
+            return
+        self.thumbnails.add(art_hash, size, image)
+
+        # Album tracks share the cover
+        for row, track in enumerate(self.tracks):
+            if track['art_hash'] == art_hash:
+                index = self.index(row)
+                self.dataChanged.emit(index, index, [Qt.ItemDataRole.DecorationRole])
+
+
+_library_model = None
+
+
+def get_library_model():
+    """Get the app-wide library model (GUI thread only), kept in sync by the library watcher."""
+    global _library_model
+    if _library_model is None:
+        _library_model = LibraryModel()
+        get_library_watcher().changed.connect(_library_model.apply_changes)
+    return _library_model
+
+
+class LibraryItemDelegate(QStyledItemDelegate):
+    """Paints a library row: cover (optional) and file name, highlighted when it's the playing track."""
+
+    def __init__(self, show_art=True, parent=None):
+        super().__init__(parent)
+        self.show_art = show_art
+        self.default_art = metadata.cover_pixmap(None, square=True).scaled(
+            THUMB_SIZE, THUMB_SIZE,
+            Qt.AspectRatioMode.IgnoreAspectRatio,
+            Qt.TransformationMode.SmoothTransformation
+        )
+
+    def sizeHint(self, option, index):
+        content = THUMB_SIZE if self.show_art else QFontMetrics(option.font).height()
+        return QSize(option.rect.width(), content + 2 * ROW_PADDING + ROW_SPACING)
+
+    def paint(self, painter, option, index):
+        painter.save()
+        painter.setRenderHint(painter.RenderHint.Antialiasing)
+        painter.setRenderHint(painter.RenderHint.SmoothPixmapTransform)
+        painter.setPen(Qt.PenStyle.NoPen)
+
+        rect = option.rect.adjusted(0, 0, 0, -ROW_SPACING)
+        if index.data(CurrentRole):
+            painter.setBrush(QColor("#1DB954"))
+            painter.drawRoundedRect(rect, 5, 5)
+        elif option.state & QStyle.StateFlag.State_MouseOver:
+            painter.setBrush(QColor("#3a3a3a"))
+            painter.drawRoundedRect(rect, 5, 5)
+
+        text_left = rect.left() + 10
+        if self.show_art:
+            art_rect = QRect(text_left, rect.center().y() - THUMB_SIZE // 2, THUMB_SIZE, THUMB_SIZE)
+            painter.drawPixmap(art_rect, index.data(Qt.ItemDataRole.DecorationRole) or self.default_art)
+            text_left = art_rect.right() + 1 + 18
+
+        text_right = rect.right() - 10
+        painter.setPen(QColor("white"))
+        painter.setFont(option.font)
+
+        # Duration from the index (header probe), right-aligned
+        duration = index.data(TrackRole)['duration']
+        if duration:
+            minutes, seconds = divmod(int(duration), 60)
+            label = f"{minutes}:{seconds:02}"
+            label_width = QFontMetrics(option.font).horizontalAdvance(label)
+            painter.drawText(QRect(text_right - label_width, rect.top(), label_width, rect.height()),
+                             Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter, label)
+            text_right -= label_width + 16
+
+        text_rect = QRect(text_left, rect.top(), max(text_right - text_left, 0), rect.height())
+        painter.drawText(text_rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+                         QFontMetrics(option.font).elidedText(index.data(), Qt.TextElideMode.ElideRight,
+                                                              text_rect.width()))
+        painter.restore()
+
+
+class LibraryListView(QListView):
+    track_clicked = pyqtSignal(str)  # file name
+
+    def __init__(self, model=None, show_art=True, parent=None):
+        super().__init__(parent)
+        self.library_model = model or get_library_model()
+        self.setModel(self.library_model)
+        self.delegate = LibraryItemDelegate(show_art, self)
+        self.setItemDelegate(self.delegate)
+        self.show_art = show_art
+
+        self.setUniformItemSizes(True)
+        self.setMouseTracking(True)
+        self.viewport().setAttribute(Qt.WidgetAttribute.WA_Hover)
+        # The playing track is highlighted from the model, not the view's selection
+        self.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.verticalScrollBar().setSingleStep(24)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.setFrameShape(QFrame.Shape.NoFrame)
+
+        self.clicked.connect(lambda index: self.track_clicked.emit(index.data(FileNameRole)))
+
+        if show_art:
+            # Scrolling, resizing and library changes come in bursts: check the visible rows once they settle
+            self._thumbnail_timer = QTimer(self)
+            self._thumbnail_timer.setSingleShot(True)
+            self._thumbnail_timer.setInterval(50)
+            self._thumbnail_timer.timeout.connect(self.load_visible_thumbnails)
+            self.verticalScrollBar().valueChanged.connect(lambda _: self._thumbnail_timer.start())
+            self.library_model.rowsInserted.connect(lambda *_: self._thumbnail_timer.start())
+            self.library_model.rowsRemoved.connect(lambda *_: self._thumbnail_timer.start())
+            model, key = self.library_model, id(self)
+            self.destroyed.connect(lambda *_: model.release_thumbnails(key))
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self.show_art:
+            self._thumbnail_timer.start()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        if self.show_art:
+            self._thumbnail_timer.stop()
+            self.library_model.release_thumbnails(id(self))
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if self.show_art:
+            self._thumbnail_timer.start()
+
+    def scroll_to_current(self):
+        row = self.library_model.row_of(self.library_model.current) if self.library_model.current else -1
+        if row >= 0:
+            self.scrollTo(self.library_model.index(row), QAbstractItemView.ScrollHint.PositionAtCenter)
+
+    def load_visible_thumbnails(self):
+        count = self.library_model.rowCount()
+        if not count or not self.isVisible():
+            return
+        viewport = self.viewport().rect()
+        top = self.indexAt(QPoint(0, viewport.top()))
+        bottom = self.indexAt(QPoint(0, viewport.bottom()))
+        first = top.row() if top.isValid() else 0
+        last = bottom.row() if bottom.isValid() else count - 1
+        self.library_model.load_thumbnails(first, last + PRELOAD_ROWS, id(self))
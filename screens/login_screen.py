@@ -1,7 +1,8 @@
 from PyQt6.QtWidgets import QDialog, QWidget, QMessageBox, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton, QFrame
-from PyQt6.QtCore import Qt, QTimer, QPropertyAnimation, QRect
+from PyQt6.QtCore import Qt, QPropertyAnimation, QRect, QThreadPool
 from PyQt6.QtGui import QFont, QPainter, QColor, QPen
-from controllers.auth_controller import AuthController
+from controllers.async_loader import TaskWorker
+from controllers.timer_governor import get_timer_governor
 
 class LoadingSpinner(QWidget):
     """Animated loading spinner widget."""
@@ -10,18 +11,17 @@ class LoadingSpinner(QWidget):
         self.angle = 0
         self.setFixedSize(40, 40)
         
-        # Timer for animation
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.rotate)
+        # Timer for animation (paused by the governor while the spinner can't be seen)
+        self.timer = get_timer_governor().register(self, self.rotate, 30)  # Update every 30ms for smooth animation
         
     def start(self):
         """Start the spinning animation."""
-        self.timer.start(30)  # Update every 30ms for smooth animation
         self.show()
+        self.timer.set_enabled(True)
         
     def stop(self):
         """Stop the spinning animation."""
-        self.timer.stop()
+        self.timer.set_enabled(False)
         self.hide()
         
     def rotate(self):
@@ -47,7 +47,8 @@ class LoginScreen(QWidget):  # Changed from QDialog to QWidget for stacked widge
     def __init__(self, app_controller):
         super().__init__()
         self.app_controller = app_controller
-        self.auth_controller = AuthController()
+        self.auth_controller = None  # set up by the startup warm-up (see authenticate())
+        self.auth_worker = None
         
         # Create UI manually (NO Qt Designer UI)
         self.create_modern_ui()
@@ -241,6 +242,10 @@ class LoginScreen(QWidget):  # Changed from QDialog to QWidget for stacked widge
         # Connect Enter key to login
         self.username_input.returnPressed.connect(self.handle_login)
         self.password_input.returnPressed.connect(self.handle_login)
+
+        # Typing credentials starts building the main screen behind this one
+        self.username_input.textEdited.connect(lambda _: self.app_controller.prepare_main())
+        self.password_input.textEdited.connect(lambda _: self.app_controller.prepare_main())
     
     def create_shadow(self):
         """Create a shadow effect for the login card."""
@@ -308,18 +313,30 @@ class LoginScreen(QWidget):  # Changed from QDialog to QWidget for stacked widge
         self.password_input.setEnabled(False)
         self.login_btn.setEnabled(False)
         
-        # Simulate async authentication with a small delay for UX
-        QTimer.singleShot(800, lambda: self.perform_authentication(username, password))
+        self.perform_authentication(username, password)
+        self.app_controller.prepare_main()  # if typing hasn't started it already
     
     def perform_authentication(self, username, password):
-        """Perform the actual authentication."""
-        # Authenticate
-        if self.auth_controller.authenticate(username, password):
-            # Login successful - show success message briefly
-            self.loading_label.setText("Success! Redirecting...")
-            QTimer.singleShot(500, self.login_success)
+        """Check the credentials on a worker thread."""
+        worker = TaskWorker(self.authenticate, username, password)
+        worker.signals.finished.connect(lambda ok: self.on_authenticated(worker, ok))
+        worker.signals.error.connect(lambda message: self.on_authentication_error(worker, message))
+        self.auth_worker = worker
+        QThreadPool.globalInstance().start(worker)
+
+    def on_authentication_error(self, worker, message):
+        print(f"Authentication failed: {message}")
+        self.on_authenticated(worker, False)
+
+    def on_authenticated(self, worker, ok):
+        if worker is not self.auth_worker:
+            return
+        self.auth_worker = None
+        if ok:
+            self.login_success()
         else:
             # Login failed
+            self.app_controller.discard_main()
             self.show_loading(False)
             
             # Re-enable inputs
@@ -337,6 +354,15 @@ class LoginScreen(QWidget):  # Changed from QDialog to QWidget for stacked widge
             # Clear password field
             self.password_input.clear()
     
+    def authenticate(self, username, password):
+        """
+        Check the credentials (worker thread). The database is normally set up by
+        the warm-up before the user logs in; if not, this waits for it here.
+        """
+        if self.auth_controller is None:
+            self.auth_controller = self.app_controller.warmup.wait_for("database")
+        return self.auth_controller.authenticate(username, password)
+
     def login_success(self):
         """Handle successful login."""
         self.show_loading(False)
@@ -347,7 +373,6 @@ class LoginScreen(QWidget):  # Changed from QDialog to QWidget for stacked widge
         self.username_input.setEnabled(True)
         self.password_input.setEnabled(True)
         self.login_btn.setEnabled(True)
-        self.loading_label.setText("Signing in...")
     
     def show_loading(self, show):
         """Show or hide the loading overlay."""
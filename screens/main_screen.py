@@ -1,6 +1,5 @@
-from functools import partial
-from PyQt6.QtCore import Qt, QSize
-from PyQt6.QtWidgets import QMainWindow, QVBoxLayout, QPushButton, QButtonGroup, QScrollArea, QWidget, QSizePolicy
+from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtWidgets import QMainWindow, QButtonGroup, QScrollArea, QSizePolicy
 from PyQt6.QtGui import QIcon, QFont, QPixmap
 from UI.main_screen_ui import Ui_MainWindow
 from screens.artist_screen import ArtistScreen
@@ -17,27 +16,41 @@ from screens.tv_shows_screen import TVShowsScreen
 from screens.movies_screen import MoviesScreen
 from screens.movie_genre_screen import MovieGenreScreen
 from screens.movie_search_screen import MovieSearchScreen
-import config, os
-import controllers.music_metadata as metadata
+import config
 import controllers.api_client as ytapi
+from controllers.library_watcher import get_library_watcher
+from controllers.playback_service import get_playback_service, LOCAL
+from screens.library_list_view import LibraryListView, get_library_model
+from screens.mini_player_bar import MiniPlayerBar
+from screens.lazy_page import LazyPage
+
+PREWARM_DELAY_MS = 300  # between pre-warmed pages, so input is handled in between
 
 class MainScreen(QMainWindow):
     def __init__(self, app_controller):
         super().__init__()
         self.ui = Ui_MainWindow()
         self.ui.setupUi(self)
-        self.button_group = QButtonGroup(self)
-        self.local_playlist = sorted(os.listdir(config.LOCAL_MUSIC_PATH))
+        # Listed from the library index; the watcher applies changes in the folder to it
+        self.library_model = get_library_model()
+        self.library_watcher = get_library_watcher()
+        self.playback = get_playback_service()
         self.app_controller = app_controller
+        self.movies_pages_added = False
+        self.games_pages_added = False
+        self.prewarm_started = False
+        self.prewarm_queue = []
         self.init_ui()
         self.connect_signals()
         self.display_local_playlist()
+        self.watch_library()
+        self.setup_mini_player()
         self.add_music_pages()
         self.add_about_page()
         self.add_profile_page()
-
-        self.movies_pages_added = False
-        self.games_pages_added = False
+        # Placeholders only: each page is built on its first visit (or pre-warmed)
+        self.add_movies_pages()
+        self.add_games_pages()
 
     def init_ui(self):
         pixmap1 = QPixmap(config.IMAGE_PATH + 'logo.png').scaled(150, 150)
@@ -113,7 +126,7 @@ class MainScreen(QMainWindow):
         self.ui.user1.clicked.connect(lambda: self.ui.top_tabs.setVisible(False))
         self.ui.user2.clicked.connect(lambda: self.ui.top_tabs.setVisible(False))
 
-    def add_page(self, page_widget, stack, scroll_color='#71C562'):
+    def scroll_page(self, page_widget, scroll_color='#71C562'):
         page_widget.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
         page_widget.setMinimumSize(0, 0)
         page_widget.setMaximumSize(16777215, 16777215)
@@ -129,37 +142,33 @@ class MainScreen(QMainWindow):
             QScrollBar::handle:vertical:hover {{ background: #5fb052; }}
             QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {{ height: 0px; }}
         """)
-        stack_no = stack.addWidget(scroll_area)
-        print(page_widget, stack_no)
+        return scroll_area
 
-    def add_music_pages(self):
-        home_widget = HomeScreen(self.app_controller)
-        genre_widget = GenreScreen(self.app_controller)
-        search_widget = SearchScreen(self.app_controller)
+    # The page is made by factory() on its first visit; until then a placeholder holds its index
+    def add_page(self, factory, stack, scroll_color='#71C562'):
+        page = LazyPage(lambda: self.scroll_page(factory(), scroll_color))
+        stack.addWidget(page)
+        return page
 
-        for widget in [home_widget, genre_widget, search_widget]:
-            self.add_page(widget, self.ui.music_stack)
+    def add_music_pages(self):
+        self.music_pages = [
+            self.add_page(lambda: HomeScreen(self.app_controller), self.ui.music_stack),
+            self.add_page(lambda: GenreScreen(self.app_controller), self.ui.music_stack),
+            self.add_page(lambda: SearchScreen(self.app_controller), self.ui.music_stack),
+        ]
 
     def add_about_page(self):
-        about_widget = AboutScreen(self.app_controller)
-        self.add_page(about_widget, self.ui.home_stack)
+        self.add_page(lambda: AboutScreen(self.app_controller), self.ui.home_stack)
 
     def add_profile_page(self):
-        profile_widget = ProfileScreen(self.app_controller)
-        self.add_page(profile_widget, self.ui.home_stack)
+        self.add_page(lambda: ProfileScreen(self.app_controller), self.ui.home_stack)
 
     def add_movies_pages(self):
         if self.movies_pages_added:
             return
 
-        home_widget = MovieHomeScreen(self.app_controller)
-        tv_widget = TVShowsScreen(self.app_controller)
-        movies_widget = MoviesScreen(self.app_controller)
-        genre_widget = MovieGenreScreen(self.app_controller)
-        search_widget = MovieSearchScreen(self.app_controller)
-
-        for widget in [home_widget, tv_widget, movies_widget, genre_widget, search_widget]:
-            self.add_page(widget, self.ui.movies_stack, '#E50914')
+        for screen in [MovieHomeScreen, TVShowsScreen, MoviesScreen, MovieGenreScreen, MovieSearchScreen]:
+            self.add_page(lambda screen=screen: screen(self.app_controller), self.ui.movies_stack, '#E50914')
 
         self.movies_pages_added = True
 
@@ -167,60 +176,109 @@ class MainScreen(QMainWindow):
         if self.games_pages_added:
             return
 
-        home_widget = GameHomeScreen(self.app_controller)
-        genre_widget = GameGenreScreen(self.app_controller)
-        search_widget = GameSearchScreen(self.app_controller)
-
-        for widget in [home_widget, genre_widget, search_widget]:
-            self.add_page(widget, self.ui.games_stack, '#092f94')
-
-        # Store references in app_controller for back navigation
-        self.app_controller.game_home_screen = home_widget
-        self.app_controller.game_genre_screen = genre_widget
-        self.app_controller.game_search_screen = search_widget
+        # Store references in app_controller for back navigation (once built)
+        for name, screen in [('game_home_screen', GameHomeScreen),
+                             ('game_genre_screen', GameGenreScreen),
+                             ('game_search_screen', GameSearchScreen)]:
+            self.add_page(lambda name=name, screen=screen: self.build_game_page(name, screen),
+                          self.ui.games_stack, '#092f94')
 
         self.games_pages_added = True
 
+    def build_game_page(self, name, screen):
+        widget = screen(self.app_controller)
+        setattr(self.app_controller, name, widget)
+        return widget
+
     def display_local_playlist(self):
-        if self.local_playlist is None:
-            return
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-        scroll_area.setStyleSheet("QScrollArea { border: none; } QScrollArea QWidget { background-color: #555; }")
-        content_widget = QWidget()
-        content_layout = QVBoxLayout(content_widget)
-        content_layout.setContentsMargins(0, 0, 0, 0)
-        content_layout.setSpacing(6)
-        for i, song_title in enumerate(self.local_playlist):
-            song_btn = QPushButton(f"{' '*3}{song_title.replace('.mp3', '')}")
-            song_btn.setFont(QFont('Arial', 15))
-            song_btn.setCheckable(True)
-            song_btn.setIcon(QIcon(metadata.get_embedded_image(config.LOCAL_MUSIC_PATH + song_title, square=True)))
-            song_btn.setIconSize(QSize(64, 64))
-            song_btn.setStyleSheet('''
-                QPushButton { color: #fff; text-align: left; background-color: transparent; padding: 8px 10px; border: none; border-radius: 5px; }
-                QPushButton:hover { background-color: #3a3a3a; }
-                QPushButton:checked { background-color: #1DB954; }
-                QIcon { border-radius: 5px; }
-            ''')
-            song_btn.clicked.connect(partial(self.app_controller.open_music_player, song_title))
-            self.button_group.addButton(song_btn, id=i)
-            content_layout.addWidget(song_btn)
-        scroll_area.setWidget(content_widget)
-        self.ui.music_stack.addWidget(scroll_area)
+        self.local_page = LazyPage(self.build_local_list)
+        self.ui.music_stack.addWidget(self.local_page)
+
+    def build_local_list(self):
+        self.local_list = LibraryListView(self.library_model, show_art=True)
+        self.local_list.setFont(QFont('Arial', 15))
+        self.local_list.setStyleSheet("QListView { background-color: #555; border: none; }")
+        self.local_list.track_clicked.connect(self.app_controller.open_music_player)
+        return self.local_list
+
+    # Once the first page is up, build the music tabs the user is likely to open next, one per idle turn
+    def showEvent(self, event):
+        super().showEvent(event)
+        if not self.prewarm_started:
+            self.prewarm_started = True
+            self.prewarm_queue = self.music_pages[1:] + [self.local_page]
+            QTimer.singleShot(PREWARM_DELAY_MS, self.prewarm_next)
+
+    def prewarm_next(self):
+        while self.prewarm_queue:
+            page = self.prewarm_queue.pop(0)
+            if not page.is_built():
+                page.ensure_built()
+                break
+        if self.prewarm_queue:
+            QTimer.singleShot(PREWARM_DELAY_MS, self.prewarm_next)
+
+    # Catch up with changes made while the app was closed, then follow the folder live
+    def watch_library(self):
+        self.library_watcher.progress.connect(self.on_library_scan_progress)
+        self.library_watcher.sync()
+
+    # Persistent bar under the pages, following whatever the playback service plays
+    def setup_mini_player(self):
+        self.mini_player = MiniPlayerBar(self.ui.main_screen)
+        self.ui.main_screen_layout.addWidget(self.mini_player)
+
+        self.mini_player.play_pause_clicked.connect(self.playback.toggle)
+        self.mini_player.next_clicked.connect(lambda: self.playback.skip(1))
+        self.mini_player.prev_clicked.connect(lambda: self.playback.skip(-1))
+        self.mini_player.seek_position.connect(self.playback.seek)
+        self.mini_player.expand_clicked.connect(self.app_controller.show_music_player)
+
+        self.playback.track_changed.connect(self.on_track_changed)
+        self.playback.art_changed.connect(self.on_art_changed)
+        self.playback.position_changed.connect(self.mini_player.update_position)
+        self.playback.duration_changed.connect(self.mini_player.update_duration)
+        self.playback.state_changed.connect(self.mini_player.update_play_state)
+        self.playback.stopped.connect(self.on_playback_stopped)
+
+    def on_track_changed(self, now_playing):
+        self.mini_player.update_song_info(now_playing["title"], now_playing["artist"])
+        # Highlight the playing file in the library lists
+        self.library_model.set_current(now_playing["file_name"] if now_playing["source"] == LOCAL else None)
+
+    def on_art_changed(self, pixmap):
+        now_playing = self.playback.now_playing
+        if now_playing is not None:
+            self.mini_player.update_song_info(now_playing["title"], now_playing["artist"], pixmap)
+
+    def on_playback_stopped(self):
+        self.mini_player.hide()
+        self.library_model.set_current(None)
+
+    def on_library_scan_progress(self, done, total):
+        if done < total:
+            self.ui.statusbar.showMessage(f"Scanning local music... {done}/{total}")
+        else:
+            self.ui.statusbar.clearMessage()
 
     def cleanup_on_logout(self):
         """Clean up resources when logging out"""
-        # Stop any playing music
-        if hasattr(self.app_controller, 'player') and self.app_controller.player:
+        self.prewarm_queue = []
+
+        # Stop any playing music (also clears the playing track highlight)
+        self.playback.stop()
+
+        # The playback service outlives this window too
+        for signal, slot in ((self.playback.track_changed, self.on_track_changed),
+                             (self.playback.art_changed, self.on_art_changed),
+                             (self.playback.stopped, self.on_playback_stopped)):
             try:
-                self.app_controller.player.stop_music()
-            except:
+                signal.disconnect(slot)
+            except TypeError:
                 pass
-        
-        # Clear any selected buttons
-        if self.button_group:
-            checked_button = self.button_group.checkedButton()
-            if checked_button:
-                checked_button.setChecked(False)
\ No newline at end of file
+
+        # The watcher outlives this window (a new one is made on the next login)
+        try:
+            self.library_watcher.progress.disconnect(self.on_library_scan_progress)
+        except TypeError:
+            pass
\ No newline at end of file
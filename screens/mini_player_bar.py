@@ -290,7 +290,8 @@ class MiniPlayerBar(QWidget):
     
     def update_position(self, position):
         """Update progress bar and time (called from music player)"""
-        if not self.is_seeking:
+        # Nothing to redraw while the bar can't be seen (it catches up on the next update)
+        if self.isVisible() and not self.window().isMinimized() and not self.is_seeking:
             self.progress_bar.setValue(position)
             self.current_time_label.setText(self.format_time(position))
     
@@ -7,6 +7,7 @@ from controllers.movie_api_client import (fetch_trending_movies_sync, fetch_tren
                                            get_image_url, MOVIE_GENRES)
 from controllers.clickable import ClickableLabel
 from controllers.async_loader import ImageLoader, load_placeholder_pixmap
+from controllers.extractor_pool import YT_DLP_AVAILABLE, load_trailer
 import os, config
 
 try:
@@ -16,11 +17,7 @@ except ImportError:
     VLC_AVAILABLE = False
     print("VLC not available. Install python-vlc to enable trailer playback.")
 
-try:
-    import yt_dlp
-    YT_DLP_AVAILABLE = True
-except ImportError:
-    YT_DLP_AVAILABLE = False
+if not YT_DLP_AVAILABLE:
     print("yt-dlp not available. Install yt-dlp for better YouTube playback.")
 
 class MovieHomeScreen(QWidget):
@@ -603,46 +600,18 @@ class MovieHomeScreen(QWidget):
             else:  # Linux
                 self.media_player.set_xwindow(int(self.video_frame.winId()))
             
-            # YouTube trailer URL
-            youtube_url = f"https://www.youtube.com/watch?v={trailer_key}"
+            # Extract the stream URL in the extractor pool; buttons are enabled once it is ready
             status_label.setText("Extracting stream URL...")
-            
-            # Get streamable URL using yt-dlp
-            try:
-                ydl_opts = {
-                    'format': 'best[height<=720]/best',  # Get best quality up to 720p
-                    'quiet': True,
-                    'no_warnings': True,
-                    'extract_flat': False,
-                }
-                with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                    info = ydl.extract_info(youtube_url, download=False)
-                    stream_url = info['url']
-                    
-                    media = self.vlc_instance.media_new(stream_url)
-                    self.media_player.set_media(media)
-                    
-                    # Connect buttons
-                    play_btn.clicked.connect(lambda: self.play_trailer(status_label))
-                    pause_btn.clicked.connect(lambda: self.pause_trailer(status_label))
-                    stop_btn.clicked.connect(lambda: self.stop_trailer(status_label))
-                    
-                    status_label.setText("Trailer ready - Click Play to watch")
-                    
-            except Exception as e:
-                print(f"yt-dlp extraction error: {e}")
-                error_text = str(e)
-                if "Video unavailable" in error_text or "Private video" in error_text:
-                    status_label.setText("❌ Trailer not available on YouTube")
-                elif "This video is not available" in error_text:
-                    status_label.setText("❌ TMDB trailer link is broken or private")
-                else:
-                    status_label.setText(f"❌ Could not load trailer: Connection issue")
-                # Disable buttons
-                play_btn.setEnabled(False)
-                pause_btn.setEnabled(False)
-                stop_btn.setEnabled(False)
-            
+            buttons = (play_btn, pause_btn, stop_btn)
+            for btn in buttons:
+                btn.setEnabled(False)
+
+            play_btn.clicked.connect(lambda: self.play_trailer(status_label))
+            pause_btn.clicked.connect(lambda: self.pause_trailer(status_label))
+            stop_btn.clicked.connect(lambda: self.stop_trailer(status_label))
+
+            load_trailer(self, trailer_key, buttons, status_label)
+
         except Exception as e:
             status_label.setText(f"Error initializing player: {str(e)[:50]}")
             print(f"VLC error: {e}")
@@ -1,76 +1,68 @@
-from PyQt6.QtWidgets import QApplication, QDialog, QWidget, QScrollArea, QPushButton, QButtonGroup, QVBoxLayout, QLabel
-from PyQt6.QtCore import Qt, QUrl, QTimer
-from PyQt6.QtGui import QIcon, QPixmap, QPainter, QPainterPath
-from functools import partial
+from PyQt6.QtWidgets import QDialog, QWidget, QScrollArea, QVBoxLayout, QLabel
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QIcon
 from UI.music_player_ui import Ui_Dialog
-import sys, os, random, config
-from controllers.music_metadata import get_music_metadata, get_lyrics
-import vlc
+import html, config
+from controllers.music_metadata import get_lyrics, read_lrc_lyrics, cover_pixmap
+from controllers.lyrics_engine import LyricsTimeline
+from controllers.playback_service import get_playback_service, LOCAL
+from screens.library_list_view import LibraryListView, get_library_model
+from controllers.timer_governor import get_timer_governor
+from screens.cd_spinner import CdSpinner
 
 class MusicPlayer(QDialog):
-    def __init__(self, song_title, parent=None):
+    """Full player for the local library; a view over the playback service that is shown and hidden, never rebuilt."""
+    def __init__(self, parent=None):
         super().__init__(parent)
 
         # Loads the UI
         self.ui = Ui_Dialog()
         self.ui.setupUi(self)
 
-        # Gets all existing music file inside local_music folder
-        local_playlist = sorted(os.listdir(config.LOCAL_MUSIC_PATH))
-        self.song_title = song_title
+        self.playback = get_playback_service()
+        self.following_position = False
+        self.library_model = get_library_model()
+        self.song_title = None
+        self.active = False  # the service is playing a local song
+        self.is_seeking = False  # the user is dragging the progress slider
 
-        # Sets to continue/non-loop by default
-        self.repeat = 0
+        # Spinning CD (pre-rendered frames)
+        self.spinner = CdSpinner(self.ui.spinner, self)
 
-        # Sets rotation for pixmap
-        self.rotation_angle = 0
-        self.rotation_timer = QTimer(self)
-
-        self.button_group = QButtonGroup(self)
-
-        self.display_local_playlist(local_playlist)
-
-        # === VLC Instance & Player ===
-        self.instance = vlc.Instance('--quiet', '--no-video')  # No video, quiet mode
-        self.player = self.instance.media_player_new()
-
-        # Polling timer for position/duration (VLC has no signals)
-        self.position_timer = QTimer(self)
-        self.position_timer.timeout.connect(self.update_position_and_duration)
-        self.position_timer.start(100)  # Update every 100ms
-
-        self.load_music()
+        self.display_local_playlist()
 
         # Marquee-like effect
-        self.scroll_timer = QTimer(self)
-        self.scroll_timer.timeout.connect(self.scroll_artist_name)
+        self.scroll_timer = get_timer_governor().register(self.ui.artist_name, self.scroll_artist_name, 150,
+                                                          background_interval=0)  # speed (ms)
+        self.artist_text_width = 0
         self.scroll_offset = 0
         self.artist_full_text = ""
-        self.scroll_timer.start(150)  # speed (ms)
 
         self.setup_lyrics_display()
 
-        self.isPlaying = True
+        self.isPlaying = False
 
         self.init_ui()
 
-        self.play()
-
-    def cleanup(self):
-        """Cleanup method to stop playback and timers"""
-        if hasattr(self, 'player') and self.player:
-            self.player.stop()
-        if hasattr(self, 'rotation_timer'):
-            self.rotation_timer.stop()
-        if hasattr(self, 'scroll_timer'):
-            self.scroll_timer.stop()
-        if hasattr(self, 'position_timer'):
-            self.position_timer.stop()
-
-    def closeEvent(self, event):
-        """Override close event to stop playback when widget is closed"""
-        self.cleanup()
-        event.accept()
+        # Redraw from the service (it keeps playing while this window is hidden)
+        self.playback.track_changed.connect(self.on_track_changed)
+        self.playback.art_changed.connect(self.on_art_changed)
+        self.playback.duration_changed.connect(self.on_duration_changed)
+        self.playback.state_changed.connect(self.on_state_changed)
+        self.playback.repeat_changed.connect(self.on_repeat_changed)
+        self.playback.load_failed.connect(self.on_load_failed)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.ui.volume_slider.setValue(self.playback.volume)
+        self.set_artist_text(self.artist_full_text)  # the label may have been resized
+        self.playlist_view.scroll_to_current()
+        self.follow_position(True)
+
+    def hideEvent(self, event):
+        # Nothing to refresh while hidden; playback goes on in the service
+        self.follow_position(False)
+        super().hideEvent(event)
 
     def init_ui(self):
         # Sets icon for each push buttons
@@ -80,161 +72,115 @@ class MusicPlayer(QDialog):
         self.ui.loop_shuffle.setIcon(QIcon(config.ICON_PATH + "continue.svg"))
         self.ui.volume.setIcon(QIcon(config.ICON_PATH + "volume-up.svg"))
 
-        self.ui.loop_shuffle.clicked.connect(self.loop_shuffle)
+        self.ui.loop_shuffle.clicked.connect(self.playback.cycle_repeat)
 
         self.ui.volume_frame.setVisible(False)
-        self.button_group.setExclusive(True)
 
         self.ui.playback_tab.clicked.connect(lambda: self.ui.stackedWidget.setCurrentIndex(0))
         self.ui.list_tab.clicked.connect(lambda: self.ui.stackedWidget.setCurrentIndex(1))
         self.ui.lyrics_tab.clicked.connect(lambda: self.ui.stackedWidget.setCurrentIndex(2))
 
-        self.rotation_timer.timeout.connect(self.spin_pixmap)
-        self.rotation_timer.start(30)  # ~33 FPS
-
-        self.ui.playButton.clicked.connect(self.toggle_play_pause)
-
-        # Simulate signals via polling
-        # (handled in update_position_and_duration)
+        self.ui.playButton.clicked.connect(self.playback.toggle)
+        self.ui.nextButton.clicked.connect(lambda: self.playback.skip(1))
+        self.ui.prevButton.clicked.connect(lambda: self.playback.skip(-1))
 
         self.ui.progressTime.sliderPressed.connect(self.slider_pressed)
         self.ui.progressTime.sliderReleased.connect(self.slider_released)
 
         self.ui.volume_slider.setRange(0, 100)
-        self.ui.volume_slider.setValue(config.DEFAULT_VOLUME)
-        self.player.audio_set_volume(config.DEFAULT_VOLUME)
-        self.ui.volume_label.setText(str(config.DEFAULT_VOLUME))
+        self.ui.volume_slider.setValue(self.playback.volume)
+        self.ui.volume_label.setText(str(self.playback.volume))
 
         self.ui.volume_slider.valueChanged.connect(self.change_volume)
 
     def change_volume(self, value):
-        self.player.audio_set_volume(value)
+        self.playback.set_volume(value)
         self.ui.volume_label.setText(str(value))
 
-    # Function that gets selected music/song file, including its metadata (images and artist).
-    def load_music(self):
-        song_path = os.path.join(config.LOCAL_MUSIC_PATH, self.song_title)
-        if not os.path.exists(song_path):
-            print("Song file not found:", song_path)
+    # Shows the song the service started, including its metadata (artist) and lyrics.
+    def on_track_changed(self, now_playing):
+        self.active = now_playing is not None and now_playing["source"] == LOCAL
+        if not self.active:
+            self.hide()  # A streamed song took over the player
             return
 
-        try:
-            media = self.instance.media_new(song_path)
-            self.player.set_media(media)
-        except Exception as e:
-            print("Warning: Failed to load media:", e)
+        self.song_title = now_playing["file_name"]
+        self.playlist_view.scroll_to_current()
 
-        self.ui.song_title.setText(os.path.basename(song_path).removesuffix('.mp3'))
-        self.setWindowTitle('Now playing: ' + self.song_title.replace('.mp3', ''))
+        self.ui.song_title.setText(now_playing["title"])
+        self.setWindowTitle('Now playing: ' + now_playing["title"])
 
-        # Get metadata (artist + album art)
-        artist, pixmap = get_music_metadata(song_path)
-        self.artist_full_text = artist or "Unknown Artist"
-        self.ui.artist_name.setText(artist)
-        self.scroll_offset = 0
+        self.set_artist_text(now_playing["artist"])
 
-        # Ensure CD label display remains centered and fills properly
-        if pixmap is not None and hasattr(pixmap, "isNull") and not pixmap.isNull():
-            try:
-                size = max(1, self.ui.spinner.width())  # avoid zero
-                cd_pixmap = self.cd_pixmap(pixmap, size)
-                self.fixed_pixmap = cd_pixmap
-                self.ui.spinner.setPixmap(cd_pixmap)
-            except Exception as e:
-                print("Error handling album art pixmap:", e)
-
-        # Load lyrics
+        # Load lyrics (compiled once per song, see controllers/lyrics_engine.py)
+        track = now_playing["track"]
         try:
-            self.lyrics_data = get_lyrics(song_path) or []
+            if track and not track['has_lyrics']:
+                # No embedded lyrics, skip parsing the tags (indexed tags help find the .lrc file)
+                self.lyrics_data = read_lrc_lyrics(now_playing["path"], track['title'], track['artist'])
+            else:
+                self.lyrics_data = get_lyrics(now_playing["path"])
         except Exception as e:
             print("Error loading lyrics:", e)
-            self.lyrics_data = []
+            self.lyrics_data = LyricsTimeline()
 
-        self.current_lyric_index = 0
+        self.current_lyric_index = -1
+        self.shown_lyric = None  # (line index, words sung) on the label
+        self.lyric_synced_at = 0
+        self.lyric_next_change = -1  # sync on the next tick
 
         # Display the lyrics if available
         if getattr(self, "lyrics_label", None) is not None:
+            self.lyrics_label.setTextFormat(Qt.TextFormat.PlainText)
             if self.lyrics_data:
-                try:
-                    self.lyrics_label.setText(self.lyrics_data[0][1])
-                except Exception:
-                    self.lyrics_label.setText("No lyrics available.")
+                self.lyrics_label.setText(self.lyrics_data.lines[0])
             else:
                 self.lyrics_label.setText("No lyrics available.")
 
-        # Reset progress
-        self.ui.progressTime.setValue(0)
-        self.ui.currentTime.setText("00:00")
-        self.ui.totalTime.setText("00:00")
+    def on_art_changed(self, pixmap):
+        if not self.active:
+            return
+        if pixmap is None:
+            pixmap = cover_pixmap(None)
+
+        # Ensure CD label display remains centered and fills properly
+        try:
+            self.spinner.set_cover(pixmap)
+        except Exception as e:
+            print("Error handling album art pixmap:", e)
+
+    def on_load_failed(self, message):
+        if self.active:
+            self.setWindowTitle(message)
 
     # Function that changes the song
     def change_music(self, song):
-        self.song_title = song
-        self.load_music()
-        self.play()
-
-    # Displays all songs inside the assigned folder
-    def display_local_playlist(self, local_playlist=None):
-        if local_playlist is None:
-            return
+        self.playback.play_local(song, self.library_model.file_names())
 
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-        scroll_area.setStyleSheet("QScrollArea { background: transparent; border: none;}")
-
-        content_widget = QWidget()
-        content_layout = QVBoxLayout(content_widget)
-        content_layout.setContentsMargins(0, 0, 0, 0)
-        content_layout.setSpacing(6)
-
-        for i, song_title in enumerate(local_playlist):
-            song_btn = QPushButton(song_title.replace('.mp3', ''))
-            song_btn.setCheckable(True)
-            song_btn.setStyleSheet('''
-                QPushButton { 
-                    color: #fff; 
-                    text-align: left; 
-                    background-color: transparent; 
-                    padding: 8px 10px;
-                    border: none;
-                    border-radius: 5px; 
-                }
-                QPushButton:hover {
-                    background-color: #3a3a3a;
-                }
-                QPushButton:checked {
-                    background-color: #1DB954;
-                }
-            ''')
-            song_btn.clicked.connect(partial(self.change_music, song_title))
-
-            self.button_group.addButton(song_btn, id=i)
-            content_layout.addWidget(song_btn)
-
-        scroll_area.setWidget(content_widget)
-        self.ui.list_layout.addWidget(scroll_area)
+    # Displays all songs inside the assigned folder (rows are painted on demand)
+    def display_local_playlist(self):
+        self.playlist_view = LibraryListView(self.library_model, show_art=False)
+        self.playlist_view.setStyleSheet("QListView { background: transparent; border: none; }")
+        self.playlist_view.track_clicked.connect(self.change_music)
+        self.ui.list_layout.addWidget(self.playlist_view)
 
-    def scroll_artist_name(self):
+    # Marquee-like effect for artist names wider than the label (measured once per name)
+    def set_artist_text(self, text):
         label = self.ui.artist_name
-        text = self.artist_full_text
-
-        if not text:
-            return
+        self.artist_full_text = text
+        self.scroll_offset = 0
+        self.artist_text_width = label.fontMetrics().horizontalAdvance(text) if text else 0
+        label.setIndent(0)
+        label.setText(text + "   " + text if self.artist_text_width > label.width() else text)
+        self.update_marquee()
 
-        fm = label.fontMetrics()
-        text_width = fm.horizontalAdvance(text)
-        label_width = label.width()
+    # Scrolls only while playing (the governor also stops it while the label can't be seen)
+    def update_marquee(self):
+        self.scroll_timer.set_enabled(self.isPlaying and self.artist_text_width > self.ui.artist_name.width())
 
-        # Only scroll if text is wider than label
-        if text_width > label_width:
-            self.scroll_offset = (self.scroll_offset + 3) % (text_width + 30)
-            display_text = text + "   " + text
-            label.setText(display_text)
-            label.setIndent(-self.scroll_offset)
-        else:
-            label.setText(text)
-            label.setIndent(0)
+    def scroll_artist_name(self):
+        self.scroll_offset = (self.scroll_offset + 3) % (self.artist_text_width + 30)
+        self.ui.artist_name.setIndent(-self.scroll_offset)
 
     def setup_lyrics_display(self):
         """Create scrollable lyrics area dynamically inside lyrics_layout."""
@@ -267,93 +213,42 @@ class MusicPlayer(QDialog):
 
     def sync_lyrics(self, position):
         """Update displayed lyric based on current song position (position is ms)."""
-        if not getattr(self, "lyrics_data", None):
+        lyrics = getattr(self, "lyrics_data", None)
+        if not lyrics or getattr(self, "lyrics_label", None) is None:
             return
 
-        if len(self.lyrics_data) == 1 and self.lyrics_data[0][0] == 0:
-            try:
-                self.lyrics_label.setText(self.lyrics_data[0][1])
-            except Exception:
-                pass
+        # Nothing changes until the next line/word starts (seeking backwards re-syncs)
+        if self.lyric_synced_at <= position < self.lyric_next_change:
             return
+        self.lyric_synced_at = position
 
-        idx = 0
-        for i, (timestamp, text) in enumerate(self.lyrics_data):
-            try:
-                if position < int(timestamp):
-                    break
-                idx = i
-            except Exception:
-                continue
-
-        self.current_lyric_index = idx
+        if not lyrics.synced:
+            self.lyric_next_change = float("inf")
+            self.lyrics_label.setText(lyrics.lines[0])
+            return
 
-        if 0 <= self.current_lyric_index < len(self.lyrics_data):
-            try:
-                self.lyrics_label.setText(self.lyrics_data[self.current_lyric_index][1])
-            except Exception:
-                pass
+        index, next_line = lyrics.line_at(position)
+        sung, next_word = lyrics.words_at(index, position)
+        self.lyric_next_change = min(t for t in (next_line, next_word, float("inf")) if t is not None)
+        if (index, sung) == self.shown_lyric:
+            return
+        self.shown_lyric = (index, sung)
+
+        words = lyrics.words[index]
+        if words:
+            # Karaoke: words already sung are highlighted
+            texts = [html.escape(word) for word in words[1]]
+            self.lyrics_label.setTextFormat(Qt.TextFormat.RichText)
+            self.lyrics_label.setText(f'<span style="color: #1DB954;">{"".join(texts[:sung])}</span>'
+                                      f'{"".join(texts[sung:])}')
+        else:
+            self.lyrics_label.setTextFormat(Qt.TextFormat.PlainText)
+            self.lyrics_label.setText(lyrics.lines[index])
 
-        try:
+        if index != self.current_lyric_index:
+            self.current_lyric_index = index
             sb = self.lyrics_scroll.verticalScrollBar()
-            maximum = sb.maximum()
-            denom = max(len(self.lyrics_data), 1)
-            fraction = self.current_lyric_index / denom
-            value = int(maximum * fraction)
-            sb.setValue(value)
-        except Exception:
-            pass
-
-    @staticmethod
-    def cd_pixmap(pixmap, size, hole_ratio=0.25):
-        w, h = pixmap.width(), pixmap.height()
-        if w != h:
-            side = min(w, h)
-            x = (w - side) // 2
-            y = (h - side) // 2
-            pixmap = pixmap.copy(x, y, side, side)
-
-        scaled = pixmap.scaled(size, size, Qt.AspectRatioMode.IgnoreAspectRatio,
-                               Qt.TransformationMode.SmoothTransformation)
-
-        mask = QPixmap(size, size)
-        mask.fill(Qt.GlobalColor.transparent)
-
-        painter = QPainter(mask)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-
-        outer_path = QPainterPath()
-        outer_path.addEllipse(0, 0, size, size)
-
-        hole_size = int(size * hole_ratio)
-        hole_offset = (size - hole_size) // 2
-        inner_path = QPainterPath()
-        inner_path.addEllipse(hole_offset, hole_offset, hole_size, hole_size)
-
-        final_path = outer_path.subtracted(inner_path)
-        painter.setClipPath(final_path)
-        painter.drawPixmap(0, 0, scaled)
-        painter.end()
-
-        return mask
-
-    def spin_pixmap(self):
-        if hasattr(self, "fixed_pixmap") and not self.fixed_pixmap.isNull():
-            self.rotation_angle = (self.rotation_angle + 2) % 360
-
-            size = self.fixed_pixmap.size()
-            rotated_canvas = QPixmap(size)
-            rotated_canvas.fill(Qt.GlobalColor.transparent)
-
-            painter = QPainter(rotated_canvas)
-            painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
-            painter.translate(size.width() / 2, size.height() / 2)
-            painter.rotate(self.rotation_angle)
-            painter.translate(-size.width() / 2, -size.height() / 2)
-            painter.drawPixmap(0, 0, self.fixed_pixmap)
-            painter.end()
-
-            self.ui.spinner.setPixmap(rotated_canvas)
+            sb.setValue(int(sb.maximum() * index / max(len(lyrics), 1)))
 
     def switch_to_playback(self):
         pass
@@ -361,91 +256,60 @@ class MusicPlayer(QDialog):
     def switch_to_playlist(self):
         pass
 
-    # Unified play/pause toggle
-    def toggle_play_pause(self):
-        if not self.isPlaying:
-            self.play()
+    def on_state_changed(self, playing):
+        if not self.active:
+            return
+        self.isPlaying = playing
+        self.update_marquee()
+        if playing:
+            self.ui.playButton.setIcon(QIcon(config.ICON_PATH + "pause.svg"))
+            self.spinner.start()
         else:
-            self.pause()
-
-    def play(self):
-        self.player.play()
-        self.isPlaying = True
-        self.ui.playButton.setIcon(QIcon(config.ICON_PATH + "pause.svg"))
-        self.start_spin()
-
-    def pause(self):
-        self.player.pause()
-        self.isPlaying = False
-        self.ui.playButton.setIcon(QIcon(config.ICON_PATH + "play.svg"))
-        self.pause_spin()
+            self.ui.playButton.setIcon(QIcon(config.ICON_PATH + "play.svg"))
+            self.spinner.stop()
 
-    def loop_shuffle(self):
-        self.repeat += 1
-        if self.repeat >= 3:
-            self.repeat = 0
-
-        if self.repeat == 0:
+    def on_repeat_changed(self, repeat):
+        if repeat == 0:
             self.ui.loop_shuffle.setIcon(QIcon(config.ICON_PATH + "continue.svg"))
-            print('continue')
-        elif self.repeat == 1:
+        elif repeat == 1:
             self.ui.loop_shuffle.setIcon(QIcon(config.ICON_PATH + "loop.svg"))
-            print('loop')
-        elif self.repeat == 2:
+        elif repeat == 2:
             self.ui.loop_shuffle.setIcon(QIcon(config.ICON_PATH + "shuffle.svg"))
-            print('shuffle')
-
-    def start_spin(self):
-        if hasattr(self, "rotation_timer") and not self.rotation_timer.isActive():
-            self.rotation_timer.start(30)
-
-    def pause_spin(self):
-        if hasattr(self, "rotation_timer") and self.rotation_timer.isActive():
-            self.rotation_timer.stop()
 
     def slider_pressed(self):
         self.is_seeking = True
 
     def slider_released(self):
         self.is_seeking = False
-        position = self.ui.progressTime.value()
-        duration = self.player.get_length()
-        if duration > 0:
-            self.player.set_time(position)
+        self.playback.seek(self.ui.progressTime.value())
 
-    def update_position_and_duration(self):
-        """Poll VLC for position and duration, simulate Qt signals"""
-        if not self.player or not self.player.get_media():
+    # Position updates are only taken while the window is shown
+    def follow_position(self, follow):
+        if follow == self.following_position:
             return
+        self.following_position = follow
+        if follow:
+            self.playback.position_changed.connect(self.on_position_changed)
+            self.on_position_changed(self.playback.position)
+        else:
+            self.playback.position_changed.disconnect(self.on_position_changed)
 
-        duration = self.player.get_length()  # in ms
-        position = self.player.get_time()     # in ms
-
-        # Update duration once
-        if duration > 0 and self.ui.progressTime.maximum() != duration:
+    def on_duration_changed(self, duration):
+        if not self.active:
+            return
+        if duration > 0:
             self.ui.progressTime.setMaximum(duration)
-            self.ui.totalTime.setText(self.format_time(duration))
-
-        # Update position
-        if not getattr(self, "is_seeking", False) and position >= 0:
-            self.ui.progressTime.setValue(position)
-            self.ui.currentTime.setText(self.format_time(position))
-
-            # Sync lyrics
-            if hasattr(self, "lyrics_data") and self.lyrics_data:
-                self.sync_lyrics(position)
-
-        # Check for end of media
-        if duration > 0 and position >= duration - 500:  # near end
-            if hasattr(self, "_end_checked") and self._end_checked:
-                return
-            self._end_checked = True
-            self.check_song_end()
-        else:
-            self._end_checked = False
+        self.ui.totalTime.setText(self.format_time(duration))
 
-    def seek_position(self, position):
-        self.player.set_time(position)
+    def on_position_changed(self, position):
+        if not self.active or self.is_seeking:
+            return
+        self.ui.progressTime.setValue(position)
+        self.ui.currentTime.setText(self.format_time(position))
+
+        # Sync lyrics
+        if getattr(self, "lyrics_data", None):
+            self.sync_lyrics(position)
 
     def format_time(self, ms):
         if ms < 0:
@@ -454,21 +318,3 @@ class MusicPlayer(QDialog):
         minutes = seconds // 60
         seconds = seconds % 60
         return f"{minutes:02}:{seconds:02}"
-
-    # Function that interacts after the song ends (3 modes)
-    def check_song_end(self):
-        if self.repeat == 0:
-            print("Continue mode - next song")
-            local_playlist = sorted(os.listdir(config.LOCAL_MUSIC_PATH))
-            current_index = local_playlist.index(self.song_title)
-            next_index = (current_index + 1) % len(local_playlist)
-            self.change_music(local_playlist[next_index])
-        elif self.repeat == 1:
-            print("Looping current song...")
-            self.player.set_time(0)
-            self.player.play()
-        elif self.repeat == 2:
-            print("Shuffle mode - random song")
-            local_playlist = sorted(os.listdir(config.LOCAL_MUSIC_PATH))
-            next_song = random.choice(local_playlist)
-            self.change_music(next_song)
\ No newline at end of file
@@ -1,22 +1,50 @@
-from typing import List
-from PyQt6.QtWidgets import QWidget, QLabel, QPushButton, QHBoxLayout, QVBoxLayout, QFrame, QSizePolicy, QScrollArea, QLineEdit
-from PyQt6.QtCore import Qt, QSize, QByteArray, QThreadPool
-from PyQt6.QtGui import QFont, QIcon, QPixmap
+from PyQt6.QtWidgets import (QWidget, QLabel, QPushButton, QHBoxLayout, QVBoxLayout, QFrame, QSizePolicy,
+                             QScrollArea, QLineEdit, QCompleter)
+from PyQt6.QtCore import Qt, QThreadPool, QStringListModel, QByteArray
+from PyQt6.QtGui import QFont, QPixmap
 import controllers.api_client as ytapi
-from controllers.async_loader import ImageLoader, load_placeholder_pixmap
+from controllers.async_loader import ImageLoader, TaskWorker, load_placeholder_pixmap
+from controllers.clickable import ClickableLabel
+from controllers.music_search import MusicSearch
+from controllers.request_manager import DebouncedFunction
+from screens.track_list_view import TrackListView, ROW_HEIGHT, ROW_SPACING
+
+SEARCH_DEBOUNCE_MS = 250
+MIN_QUERY_LENGTH = 2
+
+FACET_TITLES = {
+    "songs": "Songs",
+    "artists": "Artists",
+    "albums": "Albums",
+    "playlists": "Playlists",
+}
 
 class SearchScreen(QWidget):
     def __init__(self, app_controller=None):
         super().__init__()
         self.app_controller = app_controller
 
-        self.active_loaders: List[ImageLoader] = []
+        # Songs, artists, albums and playlists are searched in parallel, each shown as it lands
+        self.music_search = MusicSearch(parent=self)
+        self.music_search.facet_ready.connect(self.show_facet)
+        self.music_search.facet_failed.connect(self.on_facet_failed)
 
-        self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
-        self.setStyleSheet("SearchScreen { background-color: #121212; }")
+        # Bumped for every suggestion request; responses tagged with an older value are stale
+        self.search_generation = 0
+        self.suggestion_worker = None
+
+        self.sections = {}  # facet -> widgets of its results section
+        self.shown_results = {}  # facet -> results currently displayed
+        self.active_loaders = []
 
         self._placeholder = load_placeholder_pixmap()
 
+        self.search_debounce = DebouncedFunction(SEARCH_DEBOUNCE_MS)
+        self.debounced_search = self.search_debounce(self.run_search)
+
+        self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
+        self.setStyleSheet("SearchScreen { background-color: #121212; }")
+
         self.init_ui()
 
     def init_ui(self):
@@ -66,6 +94,15 @@ class SearchScreen(QWidget):
             }
         """)
         self.search_input.returnPressed.connect(self.search_handling)
+        self.search_input.textEdited.connect(self.on_search_text_edited)
+
+        # Suggestions from YouTube Music, refreshed as the user types
+        self.suggestion_model = QStringListModel(self)
+        self.completer = QCompleter(self.suggestion_model, self)
+        self.completer.setCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        self.completer.setFilterMode(Qt.MatchFlag.MatchContains)
+        self.completer.activated.connect(self.on_suggestion_selected)
+        self.search_input.setCompleter(self.completer)
 
         # Search button
         self.search_button = QPushButton("Search")
@@ -117,7 +154,7 @@ class SearchScreen(QWidget):
         results_label.setStyleSheet("color: white;")
         results_layout.addWidget(results_label)
 
-        # Scrollable area for results
+        # Scrollable area for the facet sections
         scroll_area = QScrollArea()
         scroll_area.setWidgetResizable(True)
         scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
@@ -128,161 +165,277 @@ class SearchScreen(QWidget):
             }
         """)
 
-        # Inner content widget
         scroll_content = QWidget()
         scroll_content.setStyleSheet("background-color: transparent;")
-        self.scroll_layout = QVBoxLayout(scroll_content)
-        self.scroll_layout.setContentsMargins(0, 0, 0, 0)
-        self.scroll_layout.setSpacing(10)
+        sections_layout = QVBoxLayout(scroll_content)
+        sections_layout.setContentsMargins(0, 0, 0, 0)
+        sections_layout.setSpacing(18)
+
+        for facet in self.music_search.facets:
+            sections_layout.addWidget(self.create_facet_section(facet))
+        sections_layout.addStretch()
 
         scroll_area.setWidget(scroll_content)
         results_layout.addWidget(scroll_area)
 
         return frame
 
-    # Function for handling and displaying search results
+    def create_facet_section(self, facet):
+        section = QFrame()
+        section.setStyleSheet("background-color: transparent;")
+        section.setVisible(False)
+
+        layout = QVBoxLayout(section)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(8)
+
+        title_label = QLabel(FACET_TITLES[facet])
+        title_label.setFont(QFont("Segoe UI", 16, QFont.Weight.Bold))
+        title_label.setStyleSheet("color: white;")
+        layout.addWidget(title_label)
+
+        status_label = QLabel()
+        status_label.setFont(QFont("Segoe UI", 12))
+        status_label.setStyleSheet("color: #BBBBBB;")
+        status_label.setVisible(False)
+        layout.addWidget(status_label)
+
+        if facet == "songs":
+            # Sized to its rows; the results area scrolls as a whole
+            content = TrackListView()
+            content.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+            content.setFixedHeight(0)
+            content.play_requested.connect(lambda song: self.app_controller.open_api_music_player(song))
+        else:
+            content = QScrollArea()
+            content.setWidgetResizable(True)
+            content.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
+            content.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+            content.setFixedHeight(215)
+            content.setStyleSheet("""
+                QScrollArea {
+                    background: transparent;
+                    border: none;
+                }
+                QScrollBar:horizontal {
+                    background: #1E1E1E;
+                    height: 8px;
+                    border-radius: 4px;
+                }
+                QScrollBar::handle:horizontal {
+                    background: #1DB954;
+                    border-radius: 4px;
+                    min-width: 20px;
+                }
+                QScrollBar::add-line:horizontal,
+                QScrollBar::sub-line:horizontal {
+                    width: 0;
+                    height: 0;
+                }
+            """)
+            content.setVisible(False)
+        layout.addWidget(content)
+
+        self.sections[facet] = {"frame": section, "status": status_label, "content": content}
+        return section
+
+    # Search as the user types: cached/prefix results show at once, the network search is debounced
+    def on_search_text_edited(self, text):
+        query = text.strip()
+        if len(query) < MIN_QUERY_LENGTH:
+            self.search_debounce.cancel()
+            self.music_search.cancel()  # Ignore whatever is still in flight
+            self.search_generation += 1
+            return
+
+        for facet, items in self.music_search.peek(query).items():
+            if items:
+                self.show_facet(facet, items)
+
+        self.debounced_search(query)
+
+    # Function for handling and displaying search results (Enter / Search button)
     def search_handling(self):
         query = self.search_input.text().strip()
         if not query:
             return
+        self.search_debounce.cancel()
+        self.run_search(query, suggestions=False)
+
+    def on_suggestion_selected(self, text):
+        self.search_input.setText(text)
+        self.search_handling()
 
-        # Show results section
+    def run_search(self, query, suggestions=True):
         if not self.results_frame.isVisible():
             self.results_frame.setVisible(True)
 
-        # Clear any previous results
-        while self.scroll_layout.count():
-            child = self.scroll_layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
+        for facet in self.music_search.facets:
+            if not self.shown_results.get(facet):
+                self.show_section_status(facet, "Searching...")
+        self.music_search.search(query)
+
+        self.search_generation += 1
+        if self.suggestion_worker:
+            self.suggestion_worker.cancel()
+            self.suggestion_worker = None
+        if suggestions:
+            generation = self.search_generation
+            worker = TaskWorker(ytapi.get_search_suggestions, query)
+            worker.signals.finished.connect(lambda items: self.on_suggestions_found(generation, items))
+            worker.signals.error.connect(lambda message: print(f"Error fetching suggestions: {message}"))
+            self.suggestion_worker = worker
+            QThreadPool.globalInstance().start(worker)
+
+    def on_suggestions_found(self, generation, suggestions):
+        if generation != self.search_generation or not self.search_input.hasFocus():
+            return  # Superseded while typing
+        self.suggestion_model.setStringList(suggestions)
+        if suggestions:
+            self.completer.complete()
+
+    def on_facet_failed(self, facet, message):
+        print(f"Error fetching {facet}: {message}")
+        if not self.shown_results.get(facet):
+            self.show_section_status(facet, "Took too long to respond." if message == "Timed out"
+                                     else "Could not load results.")
+
+    def show_section_status(self, facet, text):
+        section = self.sections[facet]
+        section["status"].setText(text)
+        section["status"].setVisible(True)
+        section["frame"].setVisible(True)
+
+    def show_facet(self, facet, items):
+        if not self.results_frame.isVisible():
+            self.results_frame.setVisible(True)
 
-        try:
-            songs = ytapi.get_song_titles(query)
-        except Exception as e:
-            print(f"Error fetching songs: {e}")
+        # Cached results come back as the same list: keep the section as it is
+        if items is self.shown_results.get(facet):
+            self.sections[facet]["status"].setVisible(False)
             return
+        self.shown_results[facet] = items
 
-        if not songs:
-            placeholder = QLabel("No results found.")
-            placeholder.setFont(QFont("Segoe UI", 12))
-            placeholder.setStyleSheet("color: #white;")
-            placeholder.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.scroll_layout.addWidget(placeholder)
+        section = self.sections[facet]
+        section["frame"].setVisible(True)
+        if not items:
+            section["content"].setVisible(False)
+            self.show_section_status(facet, "No results found.")
+            return
+        section["status"].setVisible(False)
+
+        if facet == "songs":
+            track_list = section["content"]
+            track_list.track_model.clear()
+            track_list.track_model.append_tracks(items)
+            track_list.setFixedHeight(len(items) * (ROW_HEIGHT + ROW_SPACING))
+            track_list.setVisible(True)
             return
 
-        for song in songs:
-            song_widget = self.create_song_item(song)
-            self.scroll_layout.addWidget(song_widget)
-
-    # Function for creating visualized song item
-    def create_song_item(self, song):
-        song_widget = QWidget()
-        song_layout = QHBoxLayout(song_widget)
-        song_layout.setContentsMargins(12, 8, 12, 8)
-        song_layout.setSpacing(14)
-
-        # Icon
-        icon_label = QLabel()
-        icon_label.setFixedSize(48, 48)
-        icon_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-
-        placeholder = self._placeholder.scaled(
-            48, 48,
-            Qt.AspectRatioMode.KeepAspectRatio,
-            Qt.TransformationMode.SmoothTransformation
-        )
-        icon_label.setPixmap(placeholder)
-
-        thumbnail_url = song.get('thumbnails')
-        if thumbnail_url:
-            self._async_load_icon(thumbnail_url, icon_label)
-        else:
-            icon_label.setText("♪")
-
-        icon_label.setStyleSheet("""
-            QLabel {
-                background-color: #1DB954;
-                border-radius: 6px;
-                color: white;
-                font-size: 22px;
-                font-weight: bold;
-            }
-        """)
-
-        # Title and Artist stacked vertically
-        text_container = QWidget()
-        text_layout = QVBoxLayout(text_container)
-        text_layout.setContentsMargins(0, 0, 0, 0)
-        text_layout.setSpacing(2)
-
-        name_label = QLabel(song.get('title'))
-        name_label.setFont(QFont("Segoe UI", 14, QFont.Weight.Bold))
-        name_label.setStyleSheet("color: white; background-color: transparent;")
-        name_label.setWordWrap(False)
-
-        artist_label = QLabel(song.get('artist', 'Unknown Artist'))
-        artist_label.setFont(QFont("Segoe UI", 11))
-        artist_label.setStyleSheet("color: white; background-color: transparent;")
-        artist_label.setWordWrap(False)
-
-        text_layout.addWidget(name_label)
-        text_layout.addWidget(artist_label)
-
-        # Play button
-        play_btn = QPushButton("▶")
-        play_btn.setFixedSize(40, 40)
-        play_btn.setCursor(Qt.CursorShape.PointingHandCursor)
-        play_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #1DB954;
-                border: none;
-                border-radius: 20px;
-                color: white;
-                font-size: 14px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #1ed760;
+        # Card rows are small (one page of results), rebuild them
+        for loader in self.active_loaders:
+            if loader.facet == facet:
+                loader.cancel()
+        self.active_loaders = [loader for loader in self.active_loaders if loader.facet != facet]
+
+        cards = QWidget()
+        cards.setStyleSheet("background-color: transparent;")
+        cards_layout = QHBoxLayout(cards)
+        cards_layout.setContentsMargins(0, 0, 10, 10)
+        cards_layout.setSpacing(20)
+        for item in items:
+            cards_layout.addWidget(self.create_result_card(facet, item))
+        cards_layout.addStretch()
+
+        scroll_area = section["content"]
+        old_widget = scroll_area.widget()
+        if old_widget:
+            old_widget.deleteLater()
+        scroll_area.setWidget(cards)
+        scroll_area.setVisible(True)
+
+    # Card for an artist, album or playlist result
+    def create_result_card(self, facet, item):
+        card = QFrame()
+        card.setFixedSize(140, 190)
+        card.setStyleSheet("""
+            QFrame {
+                background-color: #2A2A2A;
+                border-radius: 10px;
             }
-            QPushButton:pressed {
-                background-color: #169c46;
+            QFrame:hover {
+                background-color: #333333;
             }
         """)
-        play_btn.clicked.connect(lambda: self.app_controller.open_api_music_player(song))
 
-        song_layout.addWidget(icon_label)
-        song_layout.addWidget(text_container, 1)
-        song_layout.addWidget(play_btn)
+        vbox = QVBoxLayout(card)
+        vbox.setContentsMargins(0, 0, 0, 0)
+        vbox.setSpacing(8)
+        vbox.setAlignment(Qt.AlignmentFlag.AlignTop)
+
+        # Thumbnail
+        img_label = QLabel()
+        img_label.setFixedSize(140, 140)
+        img_label.setStyleSheet("border-radius: 10px; background-color: #444;")
+        img_label.setPixmap(self._placeholder.scaled(140, 140,
+                                                     Qt.AspectRatioMode.KeepAspectRatioByExpanding,
+                                                     Qt.TransformationMode.SmoothTransformation))
+        vbox.addWidget(img_label)
+
+        url = item.get("thumbnails") or ""
+        if facet == "artists":
+            title = item.get("artist") or "Unknown Artist"
+            subtitle = "Artist"
+        elif facet == "albums":
+            title = item.get("title") or "Unknown"
+            subtitle = " • ".join(str(part) for part in (item.get("type"), item.get("year")) if part)
+        else:
+            title = item.get("title") or "Unknown"
+            subtitle = item.get("author") or "Playlist"
+
+        # Title
+        title_label = ClickableLabel(title)
+        title_label.setWordWrap(True)
+        title_label.setFont(QFont("Segoe UI", 10, QFont.Weight.Bold))
+        title_label.setStyleSheet("color: white;")
+        vbox.addWidget(title_label)
+
+        # Type / Year / Author
+        subtitle_label = ClickableLabel(subtitle)
+        subtitle_label.setFont(QFont("Segoe UI", 9))
+        subtitle_label.setStyleSheet("color: #BBBBBB;")
+        vbox.addWidget(subtitle_label)
+
+        if url:
+            self._async_load_card_image(facet, url, img_label)
+
+        if facet == "artists":
+            title_label.clicked.connect(lambda: self.app_controller.goto_artist(title))
+        else:
+            browse_id = item.get("browseId")
+            title_label.clicked.connect(lambda: self.app_controller.goto_playlist(browse_id, url))
 
-        return song_widget
+        return card
 
-    def _async_load_icon(self, url: str, label: QLabel):
+    def _async_load_card_image(self, facet, url: str, label: QLabel):
         loader = ImageLoader(url)
-        self.active_loaders.append(loader)  # Track it
+        loader.facet = facet
+        self.active_loaders.append(loader)
 
         def on_finished(img_url: str, data: QByteArray):
-            # Remove from active list first
             if loader in self.active_loaders:
                 self.active_loaders.remove(loader)
 
             if img_url != url or data.isEmpty():
                 return
-
-            # Safety: if label was deleted, skip
             if label is None or not label.parent():
                 return
 
             pix = QPixmap()
             if not pix.loadFromData(data):
                 return
-
-            # Force 1:1 square
-            pix = pix.scaled(
-                48, 48,
-                Qt.AspectRatioMode.KeepAspectRatioByExpanding,
-                Qt.TransformationMode.SmoothTransformation
-            )
-            pix = pix.copy((pix.width() - 48) // 2, (pix.height() - 48) // 2, 48, 48)
+            pix = pix.scaled(140, 140, Qt.AspectRatioMode.KeepAspectRatioByExpanding,
+                             Qt.TransformationMode.SmoothTransformation)
             label.setPixmap(pix)
 
         loader.signals.finished.connect(on_finished)
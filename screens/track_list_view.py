@@ -0,0 +1,288 @@
+"""
+Virtualized track list shared by the playlist/album and genre screens.
+
+Tracks are kept in a TrackListModel and painted by TrackItemDelegate, so a
+playlist with hundreds of songs is a single QListView instead of a widget
+tree per row. Pages can be appended while the rest of the playlist is still
+loading, and thumbnails are only fetched for the rows on screen.
+"""
+from PyQt6.QtWidgets import QListView, QStyledItemDelegate, QStyle, QAbstractItemView, QFrame
+from PyQt6.QtCore import (Qt, QSize, QRect, QRectF, QPoint, QEvent, QTimer, QThreadPool,
+                          QAbstractListModel, QModelIndex, QByteArray, pyqtSignal)
+from PyQt6.QtGui import QPixmap, QFont, QFontMetrics, QColor, QPainterPath
+from controllers.async_loader import ImageLoader, load_placeholder_pixmap
+
+THUMB_SIZE = 48
+ROW_HEIGHT = 64
+ROW_SPACING = 12
+PLAY_BUTTON_SIZE = 40
+PRELOAD_ROWS = 5  # thumbnails fetched just below the visible rows
+
+SongRole = Qt.ItemDataRole.UserRole
+ArtistRole = Qt.ItemDataRole.UserRole + 1
+ThumbnailRole = Qt.ItemDataRole.UserRole + 2
+
+
+class TrackListModel(QAbstractListModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.tracks = []
+        self._pixmaps = {}  # url -> cropped thumbnail, None if it failed to load
+        self._loaders = {}  # url -> ImageLoader still running
+        self._rows_by_url = {}  # url -> rows showing it (album tracks share one cover)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.tracks)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        song = self.tracks[index.row()]
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            return song.get('title') or 'Unknown'
+        if role == ArtistRole:
+            return song.get('artist') or 'Unknown Artist'
+        if role == ThumbnailRole:
+            return self._pixmaps.get(song.get('thumbnails'))
+        if role == SongRole:
+            return song
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return f"{song.get('title') or 'Unknown'} - {song.get('artist') or 'Unknown Artist'}"
+        return None
+
+    def append_tracks(self, tracks):
+        if not tracks:
+            return
+        first = len(self.tracks)
+        self.beginInsertRows(QModelIndex(), first, first + len(tracks) - 1)
+        for row, song in enumerate(tracks, start=first):
+            self.tracks.append(song)
+            url = song.get('thumbnails')
+            if url:
+                self._rows_by_url.setdefault(url, []).append(row)
+        self.endInsertRows()
+
+    def clear(self):
+        self.cancel_thumbnails()
+        self.beginResetModel()
+        # New list, so queues already handed to a player keep their tracks
+        self.tracks = []
+        self._pixmaps.clear()
+        self._rows_by_url.clear()
+        self.endResetModel()
+
+    # Fetch thumbnails for rows first..last and cancel pending loads for rows no longer in view.
+    def load_thumbnails(self, first, last):
+        wanted = set()
+        for row in range(max(first, 0), min(last, len(self.tracks) - 1) + 1):
+            url = self.tracks[row].get('thumbnails')
+            if url and url not in self._pixmaps:
+                wanted.add(url)
+
+        for url in list(self._loaders):
+            if url not in wanted:
+                self._loaders.pop(url).cancel()
+
+        for url in wanted - self._loaders.keys():
+            loader = ImageLoader(url)
+            loader.signals.finished.connect(self._on_thumbnail_loaded)
+            self._loaders[url] = loader
+            QThreadPool.globalInstance().start(loader)
+
+    def thumbnail_pending(self, url):
+        return bool(url) and url not in self._pixmaps
+
+    def cancel_thumbnails(self):
+        for loader in self._loaders.values():
+            loader.cancel()
+        self._loaders.clear()
+
+    def _on_thumbnail_loaded(self, url: str, data: QByteArray):
+        if self._loaders.pop(url, None) is None:
+            return
+
+        pix = QPixmap()
+        if data.isEmpty() or not pix.loadFromData(data):
+            self._pixmaps[url] = None
+        else:
+            # Force 1:1 square
+            pix = pix.scaled(
+                THUMB_SIZE, THUMB_SIZE,
+                Qt.AspectRatioMode.KeepAspectRatioByExpanding,
+                Qt.TransformationMode.SmoothTransformation
+            )
+            self._pixmaps[url] = pix.copy((pix.width() - THUMB_SIZE) // 2, (pix.height() - THUMB_SIZE) // 2,
+                                          THUMB_SIZE, THUMB_SIZE)
+
+        for row in self._rows_by_url.get(url, []):
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [ThumbnailRole])
+
+
+class TrackItemDelegate(QStyledItemDelegate):
+    """Paints a track row: thumbnail, title, artist and a play button."""
+    play_clicked = pyqtSignal(QModelIndex)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.title_font = QFont("Segoe UI", 14, QFont.Weight.Bold)
+        self.artist_font = QFont("Segoe UI", 11)
+        self.icon_font = QFont("Segoe UI", 16, QFont.Weight.Bold)
+        self.button_font = QFont("Segoe UI", 11, QFont.Weight.Bold)
+        self.placeholder = load_placeholder_pixmap().scaled(
+            THUMB_SIZE, THUMB_SIZE,
+            Qt.AspectRatioMode.KeepAspectRatio,
+            Qt.TransformationMode.SmoothTransformation
+        )
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), ROW_HEIGHT + ROW_SPACING)
+
+    @staticmethod
+    def _row_rect(option):
+        return option.rect.adjusted(0, 0, 0, -ROW_SPACING)
+
+    @staticmethod
+    def _play_rect(row_rect):
+        return QRect(row_rect.right() - 12 - PLAY_BUTTON_SIZE, row_rect.center().y() - PLAY_BUTTON_SIZE // 2,
+                     PLAY_BUTTON_SIZE, PLAY_BUTTON_SIZE)
+
+    def paint(self, painter, option, index):
+        painter.save()
+        painter.setRenderHint(painter.RenderHint.Antialiasing)
+        painter.setRenderHint(painter.RenderHint.SmoothPixmapTransform)
+        painter.setPen(Qt.PenStyle.NoPen)
+
+        rect = self._row_rect(option)
+        hovered = bool(option.state & QStyle.StateFlag.State_MouseOver)
+        if hovered:
+            painter.setBrush(QColor("#2A2A2A"))
+            painter.drawRoundedRect(rect, 8, 8)
+
+        # Thumbnail (placeholder while loading, note icon when the song has none)
+        thumb_rect = QRect(rect.left() + 12, rect.center().y() - THUMB_SIZE // 2, THUMB_SIZE, THUMB_SIZE)
+        thumb_path = QPainterPath()
+        thumb_path.addRoundedRect(QRectF(thumb_rect), 6, 6)
+        painter.fillPath(thumb_path, QColor("#1DB954"))
+
+        song = index.data(SongRole)
+        pixmap = index.data(ThumbnailRole)
+        if pixmap is None and index.model().thumbnail_pending(song.get('thumbnails')):
+            pixmap = self.placeholder
+        if pixmap is not None:
+            painter.setClipPath(thumb_path)
+            painter.drawPixmap(thumb_rect, pixmap)
+            painter.setClipping(False)
+        else:
+            painter.setPen(QColor("white"))
+            painter.setFont(self.icon_font)
+            painter.drawText(thumb_rect, Qt.AlignmentFlag.AlignCenter, "♪")
+
+        # Title and artist stacked vertically
+        play_rect = self._play_rect(rect)
+        text_left = thumb_rect.right() + 1 + 14
+        text_width = max(play_rect.left() - 14 - text_left, 0)
+        title_metrics = QFontMetrics(self.title_font)
+        artist_metrics = QFontMetrics(self.artist_font)
+        text_top = rect.center().y() - (title_metrics.height() + 2 + artist_metrics.height()) // 2
+
+        painter.setPen(QColor("white"))
+        painter.setFont(self.title_font)
+        painter.drawText(QRect(text_left, text_top, text_width, title_metrics.height()),
+                         Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+                         title_metrics.elidedText(index.data(), Qt.TextElideMode.ElideRight, text_width))
+        painter.setFont(self.artist_font)
+        painter.drawText(QRect(text_left, text_top + title_metrics.height() + 2, text_width, artist_metrics.height()),
+                         Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+                         artist_metrics.elidedText(index.data(ArtistRole), Qt.TextElideMode.ElideRight, text_width))
+
+        # Play button
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(QColor("#1ed760" if hovered else "#1DB954"))
+        painter.drawEllipse(play_rect)
+        painter.setPen(QColor("white"))
+        painter.setFont(self.button_font)
+        painter.drawText(play_rect, Qt.AlignmentFlag.AlignCenter, "▶")
+
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if (event.type() == QEvent.Type.MouseButtonRelease
+                and event.button() == Qt.MouseButton.LeftButton
+                and self._play_rect(self._row_rect(option)).contains(event.position().toPoint())):
+            self.play_clicked.emit(index)
+            return True
+        return super().editorEvent(event, model, option, index)
+
+
+class TrackListView(QListView):
+    play_requested = pyqtSignal(object)  # song dict
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.track_model = TrackListModel(self)
+        self.setModel(self.track_model)
+        self.delegate = TrackItemDelegate(self)
+        self.setItemDelegate(self.delegate)
+
+        self.setUniformItemSizes(True)
+        self.setMouseTracking(True)
+        self.viewport().setAttribute(Qt.WidgetAttribute.WA_Hover)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.verticalScrollBar().setSingleStep(24)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.setFrameShape(QFrame.Shape.NoFrame)
+        self.setStyleSheet("""
+            QListView {
+                background: transparent;
+                border: none;
+            }
+            QScrollBar:vertical {
+                background: #1E1E1E;
+                width: 8px;
+                margin: 0px;
+            }
+            QScrollBar::handle:vertical {
+                background: #1DB954;
+                border-radius: 4px;
+                min-height: 20px;
+            }
+            QScrollBar::add-line:vertical,
+            QScrollBar::sub-line:vertical {
+                height: 0;
+                width: 0;
+            }
+            QScrollBar::add-page:vertical,
+            QScrollBar::sub-page:vertical {
+                background: none;
+            }
+        """)
+
+        self.delegate.play_clicked.connect(lambda index: self.play_requested.emit(index.data(SongRole)))
+
+        # Scrolling, resizing and appended pages come in bursts: check the visible rows once they settle
+        self._thumbnail_timer = QTimer(self)
+        self._thumbnail_timer.setSingleShot(True)
+        self._thumbnail_timer.setInterval(50)
+        self._thumbnail_timer.timeout.connect(self.load_visible_thumbnails)
+        self.verticalScrollBar().valueChanged.connect(lambda _: self._thumbnail_timer.start())
+        self.track_model.rowsInserted.connect(lambda *_: self._thumbnail_timer.start())
+        self.track_model.modelReset.connect(self._thumbnail_timer.start)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._thumbnail_timer.start()
+
+    def load_visible_thumbnails(self):
+        count = self.track_model.rowCount()
+        if not count:
+            return
+        viewport = self.viewport().rect()
+        top = self.indexAt(QPoint(0, viewport.top()))
+        bottom = self.indexAt(QPoint(0, viewport.bottom()))
+        first = top.row() if top.isValid() else 0
+        last = bottom.row() if bottom.isValid() else count - 1
+        self.track_model.load_thumbnails(first, last + PRELOAD_ROWS)
@@ -0,0 +1,19 @@
+"""
+Startup import budget check (see benchmarks/import_budget.py).
+Run with pytest, or directly: python test_import_budget.py
+"""
+
+import os
+import subprocess
+import sys
+
+SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks", "import_budget.py")
+
+def test_import_budget():
+    """Fail when the pre-splash imports are over budget or pull in a deferred module."""
+    result = subprocess.run([sys.executable, SCRIPT], capture_output=True, text=True)
+    print(result.stdout)
+    assert result.returncode == 0, result.stdout + result.stderr
+
+if __name__ == "__main__":
+    test_import_budget()